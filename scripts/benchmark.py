@@ -0,0 +1,511 @@
+"""
+Benchmarks del hot path del backtest.
+
+Mide, para tamaños crecientes (1k/10k/100k velas) y varios timeframes:
+MarketState.update, las propiedades de indicadores de MarketState,
+detect_ob / TJRStrategy.analyze, AlphaCombiner.get_signal,
+MSCOrchestrator.decide, InMemoryBroker.update_positions,
+FeatureExtractor.add_all_features, un OptimizerWorker.run completo (sin DB)
+y la carga de velas en el worker desde el store columnar y desde CSV
+(store_to_worker / csv_to_worker: OptimizerWorker.load_candles + recorrer
+todas las velas, como hace un backtest).
+
+Fuentes: random walk de MarketGenerator (todos los timeframes) y
+data/BTCUSDT_4h_2024.csv (solo 4h, hasta su longitud).
+
+Guarda un JSON comparable entre commits (results/benchmarks/) y marca como
+sospechoso de escalado cuadrático todo benchmark cuyo exponente log-log
+(tiempo vs velas) supere --quadratic-threshold.
+
+Uso:
+    python scripts/benchmark.py
+    python scripts/benchmark.py --sizes 1000 10000 --timeframes 4h --only market_update broker_update
+    python scripts/benchmark.py --compare results/benchmarks/bench_<commit>.json
+"""
+import sys
+import os
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+# MarketGenerator importa `core.*` (pythonpath de src)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import argparse
+import json
+import logging
+import math
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.core.candle import Candle
+from src.core.market import MarketState
+from src.core.timeframe import Timeframe
+from src.core.series import MarketSeries
+from src.strategy.ob import detect_ob
+from src.strategy.engine import TJRStrategy
+from src.alphas.combiner import AlphaCombiner
+from src.alphas.ob_quality import Alpha_OB_Quality
+from src.alphas.momentum import Alpha_Momentum
+from src.alphas.volatility import Alpha_Volatility
+from src.alphas.ml_confidence import Alpha_ML_Confidence
+from src.alphas.liquidity import Alpha_Liquidity
+from src.agents.orchestrator import MSCOrchestrator
+from src.agents.worker import OptimizerWorker
+from src.execution.broker import OrderRequest, OrderSide, OrderType
+from src.simulation.broker import InMemoryBroker
+from src.simulation.generator import MarketGenerator
+from src.ml.features import FeatureExtractor
+from src.optimization.param_space import get_default_param_space
+from src.utils.candle_store import COLUMNS, CandleStore
+from src.utils.data_loader import load_binance_csv
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_TIMEFRAMES = ['4h', '1h', '15m']
+REAL_DATA_PATH = "data/BTCUSDT_4h_2024.csv"
+OUTPUT_DIR = Path("results/benchmarks")
+
+TIMEFRAME_MS = {'5m': 5 * 60_000, '15m': 15 * 60_000, '1h': 3_600_000, '4h': 4 * 3_600_000}
+
+# Por debajo de esto el timer domina la medición y no se usa para el ajuste
+MIN_FIT_SECONDS = 0.005
+# Regresión al comparar contra otro JSON
+REGRESSION_RATIO = 1.25
+
+# Cada benchmark: (candles, timeframe, deadline) -> (segundos, velas procesadas)
+BenchFn = Callable[[List[Candle], Timeframe, float], Tuple[float, int]]
+
+
+# --- Datos ---
+
+def synthetic_candles(n: int, timeframe: Timeframe, seed: int = 42) -> List[Candle]:
+    """
+    Random walk de MarketGenerator re-estampado al timeframe (ms) y con
+    precios a 2 decimales (el generador produce Decimals de ~50 dígitos).
+    """
+    random.seed(seed)
+    raw = MarketGenerator(start_price=42000, start_ts=0).generate_random_walk(n)
+    step = TIMEFRAME_MS[timeframe.value]
+    start = 1704067200000  # 2024-01-01 UTC
+    return [
+        Candle(
+            timestamp=start + i * step,
+            open=_round(c.open),
+            high=_round(c.high),
+            low=_round(c.low),
+            close=_round(c.close),
+            volume=_round(c.volume),
+            timeframe=timeframe,
+            complete=True
+        )
+        for i, c in enumerate(raw)
+    ]
+
+
+def _round(value: Decimal) -> Decimal:
+    # Redondeo monótono: conserva high >= open/close >= low
+    return Decimal(str(round(float(value), 2)))
+
+
+def real_candles(path: str = REAL_DATA_PATH) -> List[Candle]:
+    if not os.path.exists(path):
+        return []
+    return load_binance_csv(path, Timeframe.H4)
+
+
+# --- Benchmarks ---
+
+def _replay(
+    candles: List[Candle],
+    deadline: float,
+    step: Callable[[MarketState, int], None]
+) -> Tuple[float, int]:
+    """Reproduce velas en MarketState y cronometra solo `step` (estado ya actualizado)."""
+    market = MarketState.empty("BTCUSDT")
+    elapsed = 0.0
+    processed = 0
+    for i, candle in enumerate(candles):
+        market = market.update(candle)
+        t0 = time.perf_counter()
+        step(market, i)
+        elapsed += time.perf_counter() - t0
+        processed = i + 1
+        if processed % 256 == 0 and time.perf_counter() > deadline:
+            break
+    return elapsed, processed
+
+
+def bench_market_update(candles, timeframe, deadline):
+    market = MarketState.empty("BTCUSDT")
+    processed = 0
+    t0 = time.perf_counter()
+    for candle in candles:
+        market = market.update(candle)
+        processed += 1
+        if processed % 256 == 0 and time.perf_counter() > deadline:
+            break
+    return time.perf_counter() - t0, processed
+
+
+def bench_market_indicators(candles, timeframe, deadline):
+    def step(market, i):
+        market.rsi
+        market.atr
+        market.adx
+        market.atr_avg_14
+        market.ema_alignment
+    return _replay(candles, deadline, step)
+
+
+def bench_detect_ob(candles, timeframe, deadline):
+    series = MarketSeries(candles)
+    processed = 0
+    t0 = time.perf_counter()
+    for i in range(len(series)):
+        detect_ob(series, i)
+        processed = i + 1
+        if processed % 256 == 0 and time.perf_counter() > deadline:
+            break
+    return time.perf_counter() - t0, processed
+
+
+def bench_strategy_analyze(candles, timeframe, deadline):
+    strategy = TJRStrategy(take_profit_multiplier=Decimal("2.0"))
+    return _replay(candles, deadline, lambda market, i: strategy.analyze(market, timeframe))
+
+
+def bench_combiner_signal(candles, timeframe, deadline):
+    # Mismo portafolio y pesos default que OptimizerWorker (use_alpha_engine)
+    combiner = AlphaCombiner([
+        (Alpha_OB_Quality(), 1.5),
+        (Alpha_Momentum(), 2.0),
+        (Alpha_Volatility(), 0.5),
+        (Alpha_ML_Confidence(), 1.0),
+        (Alpha_Liquidity(), 0.8)
+    ])
+    return _replay(candles, deadline, lambda market, i: combiner.get_signal(market, threshold=0.6))
+
+
+def bench_orchestrator_decide(candles, timeframe, deadline):
+    orchestrator = MSCOrchestrator()
+    params = get_default_param_space().get_defaults()
+    return _replay(candles, deadline, lambda market, i: orchestrator.decide(market, params=params))
+
+
+def bench_broker_update(candles, timeframe, deadline):
+    """update_positions con ~10 posiciones abiertas (SL/TP a ±1%)."""
+    broker = InMemoryBroker(balance=Decimal("1000000"))
+    elapsed = 0.0
+    processed = 0
+    for i, candle in enumerate(candles):
+        if len(broker.positions) < 10:
+            side = OrderSide.BUY if i % 2 else OrderSide.SELL
+            sign = 1 if side == OrderSide.BUY else -1
+            broker.place_order(OrderRequest(
+                symbol="BTCUSDT",
+                side=side,
+                type=OrderType.MARKET,
+                quantity=Decimal("0.01"),
+                price=candle.close,
+                stop_loss=candle.close * (1 - sign * Decimal("0.01")),
+                take_profit=candle.close * (1 + sign * Decimal("0.01"))
+            ))
+        t0 = time.perf_counter()
+        broker.update_positions(candle.close)
+        elapsed += time.perf_counter() - t0
+        processed = i + 1
+        if processed % 256 == 0 and time.perf_counter() > deadline:
+            break
+    return elapsed, processed
+
+
+def bench_feature_extractor(candles, timeframe, deadline):
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime([c.timestamp for c in candles], unit='ms'),
+        'open': [float(c.open) for c in candles],
+        'high': [float(c.high) for c in candles],
+        'low': [float(c.low) for c in candles],
+        'close': [float(c.close) for c in candles],
+        'volume': [float(c.volume) for c in candles]
+    })
+    t0 = time.perf_counter()
+    FeatureExtractor().add_all_features(df)
+    return time.perf_counter() - t0, len(candles)
+
+
+def bench_worker_run(candles, timeframe, deadline):
+    """OptimizerWorker.run completo (modo WFO/MSC), sin DB ni logs de progreso."""
+    worker = OptimizerWorker("bench")
+    worker._db_enabled = False
+    worker.logger.setLevel(logging.WARNING)
+    config = {
+        "pair": "BTCUSDT",
+        "timeframe": timeframe.value,
+        "year": 2024,
+        # wfo_* desactiva la persistencia de trades
+        "backtest_run_id": "wfo_subtrain",
+        "initial_balance": 10000.0,
+        "stop_loss": 100,
+        "take_profit_multiplier": 2.0,
+        "fee_rate": 0.001,
+        "risk_per_trade_pct": 1.0,
+        "use_msc": True,
+        "max_portfolio_risk": 0.10,
+        "use_dd_scaling": True
+    }
+    t0 = time.perf_counter()
+    worker.run(config, params=get_default_param_space().get_defaults(), candles=candles, warmup_candles=[])
+    return time.perf_counter() - t0, len(candles)
+
+
+def _by_month(candles: List[Candle]) -> Dict[Tuple[int, int], List[Candle]]:
+    groups: Dict[Tuple[int, int], List[Candle]] = {}
+    for candle in candles:
+        dt = datetime.fromtimestamp(candle.timestamp / 1000, tz=timezone.utc)
+        groups.setdefault((dt.year, dt.month), []).append(candle)
+    return groups
+
+
+def _load_through_worker(
+    months: List[Tuple[int, int]],
+    timeframe: Timeframe,
+    store_root: str,
+    data_dir: str
+) -> Tuple[float, int]:
+    """OptimizerWorker.load_candles por año + recorrer las velas (lo que consume un backtest)."""
+    worker = OptimizerWorker("bench")
+    worker.logger.setLevel(logging.WARNING)
+    by_year: Dict[int, List[int]] = {}
+    for year, month in months:
+        by_year.setdefault(year, []).append(month)
+    processed = 0
+    t0 = time.perf_counter()
+    for year, year_months in by_year.items():
+        for candle in worker.load_candles("BTCUSDT", timeframe, year, year_months, store_root=store_root, data_dir=data_dir):
+            processed += candle.close is not None
+    return time.perf_counter() - t0, processed
+
+
+def bench_store_to_worker(candles, timeframe, deadline):
+    """CandleStore (.npy mmap por mes) -> OptimizerWorker.load_candles."""
+    groups = _by_month(candles)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CandleStore(tmp)
+        for (year, month), part in groups.items():
+            store.write_month("BTCUSDT", timeframe, year, month, {
+                name: [float(getattr(c, name)) for c in part] for name in COLUMNS
+            })
+        return _load_through_worker(sorted(groups), timeframe, tmp, data_dir=tmp)
+
+
+def bench_csv_to_worker(candles, timeframe, deadline):
+    """CSV mensual de Binance -> OptimizerWorker.load_candles (referencia de store_to_worker)."""
+    groups = _by_month(candles)
+    with tempfile.TemporaryDirectory() as tmp:
+        for (year, month), part in groups.items():
+            path = Path(tmp) / f"BTCUSDT-{timeframe.value}-{year}-{month:02d}.csv"
+            path.write_text("".join(
+                f"{c.timestamp},{c.open},{c.high},{c.low},{c.close},{c.volume},0,0,0,0,0,0\n" for c in part
+            ))
+        return _load_through_worker(sorted(groups), timeframe, os.path.join(tmp, "store"), data_dir=tmp)
+
+
+BENCHMARKS: Dict[str, BenchFn] = {
+    'market_update': bench_market_update,
+    'market_indicators': bench_market_indicators,
+    'detect_ob': bench_detect_ob,
+    'strategy_analyze': bench_strategy_analyze,
+    'combiner_signal': bench_combiner_signal,
+    'orchestrator_decide': bench_orchestrator_decide,
+    'broker_update': bench_broker_update,
+    'feature_extractor': bench_feature_extractor,
+    'worker_run': bench_worker_run,
+    'store_to_worker': bench_store_to_worker,
+    'csv_to_worker': bench_csv_to_worker,
+}
+
+
+# --- Escalado ---
+
+def scaling_exponent(points: List[Tuple[int, float]]) -> Optional[float]:
+    """
+    Pendiente de log(segundos) vs log(velas) por mínimos cuadrados.
+
+    ~1 = lineal, ~2 = cuadrático. None si no hay dos tamaños medibles.
+    """
+    usable = [(n, s) for n, s in points if n > 0 and s >= MIN_FIT_SECONDS]
+    if len({n for n, _ in usable}) < 2:
+        return None
+    xs = [math.log(n) for n, _ in usable]
+    ys = [math.log(s) for _, s in usable]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return cov / var_x
+
+
+def analyze_scaling(results: List[Dict[str, Any]], threshold: float) -> Dict[str, Dict[str, Any]]:
+    groups: Dict[str, List[Tuple[int, float]]] = {}
+    for r in results:
+        if r.get('skipped'):
+            continue
+        groups.setdefault(f"{r['benchmark']}/{r['source']}/{r['timeframe']}", []).append(
+            (r['candles_processed'], r['seconds'])
+        )
+    scaling = {}
+    for key, points in sorted(groups.items()):
+        exponent = scaling_exponent(points)
+        scaling[key] = {
+            'exponent': round(exponent, 3) if exponent is not None else None,
+            'quadratic': exponent is not None and exponent >= threshold
+        }
+    return scaling
+
+
+# --- Ejecución ---
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=ROOT
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(
+    sizes: List[int],
+    timeframes: List[str],
+    names: List[str],
+    budget: float,
+    use_real: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Ejecuta cada benchmark por fuente/timeframe en tamaños crecientes.
+
+    Un benchmark se corta al superar `budget` segundos (se registra lo
+    procesado) y los tamaños siguientes de esa serie se omiten.
+    """
+    sources: List[Tuple[str, Timeframe, Callable[[int], List[Candle]]]] = [
+        ('synthetic', Timeframe(tf), lambda n, tf=Timeframe(tf): synthetic_candles(n, tf))
+        for tf in timeframes
+    ]
+    real = real_candles() if use_real else []
+    if real:
+        sources.append(('btc4h', Timeframe.H4, lambda n: real[:n]))
+
+    results = []
+    for source, timeframe, make in sources:
+        datasets = {}
+        for n in sorted(sizes):
+            candles = make(n)
+            datasets[n] = candles if len(candles) == n else None
+
+        for name in names:
+            exhausted = False
+            for n in sorted(sizes):
+                entry = {'benchmark': name, 'source': source, 'timeframe': timeframe.value, 'candles': n}
+                candles = datasets[n]
+                if candles is None or exhausted:
+                    entry['skipped'] = 'not enough data' if candles is None else 'budget exceeded at smaller size'
+                    results.append(entry)
+                    continue
+
+                seconds, processed = BENCHMARKS[name](candles, timeframe, time.perf_counter() + budget)
+                entry.update({
+                    'candles_processed': processed,
+                    'seconds': round(seconds, 6),
+                    'us_per_candle': round(seconds / processed * 1e6, 3) if processed else None,
+                    'truncated': processed < n
+                })
+                results.append(entry)
+                exhausted = processed < n or seconds > budget
+                print(f"  {name:<20} {source:<9} {timeframe.value:>4} n={n:<7} "
+                      f"{seconds:9.3f}s  {entry['us_per_candle'] or 0:10.1f} us/candle"
+                      f"{'  (truncated)' if entry['truncated'] else ''}")
+    return results
+
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    """Imprime el ratio de us/candle frente a otro JSON (>1 = más lento)."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def index(report):
+        return {
+            (r['benchmark'], r['source'], r['timeframe'], r['candles']): r
+            for r in report['results'] if not r.get('skipped')
+        }
+
+    old, new = index(baseline), index(current)
+    print()
+    print(f"Comparison vs {baseline.get('commit')} ({baseline_path})")
+    for key in sorted(set(old) & set(new)):
+        before, after = old[key]['us_per_candle'], new[key]['us_per_candle']
+        if not before or not after:
+            continue
+        ratio = after / before
+        flag = "  REGRESSION" if ratio > REGRESSION_RATIO else ""
+        print(f"  {key[0]:<20} {key[1]:<9} {key[2]:>4} n={key[3]:<7} {before:10.1f} -> {after:10.1f} us ({ratio:5.2f}x){flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the backtest hot path')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Candle counts')
+    parser.add_argument('--timeframes', nargs='+', default=DEFAULT_TIMEFRAMES, help='Synthetic data timeframes')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS), help='Benchmarks to run')
+    parser.add_argument('--budget', type=float, default=120.0, help='Seconds per measurement before truncating')
+    parser.add_argument('--quadratic-threshold', type=float, default=1.5, help='Log-log exponent flagged as quadratic')
+    parser.add_argument('--no-real', action='store_true', help=f'Skip {REAL_DATA_PATH}')
+    parser.add_argument('--output', type=str, default=None, help='JSON output path')
+    parser.add_argument('--compare', type=str, default=None, help='Previous benchmark JSON to compare against')
+
+    args = parser.parse_args()
+
+    commit = git_commit()
+    print(f"Benchmarking commit {commit}: sizes={args.sizes} timeframes={args.timeframes}")
+    results = run_suite(args.sizes, args.timeframes, args.only, args.budget, use_real=not args.no_real)
+    scaling = analyze_scaling(results, args.quadratic_threshold)
+
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': sorted(args.sizes),
+        'quadratic_threshold': args.quadratic_threshold,
+        'results': results,
+        'scaling': scaling
+    }
+
+    output = Path(args.output) if args.output else OUTPUT_DIR / f"bench_{commit}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    print("Scaling (log-log exponent, ~1 linear, ~2 quadratic):")
+    for key, info in scaling.items():
+        exponent = info['exponent']
+        mark = "  <-- QUADRATIC" if info['quadratic'] else ""
+        print(f"  {key:<45} {exponent if exponent is not None else 'n/a':>6}{mark}")
+
+    flagged = [key for key, info in scaling.items() if info['quadratic']]
+    if flagged:
+        print()
+        print(f"WARNING: {len(flagged)} benchmark(s) scale super-linearly: {', '.join(flagged)}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+    print()
+    print(f"Results saved to: {output}")
@@ -0,0 +1,98 @@
+"""
+Divergencia entre el modo float64 (búsqueda GA/WFO) y el modo Decimal (auditoría).
+
+Reproduce una ventana con los params por defecto + N individuos aleatorios
+en ambos modos (OptimizerWorker.compare_numeric_modes) y reporta, por
+métrica, la máxima diferencia absoluta/relativa, los individuos cuyo
+número de trades cambia y si el ranking por return coincide.
+
+Uso:
+    python scripts/compare_numeric_modes.py
+    python scripts/compare_numeric_modes.py --months 1 2 3 --population 50 --output results/numeric_divergence.json
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.agents.worker import OptimizerWorker
+from src.core.market import load_candles_from_csv
+from src.core.timeframe import Timeframe
+from src.optimization.param_space import get_default_param_space
+from src.simulation.numeric import DIVERGENCE_KEYS
+from src.utils.candle_store import CandleStore
+from scripts.run_wfo import segment_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare float64 vs Decimal backtests on one window')
+    parser.add_argument('--year', type=int, default=2024)
+    parser.add_argument('--months', type=int, nargs='+', default=[1, 2, 3])
+    parser.add_argument('--warmup', type=int, default=240, help='Warmup candles before the window')
+    parser.add_argument('--population', type=int, default=20, help='Individuals (defaults + random)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str, default=None, help='Optional JSON report path')
+    args = parser.parse_args()
+
+    # Store columnar si existe, si no el CSV (como run_wfo)
+    candles_path = "data/BTCUSDT_4h_2024.csv"
+    store = CandleStore()
+    if store.months("BTCUSDT", Timeframe.H4):
+        source = store.root
+        candles = store.load_candles("BTCUSDT", Timeframe.H4, year=args.year)
+    elif os.path.exists(candles_path):
+        source = candles_path
+        candles = load_candles_from_csv(candles_path)
+    else:
+        print(f"ERROR: no candles in {store.root} and {candles_path} not found")
+        return
+    months = {(args.year, month) for month in args.months}
+    window = [c for c in candles if _year_month(c) in months]
+    if not window:
+        print(f"ERROR: no candles for {args.year} months {args.months} in {source}")
+        return
+    first = candles.index(window[0])
+    warmup = candles[max(0, first - args.warmup):first]
+
+    space = get_default_param_space()
+    random.seed(args.seed)
+    params_list = [space.get_defaults()] + [space.sample_random(seed=None) for _ in range(args.population - 1)]
+
+    config = segment_config("numeric_divergence", window)
+    start = time.time()
+    report = OptimizerWorker("numeric_divergence").compare_numeric_modes(
+        config, params_list, candles=window, warmup_candles=warmup
+    )
+    elapsed = time.time() - start
+
+    print(f"Window: {len(window)} candles ({args.year} months {args.months}), {len(params_list)} individuals, {elapsed:.1f}s")
+    print(f"{'metric':<16}{'max abs diff':>16}{'max rel diff':>16}")
+    for key in DIVERGENCE_KEYS:
+        print(f"{key:<16}{max(r[key]['abs_diff'] for r in report):>16.3e}{max(r[key]['rel_diff'] for r in report):>16.3e}")
+
+    changed = [i for i, r in enumerate(report) if r['total_trades']['abs_diff'] > 0]
+    rank = lambda mode: sorted(range(len(report)), key=lambda i: -report[i]['return'][mode])
+    print(f"Individuals with different trade count: {changed or 'none'}")
+    print(f"Ranking by return identical: {rank('decimal') == rank('float')}")
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'params': params_list, 'divergence': report}, indent=2, default=str))
+        print(f"Report saved to: {path}")
+
+
+def _year_month(candle) -> tuple:
+    # UTC, como las particiones mensuales del store
+    moment = datetime.fromtimestamp(candle.timestamp / 1000, tz=timezone.utc)
+    return moment.year, moment.month
+
+
+if __name__ == "__main__":
+    main()
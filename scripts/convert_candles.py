@@ -0,0 +1,32 @@
+"""
+Convierte CSVs de Binance (data/raw/*.csv, data/*_YYYY.csv) al store columnar
+(.npy por símbolo/timeframe/mes) que leen OptimizerWorker, OptimizerEngine y
+run_wfo.py.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+
+from src.utils.candle_store import CandleStore, DEFAULT_STORE_ROOT, convert_csv, convert_directory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert Binance CSV klines to the columnar candle store')
+    parser.add_argument('sources', nargs='*', default=['data/raw', 'data'], help='CSV files or directories')
+    parser.add_argument('--store', type=str, default=DEFAULT_STORE_ROOT, help='Store root directory')
+    
+    args = parser.parse_args()
+    
+    store = CandleStore(args.store)
+    start = time.time()
+    written = []
+    for source in args.sources:
+        if os.path.isdir(source):
+            written.extend(convert_directory(source, store))
+        else:
+            written.extend(convert_csv(source, store))
+    
+    print(f"Wrote {len(written)} month files to {store.root} in {time.time() - start:.2f}s")
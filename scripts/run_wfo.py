@@ -9,9 +9,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import json
 import time
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import argparse
+import hashlib
 import math
 
 from src.core.market import load_candles_from_csv
@@ -20,6 +21,46 @@ from src.optimization.windows import generate_windows, WindowConfig
 from src.optimization.param_space import get_default_param_space
 from src.optimization.fitness import calculate_fitness, SegmentMetrics
 from src.optimization.genetic_algorithm import GeneticAlgorithm, GAConfig
+from src.optimization.parallel import BatchEvaluator, ProcessPoolEvaluator
+from src.optimization.fitness_cache import FitnessCache, current_code_version
+from src.utils.fingerprint import candles_fingerprint
+from src.utils.candle_store import CandleStore
+from src.utils.shared_dataset import attach, publish_with_features
+from src.core.timeframe import Timeframe
+from src.simulation.numeric import DECIMAL, FLOAT, NUMERIC_MODES
+
+
+def segment_config(backtest_run_id: str, candles, numeric_mode: str = DECIMAL) -> Dict[str, Any]:
+    """Config de backtest de un tramo de entrenamiento (SubTrain / ValTrain)."""
+    return {
+        "pair": "BTCUSDT",
+        "timeframe": "4h",
+        "year": 2024,
+        "months": extract_months_from_candles(candles),
+        "backtest_run_id": backtest_run_id,
+        "initial_balance": 10000.0,
+        "stop_loss": 100,  # Fallback only; GA's stop_loss_atr_mult takes priority
+        "take_profit_multiplier": 2.0,  # Fallback only; GA's take_profit_r_mult takes priority
+        "fee_rate": 0.001,
+        "risk_per_trade_pct": 1.0,  # Fallback only; GA's risk_per_trade_pct takes priority
+        "use_msc": True,
+        "max_portfolio_risk": 0.10,
+        "use_dd_scaling": True,
+        "numeric_mode": numeric_mode
+    }
+
+
+def segment_metrics(result: Dict[str, Any]) -> SegmentMetrics:
+    """SegmentMetrics a partir del resultado de OptimizerWorker (_calculate_metrics)."""
+    return SegmentMetrics(
+        trades=result.get("total_trades", 0),
+        return_pct=result.get("return", 0.0) / 100.0 if result.get("return") else 0.0,
+        maxdd=result.get("max_drawdown", 0.0) / 100.0 if result.get("max_drawdown") else 0.0,
+        sharpe=result.get("sharpe", 0.0),
+        pf=result.get("profit_factor", 0.0),
+        gross_profit=result.get("gross_profit", 0.0),
+        gross_loss=result.get("gross_loss", 0.0)
+    )
 
 
 def create_fitness_function(
@@ -27,44 +68,31 @@ def create_fitness_function(
     subtrain_data,
     valtrain_data,
     param_space,
-    window_warmup_data
+    window_warmup_data,
+    features_map=None,
+    numeric_mode: str = DECIMAL
 ):
     """
     Crea función de fitness que usa Worker REAL.
     
     Esta función se llama 256 veces por window (GA evaluations).
+    features_map (opcional): features precalculadas (dataset compartido).
+    numeric_mode: 'float' para la búsqueda rápida, 'decimal' para auditar.
     """
     def fitness_fn(params: Dict[str, Any]) -> float:
         """
         Evalúa params haciendo backtest en SubTrain y ValTrain.
         """
         try:
-            # Backtest en SubTrain
-            subtrain_months = extract_months_from_candles(subtrain_data)
-            config_sub = {
-                "pair": "BTCUSDT",
-                "timeframe": "4h",
-                "year": 2024,
-                "months": subtrain_months,
-                "backtest_run_id": "wfo_subtrain",
-                "initial_balance": 10000.0,
-                "stop_loss": 100,  # Fallback only; GA's stop_loss_atr_mult takes priority
-                "take_profit_multiplier": 2.0,  # Fallback only; GA's take_profit_r_mult takes priority
-                "fee_rate": 0.001,
-                "risk_per_trade_pct": 1.0,  # Fallback only; GA's risk_per_trade_pct takes priority
-                "use_msc": True,
-                "max_portfolio_risk": 0.10,
-                "use_dd_scaling": True
-            }
-            
             # Backtest en SubTrain
             # Use window_warmup_data for SubTrain (as it is the start of Train)
             result_sub = worker.run(
-                config=config_sub,
+                config=segment_config("wfo_subtrain", subtrain_data, numeric_mode),
                 params=params,
                 candles=subtrain_data,
                 warmup_candles=window_warmup_data,
-                initial_balance=10000.0
+                initial_balance=10000.0,
+                features_map=features_map
             )
             
             # DEBUG LOGGING
@@ -72,58 +100,25 @@ def create_fitness_function(
                   f"PF={result_sub.get('profit_factor', 0):.2f}, "
                   f"Return={result_sub.get('return', 0) if result_sub.get('return') else 0.0:.1f}%")
             
-            metrics_sub = SegmentMetrics(
-                trades=result_sub.get("total_trades", 0),
-                return_pct=result_sub.get("return", 0.0) / 100.0 if result_sub.get("return") else 0.0,
-                maxdd=result_sub.get("max_drawdown", 0.0) / 100.0 if result_sub.get("max_drawdown") else 0.0,
-                sharpe=result_sub.get("sharpe", 0.0),
-                pf=result_sub.get("profit_factor", 0.0),
-                gross_profit=result_sub.get("gross_profit", 0.0),
-                gross_loss=result_sub.get("gross_loss", 0.0)
-            )
+            metrics_sub = segment_metrics(result_sub)
             
             # DEBUG LOGGING
             print(f"    → SegmentMetrics: {metrics_sub.trades} trades")
             
-            # Backtest en ValTrain
-            valtrain_months = extract_months_from_candles(valtrain_data)
-            config_val = {
-                "pair": "BTCUSDT",
-                "timeframe": "4h",
-                "year": 2024,
-                "months": valtrain_months,
-                "backtest_run_id": "wfo_valtrain",
-                "initial_balance": 10000.0,
-                "stop_loss": 100,  # Fallback only; GA's stop_loss_atr_mult takes priority
-                "take_profit_multiplier": 2.0,  # Fallback only; GA's take_profit_r_mult takes priority
-                "fee_rate": 0.001,
-                "risk_per_trade_pct": 1.0,  # Fallback only; GA's risk_per_trade_pct takes priority
-                "use_msc": True,
-                "max_portfolio_risk": 0.10,
-                "use_dd_scaling": True
-            }
-            
             # Backtest en ValTrain
             # Warmup for ValTrain is the end of SubTrain
             val_warmup = subtrain_data[-240:] if len(subtrain_data) >= 240 else subtrain_data
             
             result_val = worker.run(
-                config=config_val,
+                config=segment_config("wfo_valtrain", valtrain_data, numeric_mode),
                 params=params,
                 candles=valtrain_data,
                 warmup_candles=val_warmup,
-                initial_balance=10000.0
+                initial_balance=10000.0,
+                features_map=features_map
             )
             
-            metrics_val = SegmentMetrics(
-                trades=result_val.get("total_trades", 0),
-                return_pct=result_val.get("return", 0.0) / 100.0 if result_val.get("return") else 0.0,
-                maxdd=result_val.get("max_drawdown", 0.0) / 100.0 if result_val.get("max_drawdown") else 0.0,
-                sharpe=result_val.get("sharpe", 0.0),
-                pf=result_val.get("profit_factor", 0.0),
-                gross_profit=result_val.get("gross_profit", 0.0),
-                gross_loss=result_val.get("gross_loss", 0.0)
-            )
+            metrics_val = segment_metrics(result_val)
             
             # Calcular fitness
             fitness = calculate_fitness(
@@ -142,6 +137,117 @@ def create_fitness_function(
     return fitness_fn
 
 
+def create_population_fitness_function(
+    worker: OptimizerWorker,
+    subtrain_data,
+    valtrain_data,
+    param_space,
+    window_warmup_data,
+    features_map=None,
+    numeric_mode: str = DECIMAL
+):
+    """
+    Igual que create_fitness_function pero para la generación entera:
+    SubTrain y ValTrain se recorren una vez para toda la población
+    (OptimizerWorker.run_population), mismos resultados por individuo.
+
+    Si la pasada conjunta falla, esa generación se evalúa individuo a
+    individuo (worker.run): solo el individuo que falla queda en -inf.
+    """
+    val_warmup = subtrain_data[-240:] if len(subtrain_data) >= 240 else subtrain_data
+    single_fitness_fn = create_fitness_function(
+        worker, subtrain_data, valtrain_data, param_space,
+        window_warmup_data, features_map=features_map, numeric_mode=numeric_mode
+    )
+
+    def population_fitness_fn(params_list: List[Dict[str, Any]]) -> List[float]:
+        segment = "SubTrain"
+        try:
+            results_sub = worker.run_population(
+                segment_config("wfo_subtrain", subtrain_data, numeric_mode),
+                params_list,
+                candles=subtrain_data,
+                warmup_candles=window_warmup_data,
+                initial_balance=10000.0,
+                features_map=features_map
+            )
+            segment = "ValTrain"
+            results_val = worker.run_population(
+                segment_config("wfo_valtrain", valtrain_data, numeric_mode),
+                params_list,
+                candles=valtrain_data,
+                warmup_candles=val_warmup,
+                initial_balance=10000.0,
+                features_map=features_map
+            )
+        except Exception as e:
+            print(f"Error en population evaluation ({segment}, {len(params_list)} individuals): "
+                  f"{type(e).__name__}: {e} -> evaluating one by one")
+            return [single_fitness_fn(params) for params in params_list]
+
+        fitnesses = []
+        for params, result_sub, result_val in zip(params_list, results_sub, results_val):
+            print(f"    SubTrain: {result_sub.get('total_trades', 0)} trades, "
+                  f"PF={result_sub.get('profit_factor', 0):.2f}, "
+                  f"Return={result_sub.get('return', 0) if result_sub.get('return') else 0.0:.1f}%")
+            try:
+                fitnesses.append(calculate_fitness(
+                    params=params,
+                    metrics_sub=segment_metrics(result_sub),
+                    metrics_val=segment_metrics(result_val),
+                    param_space=param_space
+                ))
+            except Exception as e:
+                print(f"Error en fitness evaluation: {e}")
+                fitnesses.append(float('-inf'))
+        return fitnesses
+
+    return population_fitness_fn
+
+
+def build_fitness_function(
+    worker_id: str,
+    dataset_handle,
+    ranges: Dict[str, Tuple[int, int]],
+    numeric_mode: str = DECIMAL
+):
+    """
+    Factory top-level (picklable) para ProcessPoolEvaluator.
+
+    Se ejecuta una vez por proceso: cada worker del pool tiene su propio
+    OptimizerWorker (y sus caches). Las velas y features no viajan en el
+    pickle: el proceso se adjunta al dataset compartido por nombre y toma
+    cada tramo por rango de timestamps (start_ts, end_ts).
+    """
+    dataset = attach(dataset_handle)
+    parts = {
+        name: dataset.between(*bounds) if bounds else []
+        for name, bounds in ranges.items()
+    }
+    return create_fitness_function(
+        worker=OptimizerWorker(worker_id=worker_id),
+        subtrain_data=parts['subtrain'],
+        valtrain_data=parts['valtrain'],
+        param_space=get_default_param_space(),
+        window_warmup_data=parts['warmup'],
+        features_map=dataset.features,
+        numeric_mode=numeric_mode
+    )
+
+
+def candle_range(candles) -> Optional[Tuple[int, int]]:
+    """(primer, último) timestamp de un tramo contiguo, None si está vacío."""
+    if not candles:
+        return None
+    return candles[0].timestamp, candles[-1].timestamp
+
+
+def fitness_code_version() -> str:
+    """Versión de src/ + este script (la fitness function vive aquí)."""
+    script_hash = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=4).hexdigest()
+    return f"{current_code_version()}-{script_hash}"
+
+
 def extract_months_from_candles(candles) -> List[int]:
     """
     Extrae lista de meses únicos de un conjunto de candles.
@@ -171,9 +277,19 @@ def split_train_data(train_data, n_months_train: int):
     return subtrain_data, valtrain_data
 
 
-def run_wfo(population_size: int = 50, num_generations: int = 10, window_limit: int = None):
+def run_wfo(
+    population_size: int = 50,
+    num_generations: int = 10,
+    window_limit: int = None,
+    workers: int = 1,
+    fitness_cache_path: str = None,
+    numeric_mode: str = FLOAT
+):
     """
     Ejecuta Walk-Forward Optimization completo.
+
+    numeric_mode aplica a la búsqueda GA (SubTrain/ValTrain); el backtest
+    OOS de cada window corre siempre en Decimal (auditoría).
     """
     print("="*70)
     print("WALK-FORWARD OPTIMIZATION - BOT8000 v3")
@@ -213,18 +329,27 @@ def run_wfo(population_size: int = 50, num_generations: int = 10, window_limit:
     print(f"  Population: {config_ga.population_size}")
     print(f"  Generations: {config_ga.num_generations}")
     print(f"  Max evaluations per window: ~256")
+    print(f"  Workers: {workers}")
+    print(f"  Fitness cache: {fitness_cache_path or 'memory only'}")
+    print(f"  Numeric mode (search): {numeric_mode} (OOS: {DECIMAL})")
     print()
     
-    # Cargar datos completos
-    print("Loading candles from CSV...")
+    # Cargar datos completos (store columnar si existe, si no CSV)
     candles_path = "data/BTCUSDT_4h_2024.csv"
-    
-    if not os.path.exists(candles_path):
+    store = CandleStore()
+    
+    if store.months("BTCUSDT", Timeframe.H4):
+        print(f"Loading candles from columnar store ({store.root})...")
+        # Serie sobre columnas mmap: las velas se construyen al recorrerla
+        full_data = store.load("BTCUSDT", Timeframe.H4, year=2024)
+    elif os.path.exists(candles_path):
+        print("Loading candles from CSV...")
+        full_data = load_candles_from_csv(candles_path)
+    else:
         print(f"ERROR: {candles_path} not found")
         print("Please ensure you have 2024 data available")
         return
     
-    full_data = load_candles_from_csv(candles_path)
     print(f"Loaded {len(full_data)} candles")
     print()
     
@@ -238,145 +363,201 @@ def run_wfo(population_size: int = 50, num_generations: int = 10, window_limit:
         print(f"Limiting to {window_limit} windows for testing.")
     print()
     
+    # Pool: velas + features en memoria compartida una sola vez para todas las windows
+    shared_dataset = None
+    if workers > 1:
+        shared_dataset = publish_with_features(full_data, Timeframe.H4)
+        print(f"Published shared dataset: {shared_dataset.handle.nbytes / 1e6:.1f} MB")
+        print()
+    
     # Resultados
     results = []
     cumulative_balance = 10000.0
     
-    # Procesar cada window
-    for i, window in enumerate(windows):
-        print("="*70)
-        print(f"WINDOW {i+1}/{len(windows)}: {window.label}")
-        print("="*70)
-        print()
+    try:
+        # Procesar cada window
+        for i, window in enumerate(windows):
+            print("="*70)
+            print(f"WINDOW {i+1}/{len(windows)}: {window.label}")
+            print("="*70)
+            print()
         
-        start_time = time.time()
+            start_time = time.time()
         
-        # Split train
-        print(f"  Train data: {len(window.train_data)} candles")
-        subtrain_data, valtrain_data = split_train_data(
-            window.train_data,
-            config_windows.train_months
-        )
-        print(f"  SubTrain: {len(subtrain_data)} candles")
-        print(f"  ValTrain: {len(valtrain_data)} candles")
-        print()
+            # Split train
+            print(f"  Train data: {len(window.train_data)} candles")
+            subtrain_data, valtrain_data = split_train_data(
+                window.train_data,
+                config_windows.train_months
+            )
+            print(f"  SubTrain: {len(subtrain_data)} candles")
+            print(f"  ValTrain: {len(valtrain_data)} candles")
+            print()
         
-        # Crear worker
-        worker = OptimizerWorker(worker_id=f"wfo_w{i+1}")
+            # Crear worker
+            worker = OptimizerWorker(worker_id=f"wfo_w{i+1}")
         
-        # Crear fitness function
-        print(f"  Creating fitness function...")
-        fitness_fn = create_fitness_function(
-            worker=worker,
-            subtrain_data=subtrain_data,
-            valtrain_data=valtrain_data,
-            param_space=param_space,
-            window_warmup_data=window.warmup_data
-        )
+            # Crear fitness function
+            print(f"  Creating fitness function...")
+            fitness_fn = create_fitness_function(
+                worker=worker,
+                subtrain_data=subtrain_data,
+                valtrain_data=valtrain_data,
+                param_space=param_space,
+                window_warmup_data=window.warmup_data,
+                numeric_mode=numeric_mode
+            )
         
-        # Ejecutar GA
-        print(f"  Running GA optimization...")
-        print(f"  This may take several hours...")
-        print()
+            # Ejecutar GA
+            print(f"  Running GA optimization...")
+            print(f"  This may take several hours...")
+            print()
         
-        ga = GeneticAlgorithm(
-            param_space=param_space,
-            config=config_ga,
-            fitness_function=fitness_fn
-        )
+            if workers > 1:
+                # Pool persistente por window: cada proceso carga los datos una vez
+                ranges = {
+                    'warmup': candle_range(window.warmup_data),
+                    'subtrain': candle_range(subtrain_data),
+                    'valtrain': candle_range(valtrain_data)
+                }
+                evaluator = ProcessPoolEvaluator(
+                    build_fitness_function,
+                    factory_args=(f"wfo_w{i+1}", shared_dataset.handle, ranges, numeric_mode),
+                    max_workers=workers,
+                    seed=config_ga.seed
+                )
+            else:
+                # Un solo proceso: backtest lockstep de toda la generación por tramo
+                evaluator = BatchEvaluator(create_population_fitness_function(
+                    worker=worker,
+                    subtrain_data=subtrain_data,
+                    valtrain_data=valtrain_data,
+                    param_space=param_space,
+                    window_warmup_data=window.warmup_data,
+                    numeric_mode=numeric_mode
+                ))
         
-        best_individual, history = ga.optimize()
+            # Fitness memo: misma ventana + mismo código -> reutiliza evaluaciones
+            window_fingerprint = ":".join(
+                candles_fingerprint(part) for part in (window.warmup_data, subtrain_data, valtrain_data)
+            )
+            fitness_cache = FitnessCache(
+                data_fingerprint=window_fingerprint,
+                code_version=f"{fitness_code_version()}-{numeric_mode}",
+                path=fitness_cache_path
+            )
         
-        # Phase 4: Guard against all-`-inf` GA result
-        if not math.isfinite(best_individual.fitness):
-            print(f"  ⚠️ WARNING: No valid solution found (fitness=-inf). Using default params.")
-            best_individual.params = param_space.get_defaults()
+            ga = GeneticAlgorithm(
+                param_space=param_space,
+                config=config_ga,
+                fitness_function=fitness_fn,
+                evaluator=evaluator,
+                fitness_cache=fitness_cache
+            )
         
-        elapsed = time.time() - start_time
-        print()
-        print(f"  GA completed in {elapsed/3600:.1f} hours")
-        best_fit_str = f"{best_individual.fitness:.4f}" if math.isfinite(best_individual.fitness) else "-inf"
-        print(f"  Best fitness (train): {best_fit_str}")
-        print(f"  Generations run: {len(history)}")
-        print()
+            try:
+                best_individual, history = ga.optimize()
+            finally:
+                if evaluator:
+                    evaluator.close()
+        
+            # Phase 4: Guard against all-`-inf` GA result
+            if not math.isfinite(best_individual.fitness):
+                print(f"  ⚠️ WARNING: No valid solution found (fitness=-inf). Using default params.")
+                best_individual.params = param_space.get_defaults()
+        
+            elapsed = time.time() - start_time
+            print()
+            print(f"  GA completed in {elapsed/3600:.1f} hours")
+            best_fit_str = f"{best_individual.fitness:.4f}" if math.isfinite(best_individual.fitness) else "-inf"
+            print(f"  Best fitness (train): {best_fit_str}")
+            print(f"  Generations run: {len(history)}")
+            cache_stats = fitness_cache.stats()
+            print(f"  Fitness cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+            print()
         
-        # Backtest en Test OOS con params óptimos
-        print(f"  Running OOS backtest with optimal params...")
-        test_months = extract_months_from_candles(window.test_data)
-        config_test = {
-            "pair": "BTCUSDT",
-            "timeframe": "4h",
-            "year": 2024,
-            "months": test_months,
-            "backtest_run_id": f"wfo_test_w{i+1}",
-            "initial_balance": cumulative_balance,
-            "stop_loss": 100,  # Fallback only; GA's stop_loss_atr_mult takes priority
-            "take_profit_multiplier": 2.0,  # Fallback only; GA's take_profit_r_mult takes priority
-            "fee_rate": 0.001,
-            "risk_per_trade_pct": 1.0,  # Fallback only; GA's risk_per_trade_pct takes priority
-            "use_msc": True,
-            "max_portfolio_risk": 0.10,
-            "use_dd_scaling": True,
-        }
+            # Backtest en Test OOS con params óptimos
+            print(f"  Running OOS backtest with optimal params...")
+            test_months = extract_months_from_candles(window.test_data)
+            config_test = {
+                "pair": "BTCUSDT",
+                "timeframe": "4h",
+                "year": 2024,
+                "months": test_months,
+                "backtest_run_id": f"wfo_test_w{i+1}",
+                "initial_balance": cumulative_balance,
+                "stop_loss": 100,  # Fallback only; GA's stop_loss_atr_mult takes priority
+                "take_profit_multiplier": 2.0,  # Fallback only; GA's take_profit_r_mult takes priority
+                "fee_rate": 0.001,
+                "risk_per_trade_pct": 1.0,  # Fallback only; GA's risk_per_trade_pct takes priority
+                "use_msc": True,
+                "max_portfolio_risk": 0.10,
+                "use_dd_scaling": True,
+                "numeric_mode": DECIMAL,  # OOS = audit path
+            }
         
-        # Warmup for Test is the end of Train
-        test_warmup = window.train_data[-240:] if len(window.train_data) >= 240 else window.train_data
+            # Warmup for Test is the end of Train
+            test_warmup = window.train_data[-240:] if len(window.train_data) >= 240 else window.train_data
         
-        result_test = worker.run(
-            config=config_test,
-            params=best_individual.params,
-            candles=window.test_data,
-            warmup_candles=test_warmup,
-            initial_balance=cumulative_balance
-        )
+            result_test = worker.run(
+                config=config_test,
+                params=best_individual.params,
+                candles=window.test_data,
+                warmup_candles=test_warmup,
+                initial_balance=cumulative_balance
+            )
         
-        # Actualizar balance acumulado
-        new_balance = result_test.get("final_balance", cumulative_balance)
-        window_return = (new_balance - cumulative_balance) / cumulative_balance
+            # Actualizar balance acumulado
+            new_balance = result_test.get("final_balance", cumulative_balance)
+            window_return = (new_balance - cumulative_balance) / cumulative_balance
         
-        print(f"  Test Results:")
-        print(f"    Trades: {result_test.get('trades', 0)}")
-        print(f"    Win Rate: {result_test.get('win_rate', 0.0):.1f}%")
-        print(f"    Profit Factor: {result_test.get('profit_factor', 0.0):.2f}")
-        print(f"    Return: {window_return*100:.2f}%")
-        print(f"    Balance: ${cumulative_balance:.2f} → ${new_balance:.2f}")
-        print()
+            print(f"  Test Results:")
+            print(f"    Trades: {result_test.get('trades', 0)}")
+            print(f"    Win Rate: {result_test.get('win_rate', 0.0):.1f}%")
+            print(f"    Profit Factor: {result_test.get('profit_factor', 0.0):.2f}")
+            print(f"    Return: {window_return*100:.2f}%")
+            print(f"    Balance: ${cumulative_balance:.2f} → ${new_balance:.2f}")
+            print()
         
-        # Guardar resultado
-        window_result = {
-            "window_id": i + 1,
-            "label": window.label,
-            "train_fitness": best_individual.fitness,
-            "train_generations": len(history),
-            "optimal_params": best_individual.params,
-            "test_trades": result_test.get("total_trades", 0),
-            "test_win_rate": result_test.get("win_rate", 0.0),
-            "test_pf": result_test.get("profit_factor", 0.0),
-            "test_return_pct": window_return * 100,
-            "test_maxdd": result_test.get("max_drawdown", 0.0),
-            "test_sharpe": result_test.get("sharpe", 0.0),
-            "start_balance": cumulative_balance,
-            "end_balance": new_balance,
-            "elapsed_hours": elapsed / 3600
-        }
+            # Guardar resultado
+            window_result = {
+                "window_id": i + 1,
+                "label": window.label,
+                "train_fitness": best_individual.fitness,
+                "train_generations": len(history),
+                "optimal_params": best_individual.params,
+                "test_trades": result_test.get("total_trades", 0),
+                "test_win_rate": result_test.get("win_rate", 0.0),
+                "test_pf": result_test.get("profit_factor", 0.0),
+                "test_return_pct": window_return * 100,
+                "test_maxdd": result_test.get("max_drawdown", 0.0),
+                "test_sharpe": result_test.get("sharpe", 0.0),
+                "start_balance": cumulative_balance,
+                "end_balance": new_balance,
+                "elapsed_hours": elapsed / 3600
+            }
         
-        results.append(window_result)
-        cumulative_balance = new_balance
+            results.append(window_result)
+            cumulative_balance = new_balance
 
-        # Partial Save (Auto-save after each window)
-        try:
-            partial_file = Path("results/wfo/partial_results.json")
-            partial_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(partial_file, 'w') as pf:
-                json.dump({
-                    "timestamp": datetime.now().isoformat(),
-                    "windows_completed": len(results),
-                    "current_balance": cumulative_balance,
-                    "results": results
-                }, pf, indent=2)
-            print(f"  [AUTO-SAVE] Window {i+1} saved to {partial_file}")
-        except Exception as e:
-            print(f"  [WARN] Failed to save partial results: {e}")
+            # Partial Save (Auto-save after each window)
+            try:
+                partial_file = Path("results/wfo/partial_results.json")
+                partial_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(partial_file, 'w') as pf:
+                    json.dump({
+                        "timestamp": datetime.now().isoformat(),
+                        "windows_completed": len(results),
+                        "current_balance": cumulative_balance,
+                        "results": results
+                    }, pf, indent=2)
+                print(f"  [AUTO-SAVE] Window {i+1} saved to {partial_file}")
+            except Exception as e:
+                print(f"  [WARN] Failed to save partial results: {e}")
+    finally:
+        # Liberar la memoria compartida aunque falle una window
+        if shared_dataset:
+            shared_dataset.close()
     
     # Análisis agregado
     print()
@@ -484,7 +665,17 @@ if __name__ == "__main__":
     parser.add_argument('--population', type=int, default=50, help='GA Population size')
     parser.add_argument('--generations', type=int, default=10, help='GA Generations')
     parser.add_argument('--limit', type=int, default=None, help='Limit number of windows (for testing)')
+    parser.add_argument('--workers', type=int, default=1, help='Parallel GA evaluation processes (1 = serial)')
+    parser.add_argument('--fitness-cache', type=str, default=None, help='JSONL file to persist GA fitness evaluations')
+    parser.add_argument('--numeric-mode', choices=NUMERIC_MODES, default=FLOAT, help='Numeric mode of the GA search backtests (OOS always decimal)')
     
     args = parser.parse_args()
     
-    run_wfo(population_size=args.population, num_generations=args.generations, window_limit=args.limit)
+    run_wfo(
+        population_size=args.population,
+        num_generations=args.generations,
+        window_limit=args.limit,
+        workers=args.workers,
+        fitness_cache_path=args.fitness_cache,
+        numeric_mode=args.numeric_mode
+    )
@@ -6,8 +6,7 @@ import logging
 import uuid
 
 from src.agents.types import AgentStatus, AgentProgress
-from src.database import get_db_session
-from src.database.repository import AgentLogRepository
+from src.agents.log_sink import get_log_sink
 
 class BaseAgent(ABC):
     """Clase base para todos los agentes del sistema"""
@@ -38,20 +37,14 @@ class BaseAgent(ABC):
             self.logger.setLevel(logging.INFO)
     
     def log(self, level: str, message: str, context: Optional[Dict[str, Any]] = None):
-        """Log con persistencia en DB"""
+        """Log con persistencia en DB (asíncrona, ver agents.log_sink)"""
         # Log a consola
         log_method = getattr(self.logger, level.lower())
         log_method(message)
         
-        # Log a DB
-        # Log a DB
+        # Log a DB: solo se encola, el sink del proceso escribe por lotes
         if self._db_enabled:
-            try:
-                with get_db_session() as db:
-                    AgentLogRepository.log(db, self.agent_name, level.upper(), message, context)
-            except Exception as e:
-                self._db_enabled = False
-                self.logger.warning(f"DB Logging disabled due to error: {e}")
+            get_log_sink().submit(self.agent_name, level, message, context)
     
     def update_progress(self, current: int, total: int, message: str):
         """Actualizar progreso del agente"""
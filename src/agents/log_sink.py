@@ -0,0 +1,182 @@
+# src/agents/log_sink.py
+"""
+Escritura asíncrona de AgentLog.
+
+BaseAgent.log solo encola el registro (put_nowait en una cola acotada);
+un hilo de fondo por proceso lo escribe en lotes (AgentLogRepository.bulk_log)
+cuando el lote llega a batch_size o pasa flush_interval desde el primer
+registro pendiente. Un backtest nunca espera a Postgres: con la cola llena
+el registro se descarta (y se cuenta en `dropped`).
+
+Configuración por entorno (defaults del sink del proceso):
+    AGENT_LOG_DB_LEVEL       nivel mínimo persistido (INFO)
+    AGENT_LOG_BATCH_SIZE     registros por escritura (200)
+    AGENT_LOG_FLUSH_SECONDS  espera máxima de un lote (2.0)
+    AGENT_LOG_QUEUE_SIZE     capacidad de la cola (10000)
+"""
+import atexit
+import logging
+import multiprocessing.util
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.database import get_db_session
+from src.database.repository import AgentLogRepository
+
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+
+# Marca de cierre: el hilo escribe lo pendiente y termina
+_STOP = object()
+
+logger = logging.getLogger("agent.log_sink")
+
+
+def _write_batch(records: List[Dict[str, Any]]) -> None:
+    with get_db_session() as db:
+        AgentLogRepository.bulk_log(db, records)
+
+
+class AgentLogSink:
+    """
+    Cola acotada + hilo escritor de AgentLog.
+
+    Args:
+        min_level: Nivel mínimo que se persiste (los demás solo van a consola).
+        batch_size: Registros por escritura.
+        flush_interval: Segundos máximos que un registro espera en el lote.
+        max_queue: Capacidad de la cola; llena -> el registro se descarta.
+        writer: Escribe un lote (default: una sesión + bulk_log por lote).
+    """
+
+    def __init__(
+        self,
+        min_level: str = 'INFO',
+        batch_size: int = 200,
+        flush_interval: float = 2.0,
+        max_queue: int = 10000,
+        writer: Callable[[List[Dict[str, Any]]], None] = _write_batch
+    ):
+        if min_level.upper() not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level '{min_level}'")
+        self.min_level = LOG_LEVELS[min_level.upper()]
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.writer = writer
+        self.enabled = True
+        self.dropped = 0
+        self.written = 0
+        self.pid = os.getpid()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="agent-log-sink", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        agent_name: str,
+        level: str,
+        message: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Encola un log sin bloquear. False si se filtró o descartó."""
+        level = level.upper()
+        if not self.enabled or self._closed or LOG_LEVELS.get(level, 0) < self.min_level:
+            return False
+        try:
+            self._queue.put_nowait({
+                'agent_name': agent_name,
+                'log_level': level,
+                'message': message,
+                'context': context,
+                'timestamp': datetime.utcnow()
+            })
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+                deadline = None
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        if not self.enabled:
+            self.dropped += len(batch)
+            return
+        try:
+            self.writer(batch)
+            self.written += len(batch)
+        except Exception as e:
+            # Igual que antes: si la DB falla se deja de persistir en este proceso
+            self.enabled = False
+            self.dropped += len(batch)
+            logger.warning(f"DB Logging disabled due to error: {e}")
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Escribe lo que queda en la cola y detiene el hilo."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            # El hilo sigue drenando: la marca entra aunque la cola esté llena
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+_sink: Optional[AgentLogSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_log_sink() -> AgentLogSink:
+    """Sink del proceso (se crea al primer uso; uno nuevo tras un fork)."""
+    global _sink
+    if _sink is None or _sink.pid != os.getpid():
+        with _sink_lock:
+            if _sink is None or _sink.pid != os.getpid():
+                _sink = AgentLogSink(
+                    min_level=os.getenv("AGENT_LOG_DB_LEVEL", "INFO"),
+                    batch_size=int(os.getenv("AGENT_LOG_BATCH_SIZE", "200")),
+                    flush_interval=float(os.getenv("AGENT_LOG_FLUSH_SECONDS", "2.0")),
+                    max_queue=int(os.getenv("AGENT_LOG_QUEUE_SIZE", "10000"))
+                )
+                # Procesos de un pool no pasan por atexit (os._exit): drenar al salir
+                multiprocessing.util.Finalize(None, shutdown_log_sink, exitpriority=10)
+    return _sink
+
+
+def shutdown_log_sink(timeout: Optional[float] = 5.0) -> None:
+    """Drena y cierra el sink del proceso (registrado en atexit)."""
+    global _sink
+    sink = _sink
+    if sink is not None and sink.pid == os.getpid():
+        sink.close(timeout)
+        _sink = None
+
+
+atexit.register(shutdown_log_sink)
@@ -6,6 +6,10 @@ from datetime import datetime
 
 from src.agents.base import BaseAgent
 from src.agents.worker import OptimizerWorker
+from src.core.timeframe import Timeframe
+from src.ml.features import FeatureExtractor
+from src.utils.candle_store import DEFAULT_STORE_ROOT
+from src.utils.shared_dataset import SharedDataset, publish_with_features
 from src.database import get_db_session
 from src.database.repository import BacktestRunRepository
 
@@ -52,38 +56,45 @@ class OptimizerSwarm(BaseAgent):
         
         self.log('INFO', f"Generated {total_configs} configurations to test with {self.num_workers} workers")
         
+        # Load each pair/timeframe/year once; workers attach to it by name
+        datasets = self._publish_datasets(configs, config.get('candle_store', DEFAULT_STORE_ROOT))
+        
         # Execute in parallel
         results = []
         completed = 0
         failed = 0
         
-        with ProcessPoolExecutor(max_workers=self.num_workers) as pool:
-            # Submit all tasks
-            # Note: _run_worker must be at module level or static if using ProcessPool on some systems
-            # but usually within a class method it needs to be carefully handled.
-            # In Python, we often use a helper function at the top level.
-            future_to_config = {
-                pool.submit(_execute_worker_task, i, cfg): cfg
-                for i, cfg in enumerate(configs)
-            }
+        try:
+            with ProcessPoolExecutor(max_workers=self.num_workers) as pool:
+                # Submit all tasks
+                # Note: _run_worker must be at module level or static if using ProcessPool on some systems
+                # but usually within a class method it needs to be carefully handled.
+                # In Python, we often use a helper function at the top level.
+                future_to_config = {
+                    pool.submit(_execute_worker_task, i, cfg): cfg
+                    for i, cfg in enumerate(configs)
+                }
             
-            # Process as they complete
-            for future in as_completed(future_to_config):
-                cfg = future_to_config[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    completed += 1
+                # Process as they complete
+                for future in as_completed(future_to_config):
+                    cfg = future_to_config[future]
+                    try:
+                        result = future.result()
+                        results.append(result)
+                        completed += 1
                     
-                    self.update_progress(
-                        completed + failed,
-                        total_configs,
-                        f"Completed {completed}/{total_configs} configs. Latest: {cfg['pair']} {cfg['timeframe']}"
-                    )
+                        self.update_progress(
+                            completed + failed,
+                            total_configs,
+                            f"Completed {completed}/{total_configs} configs. Latest: {cfg['pair']} {cfg['timeframe']}"
+                        )
                 
-                except Exception as e:
-                    self.log('ERROR', f"Config failed for {cfg['pair']} {cfg['timeframe']}: {str(e)}")
-                    failed += 1
+                    except Exception as e:
+                        self.log('ERROR', f"Config failed for {cfg['pair']} {cfg['timeframe']}: {str(e)}")
+                        failed += 1
+        finally:
+            for dataset in datasets:
+                dataset.close()
         
         # Update backtest run status
         with get_db_session() as db:
@@ -101,6 +112,35 @@ class OptimizerSwarm(BaseAgent):
         
         return final_result
     
+    def _publish_datasets(self, configs: List[Dict[str, Any]], store_root: str) -> List[SharedDataset]:
+        """
+        Publica velas + features por (pair, timeframe, year, months) en
+        memoria compartida y apunta cada config a su dataset.
+        """
+        loader = OptimizerWorker("swarm-loader")
+        extractor = FeatureExtractor()
+        handles: Dict[tuple, Any] = {}
+        datasets = []
+        
+        for cfg in configs:
+            key = (cfg['pair'], cfg['timeframe'], cfg['year'], tuple(cfg['months']))
+            if key not in handles:
+                timeframe = Timeframe(cfg['timeframe'])
+                candles = loader.load_candles(cfg['pair'], timeframe, cfg['year'], cfg['months'], store_root=store_root)
+                handles[key] = None
+                if candles:
+                    # Same features the worker would compute for these candles
+                    dataset = publish_with_features(candles, timeframe, extractor)
+                    datasets.append(dataset)
+                    handles[key] = dataset.handle
+            # No data: leave the config on the disk path so the worker reports it
+            if handles[key] is not None:
+                cfg['dataset'] = handles[key]
+        
+        total_mb = sum(d.handle.nbytes for d in datasets) / 1e6
+        self.log('INFO', f"Published {len(datasets)} shared datasets ({total_mb:.1f} MB)")
+        return datasets
+    
     def _generate_configs(self, config: Dict[str, Any], run_id: uuid.UUID) -> List[Dict[str, Any]]:
         """Generar todas las combinaciones de configuraciones"""
         pairs = config.get('pairs', [])
@@ -1,8 +1,10 @@
 # src/agents/orchestrator.py
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+import numpy as np
+from src.core.candle import Candle
 from src.core.regime import MarketRegime
 from src.core.market import MarketState
-from src.core.classifier import classify_regime
+from src.core.classifier import REGIME_CODES, classify_regime, classify_regime_series, regime_thresholds
 from src.execution.executor import TradeSignal
 
 # Import Agents
@@ -15,6 +17,7 @@ from src.agents.sentiment_scout import SentimentScoutAgent
 # Import Alphas
 from src.alphas.base import Alpha
 from src.alphas.combiner import AlphaCombiner
+from src.alphas.matrix import AlphaMatrix, alpha_key
 from src.alphas.ob_quality import Alpha_OB_Quality
 from src.alphas.momentum import Alpha_Momentum
 from src.alphas.volatility import Alpha_Volatility
@@ -45,38 +48,111 @@ class MSCOrchestrator:
         self.alpha_vol = Alpha_Volatility()
         self.alpha_liq = Alpha_Liquidity()
         self.alpha_ml = Alpha_ML_Confidence() 
+
+        # Precomputed WFO alpha scores of the current data window (optional)
+        self._alpha_matrix: Optional[AlphaMatrix] = None
+        self._matrix_combiner: Optional[AlphaCombiner] = None
+        self._matrix_weights: Optional[Tuple[float, ...]] = None
+        # Regime codes of the bound window for one set of GA thresholds
+        self._regime_codes: Optional[np.ndarray] = None
+        self._regime_thresholds: Optional[Tuple[float, ...]] = None
+
+    def _wfo_alphas(self, params: Dict[str, Any]) -> List[Tuple[Alpha, float]]:
+        """Alpha portfolio of the WFO blending mode with weights scaled by params."""
+        # Base Weights (Standard Portfolio)
+        w_ob = 1.5 * params.get('alpha_ob_weight_mult', 1.0)
+        w_mom = 2.0 * params.get('alpha_mom_weight_mult', 1.0)
+        w_vol = 0.5 * params.get('alpha_vol_weight_mult', 1.0)
+        w_liq = 0.8 * params.get('alpha_liq_weight_mult', 1.0)
+
+        return [
+            (self.alpha_ob, w_ob),
+            (self.alpha_mom, w_mom),
+            (self.alpha_vol, w_vol),
+            (self.alpha_liq, w_liq)
+        ]
+
+    def wfo_weights(self, params: Dict[str, Any]) -> List[Tuple[str, float]]:
+        """(AlphaMatrix column, weight) pairs of the WFO blend for params."""
+        return [(alpha_key(alpha), weight) for alpha, weight in self._wfo_alphas(params)]
+
+    def build_alpha_matrix(
+        self,
+        candles: Sequence[Candle],
+        symbol: str = 'BTCUSDT',
+        start_index: int = 0
+    ) -> AlphaMatrix:
+        """Scores the WFO alphas (and the regime inputs) once for every bar of a data window."""
+        alphas = [alpha for alpha, _ in self._wfo_alphas({})]
+        return AlphaMatrix.build(candles, alphas, symbol, start_index, regimes=True)
+
+    def use_alpha_matrix(self, matrix: Optional[AlphaMatrix]) -> None:
+        """
+        Binds the AlphaMatrix of the window being replayed. decide() calls
+        with `bar_index` then only re-weight precomputed scores and read
+        the regime label from a per-window array.
+        """
+        self._alpha_matrix = matrix
+        self._matrix_combiner = None
+        self._matrix_weights = None
+        self._regime_codes = None
+        self._regime_thresholds = None
+
+    def _classify(
+        self,
+        market_state: MarketState,
+        params: Dict[str, Any] = None,
+        bar_index: Optional[int] = None
+    ) -> MarketRegime:
+        matrix = self._alpha_matrix
+        if bar_index is None or matrix is None or matrix.regime_inputs is None:
+            return classify_regime(market_state, params)
+
+        # The GA only moves the thresholds: classify the whole window once per set
+        thresholds = regime_thresholds(params)
+        if self._regime_codes is None or self._regime_thresholds != thresholds:
+            self._regime_codes = classify_regime_series(matrix.regime_inputs, params)
+            self._regime_thresholds = thresholds
+        return REGIME_CODES[self._regime_codes[bar_index]]
+
+    def _combiner_for(self, alphas_list: List[Tuple[Alpha, float]]) -> AlphaCombiner:
+        if self._alpha_matrix is None:
+            # Note: We create a light combiner just for the signal calculation
+            return AlphaCombiner(alphas_list)
+
+        # Keep one matrix-bound combiner per weight vector so the window
+        # scores are computed once per backtest, not once per bar
+        weights = tuple(weight for _, weight in alphas_list)
+        if self._matrix_combiner is None or self._matrix_weights != weights:
+            self._matrix_combiner = AlphaCombiner(alphas_list)
+            self._matrix_combiner.use_matrix(self._alpha_matrix)
+            self._matrix_weights = weights
+        return self._matrix_combiner
         
-    def decide(self, market_state: MarketState, params: Dict[str, Any] = None) -> Optional[TradeSignal]:
+    def decide(
+        self,
+        market_state: MarketState,
+        params: Dict[str, Any] = None,
+        bar_index: Optional[int] = None
+    ) -> Optional[TradeSignal]:
         """
         Main decision method.
         If 'params' are provided (WFO), uses Weighted Alpha Logic.
         Otherwise, uses standard Regime Switching logic.
+
+        `bar_index` (row of the bound AlphaMatrix) lets the WFO path read
+        precomputed alpha scores and regimes instead of rerunning them.
         """
         # 1. Classify with Params
-        regime = classify_regime(market_state, params)
+        regime = self._classify(market_state, params, bar_index)
         
         if params:
             # --- WFO Dynamic Alpha Logic ---
-            
-            # Base Weights (Standard Portfolio)
-            w_ob = 1.5 * params.get('alpha_ob_weight_mult', 1.0)
-            w_mom = 2.0 * params.get('alpha_mom_weight_mult', 1.0)
-            w_vol = 0.5 * params.get('alpha_vol_weight_mult', 1.0)
-            w_liq = 0.8 * params.get('alpha_liq_weight_mult', 1.0)
-            
-            # Construct Weighted List
-            alphas_list: List[Tuple[Alpha, float]] = [
-                (self.alpha_ob, w_ob),
-                (self.alpha_mom, w_mom),
-                (self.alpha_vol, w_vol),
-                (self.alpha_liq, w_liq)
-            ]
-            
-            # Note: We create a light combiner just for the signal calculation
-            combiner = AlphaCombiner(alphas_list)
+            alphas_list = self._wfo_alphas(params)
+            combiner = self._combiner_for(alphas_list)
             threshold = params.get('alpha_threshold', 0.6)
             
-            signal = combiner.get_signal(market_state, threshold)
+            signal = combiner.get_signal(market_state, threshold, bar_index=bar_index)
             
             # Inject Metadata
             if signal:
@@ -1,26 +1,34 @@
 # src/agents/worker.py
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Tuple, Union
+from collections import OrderedDict
 from pathlib import Path
 from decimal import Decimal
 import uuid
 from datetime import datetime
-import statistics
 import pandas as pd
 import numpy as np
-import math
 
 from src.agents.base import BaseAgent
 from src.database import get_db_session
 from src.database.repository import TradeRepository, BacktestRunRepository
 from src.utils.data_loader import load_binance_csv
+from src.utils.candle_store import CandleStore, DEFAULT_STORE_ROOT
+from src.utils.shared_dataset import attach
 from src.strategy.engine import TJRStrategy
 from src.simulation.broker import InMemoryBroker
+from src.simulation.ledger import TradeLedger
+from src.simulation.metrics import as_float_array, compute_metrics
+from src.simulation.numeric import DECIMAL, FLOAT, check_numeric_mode, numeric_divergence, to_number
+from src.simulation.population import PopulationBacktester, replay_bar_atr
 from src.execution.risk import RiskManager
 from src.execution.executor import TradeExecutor
+from src.core.candle import Candle
 from src.core.market import MarketState
+from src.core.series import MarketSeries
 from src.core.timeframe import Timeframe
-from src.ml.features import FeatureExtractor
+from src.ml.features import FeatureExtractor, FeatureTable
 from src.ml.analyzer import PatternAnalyzer
+from src.utils.fingerprint import candles_fingerprint
 
 # Alphas
 from src.alphas.ob_quality import Alpha_OB_Quality
@@ -29,8 +37,15 @@ from src.alphas.volatility import Alpha_Volatility
 from src.alphas.ml_confidence import Alpha_ML_Confidence
 from src.alphas.liquidity import Alpha_Liquidity
 from src.alphas.combiner import AlphaCombiner
+from src.alphas.matrix import AlphaMatrix
 from src.agents.orchestrator import MSCOrchestrator
 
+# WFO alternates subtrain/valtrain windows for every individual
+ALPHA_MATRIX_CACHE_SIZE = 4
+
+# Trades pendientes por escritura (TradeRepository.bulk_ingest)
+TRADE_FLUSH_SIZE = 1000
+
 class OptimizerWorker(BaseAgent):
     """
     Worker individual que corre backtests para un par/timeframe
@@ -46,6 +61,12 @@ class OptimizerWorker(BaseAgent):
         self.db_failures = 0
         self._cached_features_map: Optional[pd.DataFrame] = None
         self._cached_candles_id: Optional[int] = None
+        # (features_map, candles, FeatureTable) y (FeatureTable, model, probs) de la última ventana
+        self._cached_feature_table: Optional[Tuple] = None
+        self._cached_ml_probs: Optional[Tuple] = None
+        self._alpha_matrices: "OrderedDict[Tuple, AlphaMatrix]" = OrderedDict()
+        # ATR por barra de cada ventana (mismas claves que _alpha_matrices)
+        self._bar_atrs: "OrderedDict[Tuple, List[float]]" = OrderedDict()
 
     
     def run(self, config: Dict[str, Any], **kwargs) -> Dict[str, Any]:
@@ -72,14 +93,7 @@ class OptimizerWorker(BaseAgent):
         ml_model_path = config.get('ml_model_path', 'data/models/rf_model_v1.pkl')
         ml_threshold = config.get('ml_prob_threshold', 0.6)
         
-        analyzer = None
-        if use_ml:
-            analyzer = PatternAnalyzer(ml_model_path)
-            if not analyzer.is_trained:
-                self.log('WARNING', "ML Model requested but no trained model found. Running without ML.")
-                analyzer = None # Fallback
-            else:
-                self.log('INFO', f"Running with ML Filter (Threshold: {ml_threshold})")
+        analyzer = self._load_analyzer(use_ml, ml_model_path, ml_threshold)
         
         
         # Extract WFO Params (Optimization)
@@ -89,6 +103,15 @@ class OptimizerWorker(BaseAgent):
             wfo_params = {}
             # self.log('DEBUG', "No WFO params provided, using defaults")
         
+        # Fast mode (skip-ahead): sin pipeline por vela con posición abierta;
+        # saltos señal -> fill -> salida, sin persistir trades.
+        # numeric_mode 'float' (búsqueda GA) solo existe en ese camino
+        numeric_mode = check_numeric_mode(config.get('numeric_mode', DECIMAL))
+        if (config.get('fast_exits') or numeric_mode == FLOAT) and config.get('use_msc') and wfo_params:
+            return self.run_population(config, [wfo_params])[0]
+        if numeric_mode == FLOAT:
+            raise ValueError("numeric_mode 'float' needs the MSC population path (use_msc with WFO params)")
+        
         # Alpha Engine Setup (Task 6.9)
         use_alpha_engine = config.get('use_alpha_engine', False)
         if use_alpha_engine:
@@ -123,76 +146,34 @@ class OptimizerWorker(BaseAgent):
         
         self.log('INFO', f"Starting backtest for {pair} {timeframe_str} {year}")
         
-        # Load data (Memory vs Disk)
-        candles_arg = config.get('candles')
-        warmup_candles_arg = config.get('warmup_candles', [])
-        
-        if candles_arg:
-            # In-memory execution (WFO/Optimization)
-            # Combine warmup + main data for feature calculation
-            all_candles = warmup_candles_arg + candles_arg
-            # Trading starts after warmup
-            start_index = len(warmup_candles_arg)
-            self.log('INFO', f"Using in-memory data: {len(candles_arg)} main + {len(warmup_candles_arg)} warmup candles")
-        else:
-            # Disk loading (Legacy/Manual run)
-            all_candles = []
-            data_dir = Path("data/raw")
-            
-            for month in months:
-                filename = f"{pair}-{timeframe_str}-{year}-{month:02d}.csv"
-                filepath = data_dir / filename
-                
-                if not filepath.exists():
-                    self.log('WARNING', f"File not found: {filename}")
-                    continue
-                
-                try:
-                    candles = load_binance_csv(str(filepath), timeframe)
-                    all_candles.extend(candles)
-                except Exception as e:
-                    self.log('ERROR', f"Failed to load {filename}: {str(e)}")
-            
-            if not all_candles:
-                raise ValueError(f"No data found for {pair} {timeframe_str} {year}")
-                
-            # Legacy: warmup_data might be passed but not prepended to file data
-            # Use strict approach: if loaded from disk, start_index=0 (unless warmup logic added later)
-            start_index = 0
-            
-            # Legacy warmup handling (kept for compatibility if needed, but discouraged)
-            # If warmup_data passed in kwargs but loading from disk, we prepend it?
-            # For now, keep simple: disk loading = 0 offset.
-        
+        all_candles, start_index = self._load_window(config, pair, timeframe, year, months)
         total_candles = len(all_candles)
         self.log('INFO', f"Total candles to process: {total_candles} (Start trading at index {start_index})")
         
-        # Pre-compute features for performance if ML is needed or for reporting
-        # Convert candles to DataFrame for feature extraction
-        df_candles = pd.DataFrame([{
-            'timestamp': c.timestamp,
-            'open': float(c.open),
-            'high': float(c.high),
-            'low': float(c.low),
-            'close': float(c.close),
-            'volume': float(c.volume)
-        } for c in all_candles])
-        
-        # Check timestamps
-        df_candles['timestamp'] = pd.to_datetime(df_candles['timestamp'], unit='ms')
-        
-        # Optimization for Mac M1: Cache features if candles haven't changed (Task 8.9)
-        current_candles_id = id(all_candles)
-        if self._cached_candles_id == current_candles_id and self._cached_features_map is not None:
-            features_map = self._cached_features_map
-        else:
-            # Calculate features (Expensive operation)
-            self.log('INFO', f"Calculating features for {len(all_candles)} candles...")
-            df_features = self.feature_extractor.add_all_features(df_candles)
-            features_map = df_features.set_index('timestamp')
-            # Store in cache
-            self._cached_features_map = features_map
-            self._cached_candles_id = current_candles_id
+        features_map = self._window_features(config, all_candles)
+        
+        # Features addressed by candle index (market_state of each trade, ML filter)
+        feature_table = self._feature_table(features_map, all_candles)
+        
+        # ML filter: one vectorized predict over the whole features_map;
+        # the hot loop only reads ml_probs[i] (NaN = candle without features)
+        ml_probs = self._ml_probabilities(analyzer, features_map, feature_table) if analyzer else None
+        
+        # Alpha scores do not depend on WFO params: score each window once and
+        # let every run only re-weight them (decide/get_signal with bar_index)
+        if use_msc and orchestrator and wfo_params:
+            window_key = ('msc', candles_fingerprint(all_candles), start_index, pair)
+            orchestrator.use_alpha_matrix(self._get_alpha_matrix(
+                window_key,
+                lambda: orchestrator.build_alpha_matrix(all_candles, pair, start_index)
+            ))
+        elif use_alpha_engine and self._combiner:
+            ml_key = ml_model_path if analyzer is not None else None
+            window_key = ('alpha', candles_fingerprint(all_candles), start_index, pair, ml_key)
+            self._combiner.use_matrix(self._get_alpha_matrix(
+                window_key,
+                lambda: AlphaMatrix.build(all_candles, [alpha for alpha, _ in self._combiner.alphas], pair, start_index)
+            ))
         
         # Initialize trading components
         # Strategy Params
@@ -265,7 +246,7 @@ class OptimizerWorker(BaseAgent):
             
             # Logic manual para poder interceptar la señal
             if hasattr(broker, 'update_positions'):
-                broker.update_positions(candle.close)
+                broker.update_positions(candle.close, bar_index=i)
             
             # SKIP TRADING during Warmup
             if i < start_index:
@@ -276,9 +257,9 @@ class OptimizerWorker(BaseAgent):
                 signal = None
                 if use_msc and orchestrator:
                     # Use decide() with params
-                    signal = orchestrator.decide(market, params=wfo_params)
+                    signal = orchestrator.decide(market, params=wfo_params, bar_index=i)
                 elif use_alpha_engine and self._combiner:
-                    signal = self._combiner.get_signal(market, threshold=config.get('alpha_threshold', 0.6))
+                    signal = self._combiner.get_signal(market, threshold=config.get('alpha_threshold', 0.6), bar_index=i)
                 else:
                     signal = strategy.analyze(market, timeframe)
                 
@@ -335,11 +316,9 @@ class OptimizerWorker(BaseAgent):
                         prob = 0.0
                         
                         if analyzer:
-                            # Buscamos features para esta vela
-                            ts_key = pd.to_datetime(candle.timestamp, unit='ms')
-                            if ts_key in features_map.index:
-                                feats = features_map.loc[[ts_key]]
-                                prob = analyzer.predict_proba(feats)
+                            # Probabilidad pre-calculada para esta vela
+                            if not np.isnan(ml_probs[i]):
+                                prob = float(ml_probs[i])
                                 
                                 if prob < ml_threshold:
                                     is_allowed = False
@@ -362,18 +341,8 @@ class OptimizerWorker(BaseAgent):
                     # Accumulate pending writes
                     for position in closed_positions[trades_saved:]:
                         # Usar features pre-calculadas si existen
-                        ts_key = pd.to_datetime(candle.timestamp, unit='ms')
-                        market_features = {}
-                        
-                        if ts_key in features_map.index:
-                            # Convertir panda Series a dict
-                            market_features_series = features_map.loc[ts_key]
-                            # Handle duplicate timestamps if any (robustness)
-                            if isinstance(market_features_series, pd.DataFrame):
-                                market_features_series = market_features_series.iloc[0]
-                            market_features = market_features_series.to_dict()
-                            # Sanitize types
-                            market_features = {k: float(v) if isinstance(v, (np.float32, np.float64)) else v for k,v in market_features.items()}
+                        if feature_table.has_row(i):
+                            market_features = feature_table.row(i)
                         else:
                             market_features = self._extract_market_state(candle, all_candles[max(0, i-50):i])
                             
@@ -403,8 +372,8 @@ class OptimizerWorker(BaseAgent):
                     
                     trades_saved = new_closed_count
                 
-                # Flush batch every 50 trades or if many pending
-                if len(pending_trades) >= 50:
+                # Flush batch every TRADE_FLUSH_SIZE trades (one COPY per batch)
+                if len(pending_trades) >= TRADE_FLUSH_SIZE:
                     self._flush_trades(pending_trades)
                     pending_trades = []
                 
@@ -442,6 +411,322 @@ class OptimizerWorker(BaseAgent):
         
         return result
     
+    def run_population(self, config: Dict[str, Any], params_list: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Backtest de una población entera de params (WFO/MSC) en una sola pasada.
+
+        Equivale a [self.run(config, params=p, **kwargs) for p in params_list]
+        sin persistir trades: velas, MarketState, matriz de alphas y
+        probabilidades ML se calculan una vez; umbrales y pesos de cada
+        individuo se aplican como vectores (AlphaMatrix.population_directions)
+        y cada uno conserva su propio broker/risk manager.
+
+        config['numeric_mode']: 'decimal' (default, exacto) o 'float'
+        (float64 nativo para la búsqueda GA/WFO).
+        """
+        config = {**config, **kwargs}
+        numeric_mode = check_numeric_mode(config.get('numeric_mode', DECIMAL))
+        if not config.get('use_msc'):
+            raise ValueError("run_population only supports the MSC alpha-blending mode (use_msc)")
+        if not params_list:
+            return []
+        if not all(params_list):
+            raise ValueError("run_population needs non-empty WFO params for every individual")
+
+        pair = config.get('pair', 'BTCUSDT')
+        timeframe_str = config.get('timeframe', '4h')
+        timeframe = Timeframe(timeframe_str)
+        year = config['year']
+        months = config.get('months', list(range(1, 13)))
+
+        ml_model_path = config.get('ml_model_path', 'data/models/rf_model_v1.pkl')
+        ml_threshold = config.get('ml_prob_threshold', 0.6)
+        analyzer = self._load_analyzer(config.get('use_ml_model', False), ml_model_path, ml_threshold)
+
+        self.log('INFO', f"Starting population backtest ({len(params_list)} individuals) for {pair} {timeframe_str} {year}")
+        all_candles, start_index = self._load_window(config, pair, timeframe, year, months)
+
+        ml_probs = None
+        if analyzer:
+            features_map = self._window_features(config, all_candles)
+            ml_probs = self._ml_probabilities(analyzer, features_map, self._feature_table(features_map, all_candles))
+
+        # Señales: una matriz de alphas por ventana, pesos/umbral por individuo
+        orchestrator = MSCOrchestrator()
+        window_key = ('msc', candles_fingerprint(all_candles), start_index, pair)
+        matrix = self._get_alpha_matrix(
+            window_key,
+            lambda: orchestrator.build_alpha_matrix(all_candles, pair, start_index)
+        )
+        blends = [orchestrator.wfo_weights(params) for params in params_list]
+        names = [name for name, _ in blends[0]]
+        directions = matrix.population_directions(
+            names,
+            np.array([[weight for _, weight in blend] for blend in blends]),
+            np.array([params.get('alpha_threshold', 0.6) for params in params_list])
+        )
+
+        # Estado independiente por individuo (mismas conversiones Decimal que run)
+        from src.execution.risk import RiskConfig
+        max_portfolio_risk = config.get('max_portfolio_risk', None)
+        executors = []
+        for params in params_list:
+            risk_pct = params.get('risk_per_trade_pct', config.get('risk_per_trade_pct', 1.0))
+            executors.append(TradeExecutor(
+                broker=InMemoryBroker(
+                    balance=to_number(config['initial_balance'], numeric_mode),
+                    fee_rate=to_number(config['fee_rate'], numeric_mode)
+                ),
+                risk_manager=RiskManager(config=RiskConfig(
+                    risk_percentage=to_number(risk_pct, numeric_mode) / 100,
+                    max_portfolio_risk=to_number(max_portfolio_risk, numeric_mode) if max_portfolio_risk else None,
+                    use_dd_scaling=config.get('use_dd_scaling', False)
+                ))
+            ))
+
+        backtester = PopulationBacktester(
+            all_candles,
+            symbol=pair,
+            start_index=start_index,
+            fallback_stop_loss=to_number(config['stop_loss'], numeric_mode),
+            ml_probs=ml_probs,
+            ml_threshold=ml_threshold,
+            numeric_mode=numeric_mode,
+            bar_atr=self._get_bar_atr(window_key, lambda: replay_bar_atr(all_candles, pair))
+        )
+        filtered = backtester.run(
+            executors,
+            directions,
+            stop_loss_atr_mult=[to_number(float(p.get('stop_loss_atr_mult', 1.5)), numeric_mode) for p in params_list],
+            take_profit_r_mult=[to_number(float(p.get('take_profit_r_mult', 2.0)), numeric_mode) for p in params_list]
+        )
+
+        results = []
+        for executor, filtered_trades in zip(executors, filtered):
+            broker = executor.broker
+            closed_positions = broker.get_closed_positions()
+            results.append(self._calculate_metrics(
+                final_balance=broker.get_balance(),
+                initial_balance=to_number(config.get("initial_balance", 10000), numeric_mode),
+                pair=pair,
+                timeframe_str=timeframe_str,
+                year=year,
+                trades_saved=len(closed_positions),
+                filtered_trades=filtered_trades,
+                closed_positions=closed_positions,
+                equity_curve=broker.equity_curve
+            ))
+        self.log('INFO', f"Population backtest finished: {len(results)} individuals.")
+        return results
+
+    def compare_numeric_modes(self, config: Dict[str, Any], params_list: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Reproduce la misma ventana en modo 'decimal' y 'float' y reporta la
+        divergencia de métricas por individuo (simulation.numeric.numeric_divergence).
+        Sirve para validar que la búsqueda en float elige lo mismo que la auditoría.
+        """
+        config = {**config, **kwargs}
+        exact = self.run_population({**config, 'numeric_mode': DECIMAL}, params_list)
+        fast = self.run_population({**config, 'numeric_mode': FLOAT}, params_list)
+        return [numeric_divergence(d, f) for d, f in zip(exact, fast)]
+    
+    def load_candles(
+        self,
+        pair: str,
+        timeframe: Timeframe,
+        year: int,
+        months: List[int],
+        store_root: str = DEFAULT_STORE_ROOT,
+        data_dir: str = "data/raw"
+    ) -> Union[MarketSeries, List[Candle]]:
+        """
+        Candles for the given months: columnar store first, monthly CSVs as fallback.
+
+        When the store has every month the result is its memory-mapped
+        MarketSeries (Candle objects are built as the backtest reaches them).
+        """
+        store = CandleStore(store_root)
+        if all(store.has_month(pair, timeframe, year, month) for month in months):
+            return store.load(pair, timeframe, year, months)
+
+        all_candles = []
+        for month in months:
+            # Columnar store first (mmap, no per-line Decimal parsing)
+            if store.has_month(pair, timeframe, year, month):
+                all_candles.extend(store.load_month(pair, timeframe, year, month))
+                continue
+            
+            filename = f"{pair}-{timeframe.value}-{year}-{month:02d}.csv"
+            filepath = Path(data_dir) / filename
+            
+            if not filepath.exists():
+                self.log('WARNING', f"File not found: {filename}")
+                continue
+            
+            try:
+                candles = load_binance_csv(str(filepath), timeframe)
+                all_candles.extend(candles)
+            except Exception as e:
+                self.log('ERROR', f"Failed to load {filename}: {str(e)}")
+        
+        return all_candles
+
+    def _load_analyzer(self, use_ml: bool, ml_model_path: str, ml_threshold: float) -> Optional[PatternAnalyzer]:
+        """Trained ML filter model, or None (ML off or no model found)."""
+        if not use_ml:
+            return None
+        analyzer = PatternAnalyzer(ml_model_path)
+        if not analyzer.is_trained:
+            self.log('WARNING', "ML Model requested but no trained model found. Running without ML.")
+            return None # Fallback
+        self.log('INFO', f"Running with ML Filter (Threshold: {ml_threshold})")
+        return analyzer
+
+    def _load_window(self, config: Dict[str, Any], pair: str, timeframe: Timeframe, year: int, months: List[int]) -> Tuple[List, int]:
+        """Candles of the run (warmup + main) and the index where trading starts."""
+        # Load data (Memory vs Disk)
+        candles_arg = config.get('candles')
+        warmup_candles_arg = config.get('warmup_candles', [])
+        
+        if candles_arg:
+            # In-memory execution (WFO/Optimization)
+            # Combine warmup + main data for feature calculation
+            if isinstance(candles_arg, MarketSeries) or isinstance(warmup_candles_arg, MarketSeries):
+                # Tramos del dataset compartido: columnas + velas cacheadas, sin List[Candle] intermedia
+                all_candles = MarketSeries.concat([warmup_candles_arg, candles_arg])
+            else:
+                all_candles = warmup_candles_arg + candles_arg
+            # Trading starts after warmup
+            start_index = len(warmup_candles_arg)
+            self.log('INFO', f"Using in-memory data: {len(candles_arg)} main + {len(warmup_candles_arg)} warmup candles")
+        elif config.get('dataset') is not None:
+            # Shared-memory dataset published by the parent (OptimizerSwarm)
+            dataset = attach(config['dataset'])
+            all_candles = dataset.candles()
+            start_index = 0
+            if dataset.handle.feature_columns:
+                config.setdefault('features_map', dataset.features)
+        else:
+            # Disk loading (Legacy/Manual run)
+            all_candles = self.load_candles(
+                pair, timeframe, year, months,
+                store_root=config.get('candle_store', DEFAULT_STORE_ROOT)
+            )
+            
+            if not all_candles:
+                raise ValueError(f"No data found for {pair} {timeframe.value} {year}")
+                
+            # Legacy: warmup_data might be passed but not prepended to file data
+            # Use strict approach: if loaded from disk, start_index=0 (unless warmup logic added later)
+            start_index = 0
+            
+            # Legacy warmup handling (kept for compatibility if needed, but discouraged)
+            # If warmup_data passed in kwargs but loading from disk, we prepend it?
+            # For now, keep simple: disk loading = 0 offset.
+        return all_candles, start_index
+
+    def _window_features(self, config: Dict[str, Any], all_candles: List) -> pd.DataFrame:
+        """features_map of the window (given by the parent, cached, or computed here)."""
+        # Pre-compute features for performance if ML is needed or for reporting
+        # Optimization for Mac M1: Cache features if candles haven't changed (Task 8.9)
+        current_candles_id = id(all_candles)
+        if config.get('features_map') is not None:
+            # Precomputed once by the parent (shared dataset), indexed by datetime
+            features_map = config['features_map']
+        elif self._cached_candles_id == current_candles_id and self._cached_features_map is not None:
+            features_map = self._cached_features_map
+        else:
+            # Convert candles to DataFrame for feature extraction
+            if isinstance(all_candles, MarketSeries):
+                # Columnas float64 de la serie (store/dataset compartido): sin pasar por Candle
+                df_candles = pd.DataFrame({
+                    'timestamp': all_candles.timestamps,
+                    'open': all_candles.opens,
+                    'high': all_candles.highs,
+                    'low': all_candles.lows,
+                    'close': all_candles.closes,
+                    'volume': all_candles.volumes
+                })
+            else:
+                df_candles = pd.DataFrame([{
+                    'timestamp': c.timestamp,
+                    'open': float(c.open),
+                    'high': float(c.high),
+                    'low': float(c.low),
+                    'close': float(c.close),
+                    'volume': float(c.volume)
+                } for c in all_candles])
+            
+            # Check timestamps
+            df_candles['timestamp'] = pd.to_datetime(df_candles['timestamp'], unit='ms')
+            
+            # Calculate features (Expensive operation)
+            self.log('INFO', f"Calculating features for {len(all_candles)} candles...")
+            df_features = self.feature_extractor.add_all_features(df_candles)
+            features_map = df_features.set_index('timestamp')
+            # Store in cache
+            self._cached_features_map = features_map
+            self._cached_candles_id = current_candles_id
+        return features_map
+
+    def _feature_table(self, features_map: pd.DataFrame, all_candles: List) -> FeatureTable:
+        """features_map aligned to candle positions, cached per (features_map, candles)."""
+        cached = self._cached_feature_table
+        if cached is not None and cached[0] is features_map and cached[1] is all_candles:
+            return cached[2]
+        if isinstance(all_candles, MarketSeries):
+            timestamps = all_candles.timestamps
+        else:
+            timestamps = np.fromiter((c.timestamp for c in all_candles), dtype=np.int64, count=len(all_candles))
+        table = FeatureTable.from_frame(features_map, timestamps)
+        self._cached_feature_table = (features_map, all_candles, table)
+        return table
+
+    def _ml_probabilities(self, analyzer: PatternAnalyzer, features_map: pd.DataFrame, table: FeatureTable) -> np.ndarray:
+        """
+        Win probability per candle position, scored in one batch.
+
+        Candle i gets the probability of the features_map row with its
+        timestamp (the last one if duplicated, as features_map.loc[[ts]] +
+        predict_proba did), NaN if it has no row. Cached while the feature
+        table and model stay the same (GA reruns of one window).
+        """
+        cached = self._cached_ml_probs
+        if cached is not None and cached[0] is table and cached[1] is analyzer.model:
+            return cached[2]
+
+        probs = np.full(len(table), np.nan)
+        found = table.last_rows >= 0
+        if found.any():
+            row_probs = analyzer.predict_proba_batch(features_map)
+            probs[found] = row_probs[table.last_rows[found]]
+
+        self._cached_ml_probs = (table, analyzer.model, probs)
+        return probs
+
+    def _get_alpha_matrix(self, key: Tuple, build: Callable[[], AlphaMatrix]) -> AlphaMatrix:
+        """Small LRU of AlphaMatrix per data window (keyed by content fingerprint)."""
+        if key in self._alpha_matrices:
+            self._alpha_matrices.move_to_end(key)
+            return self._alpha_matrices[key]
+        self.log('INFO', "Precomputing alpha score matrix for window...")
+        matrix = build()
+        self._alpha_matrices[key] = matrix
+        if len(self._alpha_matrices) > ALPHA_MATRIX_CACHE_SIZE:
+            self._alpha_matrices.popitem(last=False)
+        return matrix
+
+    def _get_bar_atr(self, key: Tuple, build: Callable[[], List[float]]) -> List[float]:
+        """Same LRU for the per-bar ATR replay of run_population (one MarketState pass per window)."""
+        if key in self._bar_atrs:
+            self._bar_atrs.move_to_end(key)
+            return self._bar_atrs[key]
+        atrs = build()
+        self._bar_atrs[key] = atrs
+        if len(self._bar_atrs) > ALPHA_MATRIX_CACHE_SIZE:
+            self._bar_atrs.popitem(last=False)
+        return atrs
+
     def _calculate_metrics(
         self, 
         final_balance, 
@@ -476,73 +761,35 @@ class OptimizerWorker(BaseAgent):
                 'max_drawdown': 0.0,
                 'max_drawdown_pct': 0.0,
                 'sharpe': 0.0,
+                'calmar': 0.0,
                 'trades_saved_to_db': trades_saved,
                 'ml_filtered_trades': filtered_trades
             }
 
-        winning_trades = sum(1 for p in closed_positions if p.pnl > 0)
-        losing_trades = total_trades - winning_trades
-        win_rate = (winning_trades / total_trades * 100)
-        
-        gross_profit = float(sum(p.pnl for p in closed_positions if p.pnl > 0))
-        gross_loss = float(abs(sum(p.pnl for p in closed_positions if p.pnl < 0)))
-        
-        # PF Logic: Cap at 10.0 if no loss, avoid 0.0 for winners
-        if gross_loss == 0:
-            profit_factor = 10.0 if gross_profit > 0 else 1.0
+        if isinstance(closed_positions, TradeLedger):
+            pnl = closed_positions.column('pnl')
         else:
-            profit_factor = gross_profit / gross_loss
-            
-        net_profit = float(final_balance - initial_balance)
-        return_pct = (net_profit / float(initial_balance) * 100) if initial_balance > 0 else 0.0
-        
-        # Max Drawdown Calculation
-        max_drawdown = 0.0
-        if equity_curve:
-            peak = float(equity_curve[0])
-            for val in equity_curve:
-                val_f = float(val)
-                if val_f > peak:
-                    peak = val_f
-                if peak > 0:
-                    dd = (peak - val_f) / peak
-                    if dd > max_drawdown:
-                        max_drawdown = dd
-        
-        max_drawdown_pct = max_drawdown * 100.0
-        
-        # Sharpe Ratio (Simple, non-annualized, good for relative fitness)
-        sharpe = 0.0
-        if equity_curve and len(equity_curve) > 1:
-            eq = [float(x) for x in equity_curve]
-            # Calculate returns series
-            rets = []
-            for i in range(1, len(eq)):
-                if eq[i-1] > 0:
-                    rets.append((eq[i] / eq[i-1]) - 1.0)
-            
-            if len(rets) >= 2:
-                std = statistics.pstdev(rets)
-                if std > 0:
-                    sharpe = (statistics.mean(rets) / std) * math.sqrt(len(rets))
+            pnl = as_float_array(p.pnl for p in closed_positions)
+        m = compute_metrics(as_float_array(equity_curve), pnl, initial_balance, final_balance)
         
         return {
             'pair': pair,
             'timeframe': timeframe_str,
             'year': year,
-            'total_trades': total_trades,
-            'winning_trades': winning_trades,
-            'losing_trades': losing_trades,
+            'total_trades': m.total_trades,
+            'winning_trades': m.winning_trades,
+            'losing_trades': m.losing_trades,
             'final_balance': float(final_balance),
-            'net_profit': float(net_profit),
-            'return': round(return_pct, 2),              # REQUIRED by run_wfo
-            'win_rate': round(win_rate, 2),
-            'gross_profit': round(gross_profit, 2),       # REQUIRED by fitness
-            'gross_loss': round(gross_loss, 2),            # REQUIRED by fitness
-            'profit_factor': round(float(profit_factor), 4),
-            'max_drawdown': round(max_drawdown_pct, 2),    # REQUIRED by fitness (in %)
-            'max_drawdown_pct': round(max_drawdown_pct, 2),
-            'sharpe': round(float(sharpe), 4),             # REQUIRED by fitness
+            'net_profit': m.net_profit,
+            'return': round(m.return_pct, 2),              # REQUIRED by run_wfo
+            'win_rate': round(m.win_rate, 2),
+            'gross_profit': round(m.gross_profit, 2),       # REQUIRED by fitness
+            'gross_loss': round(m.gross_loss, 2),            # REQUIRED by fitness
+            'profit_factor': round(m.profit_factor, 4),
+            'max_drawdown': round(m.max_drawdown * 100.0, 2),    # REQUIRED by fitness (in %)
+            'max_drawdown_pct': round(m.max_drawdown * 100.0, 2),
+            'sharpe': round(m.sharpe, 4),             # REQUIRED by fitness
+            'calmar': round(m.calmar, 4),
             'trades_saved_to_db': trades_saved,
             'ml_filtered_trades': filtered_trades
         }
@@ -565,8 +812,8 @@ class OptimizerWorker(BaseAgent):
         
         try:
             with get_db_session() as db:
-                for t in trades:
-                    TradeRepository.create(db, t)
+                # Un solo COPY (PostgreSQL) / executemany por batch, sin ORM por fila
+                TradeRepository.bulk_ingest(db, trades)
         except Exception as e:
             self.db_failures += 1
             self.log('WARNING', f"DB connection failed. Disabling persistence for this worker. Error: {str(e)}")
@@ -1,6 +1,9 @@
 # src/alphas/base.py
 from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Tuple
+import numpy as np
 from src.core.market import MarketState
+from src.core.series import MarketSeries
 
 class Alpha(ABC):
     """
@@ -9,6 +12,9 @@ class Alpha(ABC):
     An Alpha is an independent agent that provides a directional score 
     reflecting its opinion on the market state.
     """
+
+    # Indicator graph nodes (src.core.indicator_graph) the alpha reads
+    indicators: Tuple[str, ...] = ()
     
     @abstractmethod
     def get_score(self, market_state: MarketState) -> float:
@@ -23,3 +29,33 @@ class Alpha(ABC):
                    0.0 implies Neutral.
         """
         pass
+
+    def get_scores(self, market_states: Sequence[MarketState]) -> np.ndarray:
+        """
+        Scores for consecutive states of one replay (one per bar).
+
+        Default calls get_score per state; alphas with a whole-series
+        formulation can override it to vectorize AlphaMatrix building.
+        """
+        return np.fromiter(
+            (self.get_score(state) for state in market_states),
+            dtype=np.float64,
+            count=len(market_states)
+        )
+
+    @staticmethod
+    def replay_series(market_states: Sequence[MarketState]) -> Optional[MarketSeries]:
+        """
+        Final H4 series of a replay when every state is a prefix of it, else None.
+
+        Indicators are causal, so one window over this series answers every
+        state: the state's value is the one at bar len(state.h4) - 1.
+        """
+        if not market_states:
+            return None
+        series = market_states[-1].h4
+        if not isinstance(series, MarketSeries):
+            return None
+        if not all(isinstance(state.h4, MarketSeries) and state.h4.is_prefix_of(series) for state in market_states):
+            return None
+        return series
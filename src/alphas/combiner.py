@@ -1,6 +1,8 @@
 # src/alphas/combiner.py
 from typing import List, Tuple, Optional, Any
+import numpy as np
 from src.alphas.base import Alpha
+from src.alphas.matrix import AlphaMatrix, alpha_key
 from src.core.market import MarketState
 from src.execution.executor import TradeSignal
 from src.execution.broker import OrderSide
@@ -18,14 +20,42 @@ class AlphaCombiner:
             alphas_with_weights: List of (AlphaInstance, weight)
         """
         self.alphas = alphas_with_weights
-        
-    def get_aggregate_score(self, market_state: MarketState) -> float:
+        self._matrix: Optional[AlphaMatrix] = None
+        self._window_scores: Optional[np.ndarray] = None
+
+    def use_matrix(self, matrix: Optional[AlphaMatrix]) -> None:
+        """
+        Binds a precomputed AlphaMatrix of the current data window.
+
+        Calls that pass `bar_index` then read the weighted score of that bar
+        instead of running the alphas (computed once for the whole window).
+        """
+        self._matrix = matrix
+        self._window_scores = None
+
+    def get_aggregate_scores(self, matrix: AlphaMatrix) -> np.ndarray:
+        """Weighted average score of every bar of the matrix window."""
+        return matrix.weighted_score([(alpha_key(alpha), weight) for alpha, weight in self.alphas])
+
+    def get_signal_directions(self, matrix: AlphaMatrix, threshold: float = 0.6) -> np.ndarray:
+        """Per-bar direction (1 BUY / -1 SELL / 0 none) over the matrix window."""
+        return matrix.signal_directions([(alpha_key(alpha), weight) for alpha, weight in self.alphas], threshold)
+
+    def get_aggregate_score(self, market_state: MarketState, bar_index: Optional[int] = None) -> float:
         """
         Calculates the weighted average score of all alphas.
         
+        Args:
+            bar_index: Bar of the bound AlphaMatrix matching market_state (optional).
+
         Returns:
             float: Normalized score in range [-1.0, 1.0]
         """
+        if bar_index is not None and self._matrix is not None:
+            if self._window_scores is None:
+                self._window_scores = self.get_aggregate_scores(self._matrix)
+            return float(self._window_scores[bar_index])
+
         if not self.alphas:
             return 0.0
             
@@ -42,13 +72,18 @@ class AlphaCombiner:
             
         return total_score / total_weight
         
-    def get_signal(self, market_state: MarketState, threshold: float = 0.6) -> Optional[TradeSignal]:
+    def get_signal(
+        self,
+        market_state: MarketState,
+        threshold: float = 0.6,
+        bar_index: Optional[int] = None
+    ) -> Optional[TradeSignal]:
         """
         Generates a trade signal if the aggregate score exceeds the threshold.
         
         Note: SL/TP should be determined by RiskManager, this provides direction & confidence.
         """
-        score = self.get_aggregate_score(market_state)
+        score = self.get_aggregate_score(market_state, bar_index)
         
         if abs(score) < threshold:
             return None
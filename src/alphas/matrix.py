@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.alphas.base import Alpha
+from src.core.candle import Candle
+from src.core.classifier import REGIME_INDICATORS, regime_indicator_arrays
+from src.core.market import MarketState
+
+
+def alpha_key(alpha: Alpha) -> str:
+    """Column name of an alpha inside an AlphaMatrix (its class name)."""
+    return type(alpha).__name__
+
+
+class AlphaMatrix:
+    """
+    Precomputed alpha scores for every bar of one data window.
+
+    Row `i` holds each alpha's `get_score` for the MarketState right after
+    candle `i` was applied. Alpha scores do not depend on WFO params, so the
+    matrix is built once per window and any weight vector / threshold is then
+    evaluated with a NumPy weighted sum instead of rerunning the alphas.
+    Rows before `start_index` (warmup) are left at 0.0.
+
+    Optionally it also keeps the per-bar regime inputs (REGIME_INDICATORS) of
+    the same replay, so regimes for any GA thresholds come from
+    classify_regime_series instead of classify_regime per bar (NaN in warmup).
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        scores: np.ndarray,
+        start_index: int = 0,
+        regime_inputs: Optional[Dict[str, np.ndarray]] = None
+    ):
+        if scores.ndim != 2 or scores.shape[1] != len(names):
+            raise ValueError(f"Scores shape {scores.shape} does not match {len(names)} alphas")
+        self.names: List[str] = list(names)
+        self.scores = scores
+        self.scores.flags.writeable = False
+        self.start_index = start_index
+        self._columns = {name: j for j, name in enumerate(self.names)}
+        if regime_inputs is not None:
+            for values in regime_inputs.values():
+                if len(values) != len(scores):
+                    raise ValueError(f"Regime inputs have {len(values)} rows, expected {len(scores)}")
+                values.flags.writeable = False
+        self.regime_inputs = regime_inputs
+
+    @classmethod
+    def build(
+        cls,
+        candles: Sequence[Candle],
+        alphas: Sequence[Alpha],
+        symbol: str = 'BTCUSDT',
+        start_index: int = 0,
+        regimes: bool = False
+    ) -> 'AlphaMatrix':
+        """
+        Replays `candles` once and scores every alpha on each bar from `start_index`.
+        With `regimes`, the same replay also fills `regime_inputs`.
+        """
+        names = [alpha_key(alpha) for alpha in alphas]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate alpha columns: {names}")
+
+        states: List[MarketState] = []
+        market = MarketState.empty(symbol)
+        for i, candle in enumerate(candles):
+            market = market.update(candle)
+            if i >= start_index:
+                states.append(market)
+
+        scores = np.zeros((len(candles), len(alphas)))
+        for j, alpha in enumerate(alphas):
+            scores[start_index:, j] = alpha.get_scores(states)
+
+        regime_inputs = None
+        if regimes:
+            regime_inputs = {name: np.full(len(candles), np.nan) for name in REGIME_INDICATORS}
+            if states:
+                for name, values in regime_indicator_arrays(states).items():
+                    regime_inputs[name][start_index:] = values
+        return cls(names, scores, start_index, regime_inputs)
+
+    def __len__(self) -> int:
+        return self.scores.shape[0]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._columns
+
+    def column(self, name: str) -> np.ndarray:
+        return self.scores[:, self._columns[name]]
+
+    def weighted_score(self, weights: Sequence[Tuple[str, float]]) -> np.ndarray:
+        """
+        Weighted average score per bar (same result as AlphaCombiner.get_aggregate_score).
+
+        Columns are accumulated in the given order so every bar performs the
+        exact float operations of the scalar loop.
+        """
+        total = np.zeros(len(self))
+        total_weight = 0.0
+        for name, weight in weights:
+            total += self.column(name) * weight
+            total_weight += weight
+        if not weights or total_weight == 0:
+            return np.zeros(len(self))
+        return total / total_weight
+
+    def signal_directions(self, weights: Sequence[Tuple[str, float]], threshold: float) -> np.ndarray:
+        """Per-bar direction: 1 (BUY), -1 (SELL) or 0 when |score| < threshold."""
+        score = self.weighted_score(weights)
+        # Same rule as AlphaCombiner.get_signal: BUY only if score > 0
+        directions = np.where(score > 0, 1, -1).astype(np.int8)
+        directions[np.abs(score) < threshold] = 0
+        return directions
+
+    def population_directions(
+        self,
+        names: Sequence[str],
+        weights: np.ndarray,
+        thresholds: np.ndarray
+    ) -> np.ndarray:
+        """
+        signal_directions for N weight vectors at once: (N, bars) int8.
+
+        Row k uses weights[k] (one weight per entry of `names`) and
+        thresholds[k]; columns are accumulated in order as in weighted_score,
+        so every row equals signal_directions of that individual.
+        """
+        weights = np.asarray(weights, dtype=np.float64).reshape(-1, len(names))
+        thresholds = np.asarray(thresholds, dtype=np.float64).reshape(-1, 1)
+        total = np.zeros((len(weights), len(self)))
+        total_weight = np.zeros(len(weights))
+        for j, name in enumerate(names):
+            total += self.column(name)[None, :] * weights[:, j:j + 1]
+            total_weight += weights[:, j]
+        has_weight = total_weight != 0
+        score = np.zeros_like(total)
+        score[has_weight] = total[has_weight] / total_weight[has_weight, None]
+
+        directions = np.where(score > 0, 1, -1).astype(np.int8)
+        directions[np.abs(score) < thresholds] = 0
+        return directions
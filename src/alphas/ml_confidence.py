@@ -1,10 +1,12 @@
 # src/alphas/ml_confidence.py
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Sequence
 from src.alphas.base import Alpha
 from src.core.market import MarketState
+from src.core.series import MarketSeries
 from src.ml.analyzer import PatternAnalyzer
-from src.ml.features import FeatureExtractor
+from src.ml.features import FeatureExtractor, FeatureStream, rows_to_frame
 
 class Alpha_ML_Confidence(Alpha):
     """
@@ -15,39 +17,40 @@ class Alpha_ML_Confidence(Alpha):
     Probability > 0.5 -> Positive score (Confidence in Alpha/Setup)
     Probability < 0.5 -> Negative score (Model expects failure)
     """
+
+    indicators = FeatureExtractor.INDICATORS
     
     def __init__(self, analyzer: Optional[PatternAnalyzer] = None):
         # Allow injecting analyzer for testing
         self.analyzer = analyzer or PatternAnalyzer()
         self.extractor = FeatureExtractor()
+        # Streaming features of the H4 replay being scored (see _stream_features)
+        self._stream: Optional[FeatureStream] = None
+        self._stream_series: Optional[MarketSeries] = None
     
     def get_score(self, market_state: MarketState) -> float:
-        # 1. Transform MarketState to DataFrame for extraction
         series = market_state.h4
         if len(series) < 50: # Need enough data for technical indicators
             return 0.0
-            
-        data = []
-        for i in range(len(series)):
-            c = series.get(i)
-            data.append({
-                'timestamp': c.timestamp,
-                'open': float(c.open),
-                'high': float(c.high),
-                'low': float(c.low),
-                'close': float(c.close),
-                'volume': float(c.volume)
-            })
-            
-        df = pd.DataFrame(data)
+        if not self.analyzer.is_trained:
+            # predict_proba would return 0.5 (neutral); the stream catches up if trained later
+            return 0.0
         
-        # 2. Extract Features
-        df_features = self.extractor.add_all_features(df)
+        if isinstance(series, MarketSeries):
+            # 1-2. Newest feature row in O(1) per bar
+            df_features = self._stream_features(series)
+        else:
+            # 1-2. Batch extraction over the whole series (plain sequences)
+            df_features = self._batch_features(series)
         
         # 3. Predict Probability
         prob = self.analyzer.predict_proba(df_features)
         
         # 4. Normalize to [-1, 1]
+        return self._to_score(prob)
+
+    @staticmethod
+    def _to_score(prob: float) -> float:
         # (prob - 0.5) * 2.0
         # 0.8 -> (0.3) * 2 = 0.6
         # 0.5 -> (0.0) * 2 = 0.0
@@ -55,3 +58,80 @@ class Alpha_ML_Confidence(Alpha):
         score = (prob - 0.5) * 2.0
         
         return max(-1.0, min(1.0, score))
+
+    def get_scores(self, market_states: Sequence[MarketState]) -> np.ndarray:
+        """
+        AlphaMatrix path: streams the features of the replay once and scores
+        every distinct feature row with a single predict_proba_batch call.
+
+        Same values as get_score per state. Falls back to it when the states
+        are not one MarketSeries replay or the analyzer has no batch API.
+        """
+        n = len(market_states)
+        series = self.replay_series(market_states)
+        if series is None or not isinstance(self.analyzer, PatternAnalyzer):
+            return super().get_scores(market_states)
+        if not self.analyzer.is_trained:
+            return np.zeros(n)
+
+        # valid_at[k]: row in `rows` that is the last valid feature row after candle k
+        stream = self.extractor.stream()
+        rows = []
+        valid_at = np.full(len(series), -1)
+        timestamps, opens, highs, lows, closes, volumes = (
+            series.timestamps, series.opens, series.highs, series.lows, series.closes, series.volumes
+        )
+        for k in range(len(series)):
+            row = stream.update(
+                int(timestamps[k]), float(opens[k]), float(highs[k]),
+                float(lows[k]), float(closes[k]), float(volumes[k])
+            )
+            if stream.last_valid is row:
+                rows.append(row)
+            valid_at[k] = len(rows) - 1
+
+        probs = self.analyzer.predict_proba_batch(rows_to_frame(rows))
+
+        scores = np.zeros(n)
+        for j, state in enumerate(market_states):
+            length = len(state.h4)
+            # < 50 velas -> 0.0; sin fila válida predict_proba daría 0.5 -> 0.0
+            if length >= 50 and valid_at[length - 1] >= 0:
+                scores[j] = self._to_score(float(probs[valid_at[length - 1]]))
+        return scores
+
+    def _stream_features(self, series: MarketSeries) -> pd.DataFrame:
+        """
+        Advances the feature stream to the end of `series` and returns its
+        last valid row (what add_all_features(...).iloc[[-1]] would give).
+
+        Consecutive bars of one replay only feed the new candles; any other
+        series (new replay, shorter view) restarts the stream.
+        """
+        if self._stream is None or self._stream_series is None or not self._stream_series.is_prefix_of(series):
+            self._stream = self.extractor.stream()
+        stream = self._stream
+        timestamps, opens, highs, lows, closes, volumes = (
+            series.timestamps, series.opens, series.highs, series.lows, series.closes, series.volumes
+        )
+        for i in range(stream.count, len(series)):
+            stream.update(
+                int(timestamps[i]), float(opens[i]), float(highs[i]),
+                float(lows[i]), float(closes[i]), float(volumes[i])
+            )
+        self._stream_series = series
+        return stream.last_valid_frame()
+
+    def _batch_features(self, series) -> pd.DataFrame:
+        data = []
+        for i in range(len(series)):
+            c = series.get(i)
+            data.append({
+                'timestamp': c.timestamp,
+                'open': float(c.open),
+                'high': float(c.high),
+                'low': float(c.low),
+                'close': float(c.close),
+                'volume': float(c.volume)
+            })
+        return self.extractor.add_all_features(pd.DataFrame(data))
@@ -1,5 +1,8 @@
 # src/alphas/momentum.py
+from typing import Sequence
+import numpy as np
 from src.alphas.base import Alpha
+from src.core.indicator_graph import window_indicators
 from src.core.market import MarketState
 
 class Alpha_Momentum(Alpha):
@@ -10,6 +13,8 @@ class Alpha_Momentum(Alpha):
     RSI > 50 (Bullish) -> Positive score.
     RSI < 50 (Bearish) -> Negative score.
     """
+
+    indicators = ('rsi',)
     
     def get_score(self, market_state: MarketState) -> float:
         # Use cached RSI from market state
@@ -27,3 +32,15 @@ class Alpha_Momentum(Alpha):
         
         # Clip to ensure bounds just in case of rounding or edge cases
         return max(-1.0, min(1.0, score))
+
+    def get_scores(self, market_states: Sequence[MarketState]) -> np.ndarray:
+        """Whole-replay scores from the shared 'rsi' window (same values as get_score)."""
+        series = self.replay_series(market_states)
+        if series is None:
+            return super().get_scores(market_states)
+        rsi = window_indicators(series).get('rsi')
+        lengths = np.fromiter((len(state.h4) for state in market_states), dtype=np.int64, count=len(market_states))
+        scores = np.zeros(len(market_states))
+        has_data = lengths > 0
+        scores[has_data] = np.clip((rsi[lengths[has_data] - 1] - 50) / 50.0, -1.0, 1.0)
+        return scores
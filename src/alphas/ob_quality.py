@@ -1,7 +1,10 @@
 # src/alphas/ob_quality.py
+from typing import Sequence
+import numpy as np
 from src.alphas.base import Alpha
 from src.core.market import MarketState
 from src.strategy.ob import detect_ob, OBType
+from src.strategy.scanner import scan_series
 
 class Alpha_OB_Quality(Alpha):
     """
@@ -34,3 +37,20 @@ class Alpha_OB_Quality(Alpha):
         quality_multiplier = 1.0
         
         return score * quality_multiplier
+
+    def get_scores(self, market_states: Sequence[MarketState]) -> np.ndarray:
+        """Whole-replay scores from a single structure scan of the final H4 series."""
+        if not market_states:
+            return np.zeros(0)
+        series = self.replay_series(market_states)
+        if series is None:
+            return super().get_scores(market_states)
+
+        # detect_ob(series, i) only looks at candles <= i, so one scan of the
+        # final series answers every intermediate state
+        ob_type = scan_series(series).ob_type
+        lengths = np.fromiter((len(state.h4) for state in market_states), dtype=np.int64, count=len(market_states))
+        scores = np.zeros(len(market_states))
+        has_data = lengths > 0
+        scores[has_data] = ob_type[lengths[has_data] - 1]
+        return scores
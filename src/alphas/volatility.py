@@ -1,5 +1,8 @@
 # src/alphas/volatility.py
+from typing import Sequence
+import numpy as np
 from src.alphas.base import Alpha
+from src.core.indicator_graph import window_indicators
 from src.core.market import MarketState
 import statistics
 
@@ -11,6 +14,8 @@ class Alpha_Volatility(Alpha):
     Positive score -> Volatility is expanding (favorable for trend/TJR).
     Negative score -> Volatility is contracting (risk of chop/range).
     """
+
+    indicators = ('atr_wilder',)
     
     def __init__(self, period: int = 14):
         self.period = period
@@ -36,3 +41,22 @@ class Alpha_Volatility(Alpha):
         # Scale and clip
         # Assume a ratio of 2.0 (100% increase) is the max score of 1.0
         return max(-1.0, min(1.0, score))
+
+    def get_scores(self, market_states: Sequence[MarketState]) -> np.ndarray:
+        """Whole-replay scores from the shared Wilder ATR window (same values as get_score)."""
+        series = self.replay_series(market_states)
+        if series is None:
+            return super().get_scores(market_states)
+        atr = window_indicators(series).get('atr_wilder').tolist()
+        scores = np.zeros(len(market_states))
+        for j, state in enumerate(market_states):
+            length = len(state.h4)
+            if length < self.period + 1:
+                continue
+            # MarketState.atr is [1.0] * length until the 14-bar seed
+            window = atr[length - self.period:length] if length >= 14 else [1.0] * self.period
+            avg_atr = statistics.mean(window)
+            if avg_atr == 0:
+                continue
+            scores[j] = max(-1.0, min(1.0, (window[-1] / avg_atr) - 1.0))
+        return scores
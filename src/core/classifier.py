@@ -1,8 +1,36 @@
 # src/core/classifier.py
 from src.core.regime import MarketRegime
 from src.core.market import MarketState
+from src.core.series import MarketSeries
+from src.core.indicator_graph import window_indicators
+
+from typing import Dict, Any, Mapping, Sequence, Tuple
+import numpy as np
+
+# Indicator graph nodes behind the MarketState properties read below
+REGIME_INDICATORS = ('adx', 'atr', 'atr_avg_14', 'ema_alignment')
+
+# Regime code -> MarketRegime (codes returned by classify_regime_series)
+REGIME_CODES: Tuple[MarketRegime, ...] = tuple(MarketRegime)
+_CODE = {regime: np.int8(code) for code, regime in enumerate(REGIME_CODES)}
+
+# MarketState values while H4 is still empty (atr [] -> 1.0, adx 20.0, EMAs 0.0 -> neutral)
+_EMPTY_INPUTS = {'adx': 20.0, 'atr': 1.0, 'atr_avg_14': 1.0, 'ema_alignment': 0.0}
+_ALIGNMENT = {'bullish': 1.0, 'bearish': -1.0, 'neutral': 0.0}
+
+
+def regime_thresholds(params: Dict[str, Any] = None) -> Tuple[float, float, float, float]:
+    """(adx_trend, adx_sideways, atr_high_mult, atr_low_mult) for a params dict (GA genes)."""
+    # Defaults (si no se pasan params)
+    if params is None:
+        return 25, 20, 1.5, 0.7
+    return (
+        params.get("adx_trend_threshold", 25),
+        params.get("adx_sideways_threshold", 15),
+        params.get("atr_high_mult", 1.5),
+        params.get("atr_low_mult", 0.65)
+    )
 
-from typing import Dict, Any
 
 def classify_regime(market_state: MarketState, params: Dict[str, Any] = None) -> MarketRegime:
     """
@@ -14,17 +42,7 @@ def classify_regime(market_state: MarketState, params: Dict[str, Any] = None) ->
     3. Sideways (Low ADX)
     4. Breakout Pending (Extreme low vol + no trend)
     """
-    # Defaults (si no se pasan params)
-    if params is None:
-        adx_trend_thresh = 25
-        adx_sideways_thresh = 20
-        atr_high_mult = 1.5
-        atr_low_mult = 0.7
-    else:
-        adx_trend_thresh = params.get("adx_trend_threshold", 25)
-        adx_sideways_thresh = params.get("adx_sideways_threshold", 15)
-        atr_high_mult = params.get("atr_high_mult", 1.5)
-        atr_low_mult = params.get("atr_low_mult", 0.65)
+    adx_trend_thresh, adx_sideways_thresh, atr_high_mult, atr_low_mult = regime_thresholds(params)
         
     adx = market_state.adx
     # Use last value of ATR series
@@ -53,3 +71,65 @@ def classify_regime(market_state: MarketState, params: Dict[str, Any] = None) ->
         
     # 5. Default
     return MarketRegime.SIDEWAYS_RANGE
+
+
+def regime_indicator_arrays(market_states: Sequence[MarketState]) -> Dict[str, np.ndarray]:
+    """
+    REGIME_INDICATORS per state of one replay (the values classify_regime reads),
+    taken from the shared indicator window of the final H4 series.
+    """
+    n = len(market_states)
+    series = market_states[-1].h4 if market_states else None
+    if not isinstance(series, MarketSeries) or not all(
+        isinstance(state.h4, MarketSeries) and state.h4.is_prefix_of(series) for state in market_states
+    ):
+        # States of unrelated series: read them one by one
+        return {
+            'adx': np.fromiter((s.adx for s in market_states), dtype=np.float64, count=n),
+            'atr': np.fromiter((s.atr[-1] if s.atr else 1.0 for s in market_states), dtype=np.float64, count=n),
+            'atr_avg_14': np.fromiter((s.atr_avg_14 for s in market_states), dtype=np.float64, count=n),
+            'ema_alignment': np.fromiter((_ALIGNMENT[s.ema_alignment] for s in market_states), dtype=np.float64, count=n),
+        }
+
+    window = window_indicators(series).compute(REGIME_INDICATORS)
+    lengths = np.fromiter((len(state.h4) for state in market_states), dtype=np.int64, count=n)
+    has_data = lengths > 0
+    arrays = {}
+    for name in REGIME_INDICATORS:
+        values = np.full(n, _EMPTY_INPUTS[name])
+        values[has_data] = window[name][lengths[has_data] - 1]
+        arrays[name] = values
+    return arrays
+
+
+def classify_regime_series(indicator_arrays: Mapping[str, np.ndarray], params: Dict[str, Any] = None) -> np.ndarray:
+    """
+    classify_regime for a whole window in one NumPy pass.
+
+    `indicator_arrays` holds one value per bar for every REGIME_INDICATORS name
+    (ema_alignment as 1 / -1 / 0). Returns int8 codes into REGIME_CODES with the
+    same priority order and comparisons as the scalar classifier.
+    """
+    adx_trend_thresh, adx_sideways_thresh, atr_high_mult, atr_low_mult = regime_thresholds(params)
+    adx = np.asarray(indicator_arrays['adx'], dtype=np.float64)
+    atr = np.asarray(indicator_arrays['atr'], dtype=np.float64)
+    atr_avg = np.asarray(indicator_arrays['atr_avg_14'], dtype=np.float64)
+    alignment = np.asarray(indicator_arrays['ema_alignment'], dtype=np.float64)
+
+    trending = adx > adx_trend_thresh
+    # Branch 4 (adx < sideways) and the default both give SIDEWAYS_RANGE
+    return np.select(
+        [
+            atr > atr_avg * atr_high_mult,
+            trending & (alignment > 0),
+            trending & (alignment < 0),
+            (atr < atr_avg * atr_low_mult) & (adx < adx_trend_thresh),
+        ],
+        [
+            _CODE[MarketRegime.HIGH_VOLATILITY],
+            _CODE[MarketRegime.TRENDING_BULLISH],
+            _CODE[MarketRegime.TRENDING_BEARISH],
+            _CODE[MarketRegime.BREAKOUT_PENDING],
+        ],
+        default=_CODE[MarketRegime.SIDEWAYS_RANGE]
+    ).astype(np.int8)
@@ -0,0 +1,344 @@
+"""
+Indicator registry and dependency graph.
+
+Every indicator is declared once in INDICATORS: a name, the nodes it reads
+(price columns or other indicators) and a window function that returns one
+value per bar. Consumers declare the names they need (Alpha.indicators,
+REGIME_INDICATORS, FeatureExtractor.INDICATORS) and read them from an
+IndicatorGraph, which evaluates each node at most once per window no matter
+how many consumers ask for it. Nodes are float64; exact Decimal callers
+(TJRStrategy's ATR stop sizing) keep their own loop over the candles.
+
+All nodes are causal: the value at bar i only depends on candles <= i, so
+one graph over a replay's final series answers every shorter prefix, and a
+node with a finite `lookback` can be evaluated for a single bar from the
+last `lookback` candles (indicator_at) with exactly the window value.
+
+Two families live side by side and stay distinct because their formulas do:
+  - MarketState per-bar indicators (Wilder rsi/atr/adx, ema_alignment,
+    atr_avg_14): the window values replay IndicatorState, the same code that
+    advances MarketState bar by bar, so both give identical numbers.
+  - FeatureExtractor columns (pandas EMAs, SMA RSI, SMA ATR, bands...).
+Shared building blocks (true_range, prev_close, the EMAs) are single nodes.
+"""
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .indicators import IndicatorState
+from .series import MarketSeries
+
+PRICE_INPUTS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[..., np.ndarray]
+    # Candles needed to evaluate the last bar exactly (None = whole history)
+    lookback: Optional[int] = None
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {}
+
+
+def indicator(name: str, *inputs: str, lookback: Optional[int] = None):
+    """Registers a window function `fn(*input_arrays) -> array` as node `name`."""
+    def register(fn: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+        if name in INDICATORS or name in PRICE_INPUTS:
+            raise ValueError(f"Indicator already registered: {name}")
+        missing = [i for i in inputs if i not in INDICATORS and i not in PRICE_INPUTS]
+        if missing:
+            # Registration order is a topological order: no cycles by construction
+            raise KeyError(f"{name} depends on unknown indicators {missing}")
+        INDICATORS[name] = IndicatorSpec(name, tuple(inputs), fn, lookback)
+        return fn
+    return register
+
+
+def dependencies(names: Iterable[str]) -> List[str]:
+    """Every node needed for `names`, dependencies first (price inputs excluded)."""
+    order: List[str] = []
+    seen = set()
+
+    def visit(name: str) -> None:
+        if name in seen or name in PRICE_INPUTS:
+            return
+        if name not in INDICATORS:
+            raise KeyError(f"Unknown indicator: {name}")
+        seen.add(name)
+        for dep in INDICATORS[name].inputs:
+            visit(dep)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+class IndicatorGraph:
+    """Lazy evaluation of registered indicators over one window of candles."""
+
+    def __init__(self, columns: Mapping[str, np.ndarray]):
+        self._values: Dict[str, np.ndarray] = {}
+        for name in PRICE_INPUTS:
+            values = np.asarray(columns[name], dtype=np.float64)
+            self._values[name] = values
+        self.length = len(self._values['close'])
+        # Nodes evaluated so far, in order (each appears once)
+        self.evaluated: List[str] = []
+
+    @classmethod
+    def from_series(cls, series: MarketSeries) -> 'IndicatorGraph':
+        return cls({
+            'open': series.opens, 'high': series.highs, 'low': series.lows,
+            'close': series.closes, 'volume': series.volumes
+        })
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'IndicatorGraph':
+        return cls({name: df[name].to_numpy(dtype=np.float64) for name in PRICE_INPUTS})
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
+
+    def get(self, name: str) -> np.ndarray:
+        """Values of `name` for every bar of the window (read-only)."""
+        if name not in self._values:
+            for node in dependencies([name]):
+                if node not in self._values:
+                    spec = INDICATORS[node]
+                    values = spec.compute(*(self._values[i] for i in spec.inputs))
+                    values.flags.writeable = False
+                    self._values[node] = values
+                    self.evaluated.append(node)
+        return self._values[name]
+
+    def compute(self, names: Iterable[str]) -> Dict[str, np.ndarray]:
+        return {name: self.get(name) for name in names}
+
+    def provide(self, name: str, values: np.ndarray) -> None:
+        """Injects a node already computed elsewhere (e.g. streamed bar by bar)."""
+        if name not in INDICATORS:
+            raise KeyError(f"Unknown indicator: {name}")
+        if len(values) != self.length:
+            raise ValueError(f"{name}: expected {self.length} values, got {len(values)}")
+        if name not in self._values:
+            values.flags.writeable = False
+            self._values[name] = values
+
+
+def window_indicators(series: MarketSeries) -> IndicatorGraph:
+    """
+    Graph over the candles of `series`, shared by every view of its buffer.
+
+    Prefix views of one replay reuse the graph of the longest view seen
+    (nodes are causal; read values[:len(view)]); a longer view rebuilds it.
+    """
+    holder = series.memo('indicator_graph', lambda: {})
+    graph = holder.get('graph')
+    if graph is None or graph.length < len(series):
+        graph = IndicatorGraph.from_series(series)
+        stream: Optional[IndicatorState] = holder.get('stream')
+        if stream is not None and stream.length >= graph.length:
+            # MarketState already streamed the Wilder indicators of these candles
+            graph.provide('wilder_14', stream.columns()[:graph.length])
+        holder['graph'] = graph
+    return graph
+
+
+def share_stream(series: MarketSeries, state: IndicatorState) -> None:
+    """
+    Records the streaming indicators of `series` (called by MarketState.update)
+    so window graphs over its buffer reuse them instead of replaying.
+    """
+    series.memo('indicator_graph', lambda: {})['stream'] = state
+
+
+def indicator_at(series: MarketSeries, name: str, index: int = -1) -> float:
+    """Value of `name` at one bar, from its lookback slice when the node has one."""
+    if index < 0:
+        index += len(series)
+    if index < 0 or index >= len(series):
+        raise IndexError("Indicator index out of range")
+    lookback = INDICATORS[name].lookback
+    if lookback is None:
+        return float(window_indicators(series).get(name)[index])
+    start = max(0, index + 1 - lookback)
+    stop = index + 1
+    graph = IndicatorGraph({
+        'open': series.opens[start:stop], 'high': series.highs[start:stop], 'low': series.lows[start:stop],
+        'close': series.closes[start:stop], 'volume': series.volumes[start:stop]
+    })
+    return float(graph.get(name)[-1])
+
+
+# --- Shared building blocks ---
+
+@indicator('prev_close', 'close', lookback=2)
+def _prev_close(close: np.ndarray) -> np.ndarray:
+    prev = np.empty_like(close)
+    prev[:1] = np.nan
+    prev[1:] = close[:-1]
+    return prev
+
+
+@indicator('true_range', 'high', 'low', 'prev_close', lookback=2)
+def _true_range(high: np.ndarray, low: np.ndarray, prev_close: np.ndarray) -> np.ndarray:
+    # fmax ignores the NaN previous close of the first bar -> high - low
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def _ewm(values: np.ndarray, span: int) -> np.ndarray:
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def _register_ema(span: int) -> None:
+    # ewm(span, adjust=False); IndicatorState.step_values uses the same recurrence
+    indicator(f'ema_{span}', 'close')(lambda close: _ewm(close, span))
+
+
+for _span in (9, 12, 20, 26, 50, 200):
+    _register_ema(_span)
+
+
+def _fsum_window(values: np.ndarray, size: int) -> np.ndarray:
+    """Rolling mean with exactly rounded sums: slice-invariant (see indicator_at)."""
+    out = np.full(len(values), np.nan)
+    data = values.tolist()
+    for i in range(size - 1, len(data)):
+        out[i] = math.fsum(data[i + 1 - size:i + 1]) / size
+    return out
+
+
+def _fsum_std_window(values: np.ndarray, size: int) -> np.ndarray:
+    """Rolling sample std (ddof=1), two-pass over each window with exactly rounded sums."""
+    out = np.full(len(values), np.nan)
+    data = values.tolist()
+    for i in range(size - 1, len(data)):
+        window = data[i + 1 - size:i + 1]
+        mean = math.fsum(window) / size
+        out[i] = math.sqrt(math.fsum((x - mean) ** 2 for x in window) / (size - 1))
+    return out
+
+
+@indicator('atr_sma_14', 'true_range', lookback=15)
+def _atr_sma_14(true_range: np.ndarray) -> np.ndarray:
+    """Mean of the last 14 true ranges (FeatureExtractor atr_14)."""
+    return _fsum_window(true_range, 14)
+
+
+# --- FeatureExtractor columns ---
+# Rolling windows use the fsum arithmetic of FeatureStream (src.ml.features),
+# so the streamed rows equal the batch columns bit for bit.
+
+@indicator('rsi_sma_14', 'close')
+def _rsi_sma_14(close: np.ndarray) -> np.ndarray:
+    delta = np.diff(close, prepend=np.nan)
+    # The first delta is NaN -> gain/loss 0
+    gain = _fsum_window(np.where(delta > 0, delta, 0.0), 14)
+    loss = _fsum_window(np.where(delta < 0, -delta, 0.0), 14)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return np.where(np.isnan(rsi), 50.0, rsi)
+
+
+@indicator('macd', 'ema_12', 'ema_26')
+def _macd(ema_12: np.ndarray, ema_26: np.ndarray) -> np.ndarray:
+    return ema_12 - ema_26
+
+
+@indicator('macd_signal', 'macd')
+def _macd_signal(macd: np.ndarray) -> np.ndarray:
+    return _ewm(macd, 9)
+
+
+@indicator('sma_20', 'close')
+def _sma_20(close: np.ndarray) -> np.ndarray:
+    return _fsum_window(close, 20)
+
+
+@indicator('std_20', 'close')
+def _std_20(close: np.ndarray) -> np.ndarray:
+    return _fsum_std_window(close, 20)
+
+
+@indicator('vol_sma_20', 'volume')
+def _vol_sma_20(volume: np.ndarray) -> np.ndarray:
+    return _fsum_window(volume, 20)
+
+
+@indicator('obv', 'close', 'volume')
+def _obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    return (np.sign(pd.Series(close).diff()) * volume).fillna(0).cumsum().to_numpy()
+
+
+# --- MarketState per-bar indicators (H4) ---
+
+@indicator('wilder_14', 'high', 'low', 'close')
+def _wilder_14(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    IndicatorState rows per bar: raw RSI, raw ATR and ADX as MarketState
+    reports them after that bar. Replayed only when no MarketState streamed
+    the series (see share_stream).
+    """
+    state = IndicatorState()
+    for h, l, c in zip(high.tolist(), low.tolist(), close.tolist()):
+        state = state.step_values(h, l, c)
+    return state.columns()
+
+
+@indicator('rsi', 'wilder_14')
+def _rsi(wilder: np.ndarray) -> np.ndarray:
+    """MarketState.rsi[-1] per bar (50.0 until the period is filled)."""
+    rsi = wilder[:, 0].copy()
+    rsi[:13] = 50.0
+    return rsi
+
+
+@indicator('atr_wilder', 'wilder_14')
+def _atr_wilder(wilder: np.ndarray) -> np.ndarray:
+    """Wilder ATR column (what MarketState.atr holds once 14 bars exist; 0.0 before the seed)."""
+    return wilder[:, 1].copy()
+
+
+@indicator('atr', 'atr_wilder')
+def _atr(atr_wilder: np.ndarray) -> np.ndarray:
+    """MarketState.atr[-1] per bar (1.0 until the period is filled)."""
+    atr = atr_wilder.copy()
+    atr[:13] = 1.0
+    return atr
+
+
+@indicator('adx', 'wilder_14')
+def _adx(wilder: np.ndarray) -> np.ndarray:
+    return wilder[:, 2].copy()
+
+
+@indicator('atr_avg_14', 'atr_wilder')
+def _atr_avg_14(atr_wilder: np.ndarray) -> np.ndarray:
+    """MarketState.atr_avg_14 per bar: sum(atr[-14:]) / 14 summed left to right."""
+    n = len(atr_wilder)
+    out = np.ones(n)
+    if n >= 14:
+        total = np.zeros(n - 13)
+        for k in range(14):
+            total += atr_wilder[k:n - 13 + k]
+        out[13:] = total / 14.0
+    return out
+
+
+def _market_ema(close: np.ndarray, ema: np.ndarray, period: int) -> np.ndarray:
+    # IndicatorState.ema: last close until `period` bars (ta min_periods)
+    out = ema.copy()
+    out[:period - 1] = close[:period - 1]
+    return out
+
+
+@indicator('ema_alignment', 'close', 'ema_20', 'ema_50')
+def _ema_alignment(close: np.ndarray, ema_20: np.ndarray, ema_50: np.ndarray) -> np.ndarray:
+    """MarketState.ema_alignment per bar: 1 bullish, -1 bearish, 0 neutral."""
+    return np.sign(_market_ema(close, ema_20, 20) - _market_ema(close, ema_50, 50))
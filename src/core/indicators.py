@@ -0,0 +1,272 @@
+from collections.abc import Sequence
+from typing import Any, List, Optional, Union, overload
+import numpy as np
+from .candle import Candle
+from .series import MarketSeries
+
+_INITIAL_CAPACITY = 256
+
+
+def _ewm_step(value: float, x: float, alpha: float) -> float:
+    old_wt = 1.0 - alpha
+    return (old_wt * value + alpha * x) / (old_wt + alpha)
+
+
+class IndicatorSeries(Sequence):
+    """
+    Read-only list-like view over a prefix of a streaming indicator column.
+
+    Behaves like the List[float] returned by the batch `calculate_*` helpers
+    (len, negative indexing, slicing, truthiness) without copying the history.
+    """
+    __slots__ = ('_data', '_length')
+
+    def __init__(self, data: np.ndarray, length: int):
+        self._data = data
+        self._length = length
+
+    @property
+    def values(self) -> np.ndarray:
+        view = self._data[:self._length]
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[float]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, List[float]]:
+        if isinstance(index, slice):
+            return self._data[:self._length][index].tolist()
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("Indicator index out of range")
+        return float(self._data[index])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, IndicatorSeries)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"IndicatorSeries({self.values.tolist()!r})"
+
+
+class _IndicatorBuffer:
+    """Growable per-bar output columns (RSI, ATR, ADX) shared between snapshots."""
+    __slots__ = ('rsi', 'atr', 'adx', 'size')
+    _COLUMNS = ('rsi', 'atr', 'adx')
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        for name in self._COLUMNS:
+            setattr(self, name, np.empty(max(capacity, 1), dtype=np.float64))
+        self.size = 0
+
+    def copy_prefix(self, length: int) -> '_IndicatorBuffer':
+        buf = _IndicatorBuffer(max(_INITIAL_CAPACITY, length * 2))
+        for name in self._COLUMNS:
+            getattr(buf, name)[:length] = getattr(self, name)[:length]
+        buf.size = length
+        return buf
+
+    def append(self, rsi: float, atr: float, adx: float) -> None:
+        if self.size == len(self.rsi):
+            capacity = len(self.rsi) * 2
+            for name in self._COLUMNS:
+                old = getattr(self, name)
+                new = np.empty(capacity, dtype=np.float64)
+                new[:self.size] = old[:self.size]
+                setattr(self, name, new)
+        self.rsi[self.size] = rsi
+        self.atr[self.size] = atr
+        self.adx[self.size] = adx
+        self.size += 1
+
+
+class IndicatorState:
+    """
+    Streaming Wilder RSI, ATR, ADX/DI and EMA 20/50 over one candle series.
+
+    Each `step` is O(1) and returns a NEW state; the previous one stays valid,
+    mirroring the functional MarketSeries.add API. The recurrences replicate
+    the `ta` implementations used by `calculate_rsi/atr/adx/ema` so values
+    agree with the batch helpers within float tolerance.
+    """
+    __slots__ = (
+        '_buffer', 'length', 'period', 'prev_close', 'prev_high', 'prev_low',
+        'avg_gain', 'avg_loss', 'tr_sum', 'atr',
+        'trs', 'dip', 'din', 'dx_sum', 'adx_value', 'plus_di', 'minus_di',
+        'ema_20', 'ema_50',
+    )
+
+    def __init__(self, period: int = 14):
+        self._buffer = _IndicatorBuffer()
+        self.length = 0
+        self.period = period
+        self.prev_close = 0.0
+        self.prev_high = 0.0
+        self.prev_low = 0.0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.tr_sum = 0.0
+        self.atr = 0.0
+        self.trs = 0.0
+        self.dip = 0.0
+        self.din = 0.0
+        self.dx_sum = 0.0
+        self.adx_value: Optional[float] = None
+        self.plus_di = 0.0
+        self.minus_di = 0.0
+        self.ema_20 = 0.0
+        self.ema_50 = 0.0
+
+    @classmethod
+    def from_series(cls, series: MarketSeries, period: int = 14) -> 'IndicatorState':
+        """Replay an existing series once to bootstrap streaming state."""
+        state = cls(period)
+        for candle in series:
+            state = state.step(candle)
+        return state
+
+    def _clone(self) -> 'IndicatorState':
+        clone = IndicatorState.__new__(IndicatorState)
+        for name in IndicatorState.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def step(self, candle: Candle) -> 'IndicatorState':
+        """Advance the indicators by one candle, returning a new state."""
+        return self.step_values(float(candle.high), float(candle.low), float(candle.close))
+
+    def step_values(self, high: float, low: float, close: float) -> 'IndicatorState':
+        s = self._clone()
+        buffer = self._buffer
+        if buffer.size != self.length:
+            # Another state already advanced from this snapshot
+            buffer = buffer.copy_prefix(self.length)
+        s._buffer = buffer
+
+        w = self.period
+        t = self.length
+
+        if t == 0:
+            tr = high - low
+            s.ema_20 = close
+            s.ema_50 = close
+        else:
+            pc = self.prev_close
+            tr = max(high - low, abs(high - pc), abs(low - pc))
+
+            # RSI: Wilder smoothing (ewm alpha=1/w, adjust=False)
+            diff = close - pc
+            gain = diff if diff > 0 else 0.0
+            loss = -diff if diff < 0 else 0.0
+            alpha = 1.0 / w
+            s.avg_gain = (1 - alpha) * self.avg_gain + alpha * gain
+            s.avg_loss = (1 - alpha) * self.avg_loss + alpha * loss
+
+            # ADX/DI: Wilder sums seeded with the first w moves
+            up = high - self.prev_high
+            down = self.prev_low - low
+            pos = up if (up > down and up > 0) else 0.0
+            neg = down if (down > up and down > 0) else 0.0
+            if t <= w:
+                s.trs = self.trs + tr
+                s.dip = self.dip + pos
+                s.din = self.din + neg
+            else:
+                s.trs = self.trs - (self.trs / float(w)) + tr
+                s.dip = self.dip - (self.dip / float(w)) + pos
+                s.din = self.din - (self.din / float(w)) + neg
+
+            if t >= w:
+                s.plus_di = 100 * (s.dip / s.trs) if s.trs != 0 else 0.0
+                s.minus_di = 100 * (s.din / s.trs) if s.trs != 0 else 0.0
+                di_sum = s.plus_di + s.minus_di
+                dx = 100 * abs((s.plus_di - s.minus_di) / di_sum) if di_sum != 0 else 0.0
+                j = t - w
+                if j < w:
+                    s.dx_sum = self.dx_sum + dx
+                    if j == w - 1:
+                        s.adx_value = s.dx_sum / w
+                else:
+                    s.adx_value = ((self.adx_value * (w - 1)) + dx) / float(w)
+
+            # ewm(span, adjust=False) recurrence, as pandas/ta and the 'ema_N' graph nodes
+            s.ema_20 = _ewm_step(self.ema_20, close, 2.0 / 21.0)
+            s.ema_50 = _ewm_step(self.ema_50, close, 2.0 / 51.0)
+
+        # ATR: simple mean seed, then Wilder smoothing
+        if t < w - 1:
+            s.tr_sum = self.tr_sum + tr
+            atr = 0.0
+        elif t == w - 1:
+            s.tr_sum = self.tr_sum + tr
+            atr = s.tr_sum / w
+        else:
+            atr = (self.atr * (w - 1) + tr) / float(w)
+        s.atr = atr
+
+        if t < w - 1:
+            rsi = 50.0
+        elif s.avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + s.avg_gain / s.avg_loss))
+
+        s.length = t + 1
+        buffer.append(rsi, atr, s.adx())
+        s.prev_close = close
+        s.prev_high = high
+        s.prev_low = low
+        return s
+
+    # --- Outputs (same shapes/defaults as the batch helpers in core.market) ---
+
+    def rsi_series(self) -> Union[IndicatorSeries, List[float]]:
+        if self.length < self.period:
+            return [50.0] * self.length
+        return IndicatorSeries(self._buffer.rsi, self.length)
+
+    def atr_series(self) -> Union[IndicatorSeries, List[float]]:
+        if self.length < self.period:
+            return [1.0] * self.length
+        return IndicatorSeries(self._buffer.atr, self.length)
+
+    def columns(self) -> np.ndarray:
+        """
+        Per-bar (raw RSI, raw ATR, ADX) rows of the whole history: the
+        'wilder_14' node of the indicator graph, already computed bar by bar.
+        """
+        buffer = self._buffer
+        return np.column_stack((buffer.rsi[:self.length], buffer.atr[:self.length], buffer.adx[:self.length]))
+
+    def adx(self) -> float:
+        if self.length < self.period * 2 or self.adx_value is None:
+            return 20.0
+        return float(self.adx_value)
+
+    def ema(self, period: int) -> float:
+        values = {20: self.ema_20, 50: self.ema_50}
+        if period not in values:
+            raise ValueError(f"Unsupported streaming EMA period: {period}")
+        if self.length < period:
+            return self.prev_close if self.length > 0 else 0.0
+        return values[period]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Latest scalar values (debugging/benchmarks)."""
+        return {
+            'rsi': self.rsi_series()[-1] if self.length else 50.0,
+            'atr': self.atr_series()[-1] if self.length else 1.0,
+            'adx': self.adx(),
+            'plus_di': self.plus_di,
+            'minus_di': self.minus_di,
+            'ema_20': self.ema(20),
+            'ema_50': self.ema(50),
+        }
@@ -1,6 +1,6 @@
 
 from dataclasses import dataclass, field
-from typing import List, cast, Dict, Any
+from typing import List, cast, Dict, Any, Optional
 import pandas as pd
 from ta.momentum import RSIIndicator
 from ta.volatility import AverageTrueRange
@@ -8,6 +8,8 @@ from ta.trend import ADXIndicator, EMAIndicator
 from .candle import Candle
 from .series import MarketSeries
 from .timeframe import Timeframe
+from .indicators import IndicatorState
+from .indicator_graph import share_stream
 
 @dataclass(frozen=True)
 class MarketState:
@@ -17,6 +19,8 @@ class MarketState:
     h1: MarketSeries
     h4: MarketSeries
     _cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+    # Streaming H4 indicators carried across update(); None -> batch fallback
+    _indicators: Optional[IndicatorState] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         # Use object.__setattr__ because the dataclass is frozen
@@ -24,23 +28,32 @@ class MarketState:
 
     @property
     def rsi(self):
-        """Lazy cached RSI calculation (placeholder)."""
+        """Lazy cached RSI calculation."""
         if 'rsi' not in self._cache:
-            self._cache['rsi'] = calculate_rsi(self.h4)
+            if self._indicators is not None:
+                self._cache['rsi'] = self._indicators.rsi_series()
+            else:
+                self._cache['rsi'] = calculate_rsi(self.h4)
         return self._cache['rsi']
 
     @property
     def atr(self):
-        """Lazy cached ATR calculation (placeholder)."""
+        """Lazy cached ATR calculation."""
         if 'atr' not in self._cache:
-            self._cache['atr'] = calculate_atr(self.h4)
+            if self._indicators is not None:
+                self._cache['atr'] = self._indicators.atr_series()
+            else:
+                self._cache['atr'] = calculate_atr(self.h4)
         return self._cache['atr']
 
     @property
     def adx(self) -> float:
         """Lazy cached ADX calculation."""
         if 'adx' not in self._cache:
-            self._cache['adx'] = calculate_adx(self.h4)
+            if self._indicators is not None:
+                self._cache['adx'] = self._indicators.adx()
+            else:
+                self._cache['adx'] = calculate_adx(self.h4)
         return self._cache['adx']
 
     @property
@@ -59,8 +72,12 @@ class MarketState:
     def ema_alignment(self) -> str:
         """Lazy cached EMA alignment (20 vs 50)."""
         if 'ema_alignment' not in self._cache:
-            ema_20 = calculate_ema(self.h4, 20)
-            ema_50 = calculate_ema(self.h4, 50)
+            if self._indicators is not None:
+                ema_20 = self._indicators.ema(20)
+                ema_50 = self._indicators.ema(50)
+            else:
+                ema_20 = calculate_ema(self.h4, 20)
+                ema_50 = calculate_ema(self.h4, 50)
             
             if ema_20 > ema_50:
                 alignment = 'bullish'
@@ -76,18 +93,38 @@ class MarketState:
     def empty(cls, symbol: str) -> 'MarketState':
         """Factory method to create an empty market state."""
         empty_series = MarketSeries([])
-        return cls(
+        state = cls(
             symbol=symbol,
             m5=empty_series,
             m15=empty_series,
             h1=empty_series,
             h4=empty_series
         )
+        object.__setattr__(state, '_indicators', IndicatorState())
+        return state
 
     def update(self, candle: Candle) -> 'MarketState':
         """
         Returns a NEW MarketState with the candle added to the correct series.
+        Streaming H4 indicators advance in O(1) and are carried to the new state.
         """
+        new_state = self._route(candle)
+        if new_state is self:
+            return self
+
+        indicators = self._indicators
+        if candle.timeframe == Timeframe.H4:
+            if indicators is None or new_state.h4.current is not candle:
+                # No streaming state yet, or an out-of-order candle re-sorted H4
+                indicators = IndicatorState.from_series(new_state.h4)
+            else:
+                indicators = indicators.step(candle)
+            # Window consumers (AlphaMatrix, regime arrays) read these columns via the graph
+            share_stream(new_state.h4, indicators)
+        object.__setattr__(new_state, '_indicators', indicators)
+        return new_state
+
+    def _route(self, candle: Candle) -> 'MarketState':
         if candle.timeframe == Timeframe.M5:
             return MarketState(
                 symbol=self.symbol,
@@ -1,42 +1,459 @@
-from typing import List, Optional, Iterator
+from collections.abc import Sequence
+from decimal import Decimal
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Optional, Iterator, TypeVar, Union, overload
+import numpy as np
 from .candle import Candle
+from .timeframe import Timeframe
+
+_INITIAL_CAPACITY = 256
+
+_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# Candles built per pass when a column-backed series is iterated
+_MATERIALIZE_CHUNK = 4096
+
+# Decimal(1E-k) por número de decimales (_decimals)
+_MAX_SCALE = 10
+_QUANTA = [Decimal(1).scaleb(-k) for k in range(_MAX_SCALE + 1)]
+
+
+def _decimals(values: np.ndarray) -> List[Decimal]:
+    """
+    [Decimal(repr(v)) for v in values], same digits and exponent, without
+    formatting each float.
+
+    A value whose shortest repr has k (1..10) decimals and < 15 digits is
+    n * 10**-k with n = round(v * 10**k) an exact int; the float division
+    n / 10**k is correctly rounded, so it equals v only for that decimal.
+    Decimal(n) * Decimal('1E-k') then has coefficient n and exponent -k, as
+    Decimal(repr(v)) (repr keeps one decimal for integral values). Anything
+    else (scientific notation, more digits) goes through repr.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    coeff = np.zeros(len(values), dtype=np.int64)
+    scale = np.zeros(len(values), dtype=np.int64)
+    # -0.0 tampoco (Decimal(0) pierde el signo)
+    pending = np.isfinite(values) & ~((values == 0) & np.signbit(values))
+    with np.errstate(invalid='ignore', over='ignore'):
+        for k in range(1, _MAX_SCALE + 1):
+            scaled = np.round(values * 10.0 ** k)
+            found = pending & (np.abs(scaled) < 1e15) & (scaled / 10.0 ** k == values)
+            coeff[found] = scaled[found]
+            scale[found] = k
+            pending &= ~found
+            if not pending.any():
+                break
+    quanta = _QUANTA
+    result = [Decimal(n) * quanta[k] for n, k in zip(coeff.tolist(), scale.tolist())]
+    for i in np.flatnonzero(scale == 0).tolist():
+        result[i] = Decimal(repr(float(values[i])))
+    return result
+
+T = TypeVar('T')
+
+
+class _ColumnCandles(Sequence):
+    """
+    Candle objects built on demand from numeric columns (e.g. a memory-mapped
+    candle store). Each candle is materialized once, on first access.
+
+    Prices go through repr(float) so the Decimal has the same value as the
+    original CSV string (the shortest round-tripping repr drops only
+    trailing zeros). Ranges (slices, iteration) are built in bulk from the
+    columns (_decimals) instead of one numpy scalar at a time.
+
+    window() returns a sub-range over column views that shares the cache,
+    so a candle is built once no matter which window touches it first.
+    """
+    __slots__ = ('_timestamp', '_open', '_high', '_low', '_close', '_volume', '_timeframe', '_cache', '_offset')
+
+    def __init__(
+        self,
+        timestamp, open_, high, low, close, volume,
+        timeframe: Timeframe,
+        cache: Optional[List[Optional[Candle]]] = None,
+        offset: int = 0
+    ):
+        self._timestamp = timestamp
+        self._open = open_
+        self._high = high
+        self._low = low
+        self._close = close
+        self._volume = volume
+        self._timeframe = timeframe
+        self._cache: List[Optional[Candle]] = [None] * len(timestamp) if cache is None else cache
+        self._offset = offset
+
+    def __len__(self) -> int:
+        return len(self._timestamp)
+
+    def window(self, start: int, stop: int) -> '_ColumnCandles':
+        """Candles [start, stop) (0 <= start <= stop <= len), sharing this cache."""
+        return _ColumnCandles(
+            self._timestamp[start:stop], self._open[start:stop], self._high[start:stop],
+            self._low[start:stop], self._close[start:stop], self._volume[start:stop],
+            self._timeframe, self._cache, self._offset + start
+        )
+
+    def _fill(self, start: int, stop: int) -> None:
+        """Builds the missing candles of [start, stop) in one pass over the columns."""
+        cache, offset = self._cache, self._offset
+        segment = cache[offset + start:offset + stop]
+        n_missing = segment.count(None)
+        if not n_missing:
+            return
+        if n_missing == len(segment):
+            rows = slice(start, stop)
+        else:
+            missing = [start + j for j, candle in enumerate(segment) if candle is None]
+            rows = np.asarray(missing)
+        timestamps = np.asarray(self._timestamp[rows], dtype=np.int64).tolist()
+        columns = [
+            _decimals(column[rows])
+            for column in (self._open, self._high, self._low, self._close, self._volume)
+        ]
+        built = list(map(Candle, timestamps, *columns, repeat(self._timeframe), repeat(True)))
+        if isinstance(rows, slice):
+            cache[offset + start:offset + stop] = built
+        else:
+            for i, candle in zip(missing, built):
+                cache[offset + i] = candle
+
+    def iterate(self, start: int, stop: int) -> Iterator[Candle]:
+        """Candles [start, stop), built chunk by chunk as the iteration advances."""
+        offset = self._offset
+        for chunk in range(start, stop, _MATERIALIZE_CHUNK):
+            chunk_stop = min(chunk + _MATERIALIZE_CHUNK, stop)
+            self._fill(chunk, chunk_stop)
+            yield from self._cache[offset + chunk:offset + chunk_stop]
+
+    def __iter__(self) -> Iterator[Candle]:
+        return self.iterate(0, len(self))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                if stop <= start:
+                    return []
+                self._fill(start, stop)
+                return self._cache[self._offset + start:self._offset + stop]
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Candle index out of range")
+        candle = self._cache[self._offset + index]
+        if candle is None:
+            candle = Candle(
+                timestamp=int(self._timestamp[index]),
+                open=Decimal(repr(float(self._open[index]))),
+                high=Decimal(repr(float(self._high[index]))),
+                low=Decimal(repr(float(self._low[index]))),
+                close=Decimal(repr(float(self._close[index]))),
+                volume=Decimal(repr(float(self._volume[index]))),
+                timeframe=self._timeframe,
+                complete=True
+            )
+            self._cache[self._offset + index] = candle
+        return candle
+
+
+class _SeriesBuffer:
+    """
+    Shared append-only storage behind one or more MarketSeries views.
+
+    Keeps the Candle objects (Decimal precision for strategy logic) alongside
+    preallocated float64/int64 columns that grow geometrically, so appends are
+    amortized O(1) and numeric consumers can read contiguous arrays.
+    """
+    __slots__ = ('candles', 'timestamp', 'open', 'high', 'low', 'close', 'volume', 'size', 'memo')
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        capacity = max(capacity, 1)
+        self.candles: List[Candle] = []
+        self.timestamp = np.empty(capacity, dtype=np.int64)
+        self.open = np.empty(capacity, dtype=np.float64)
+        self.high = np.empty(capacity, dtype=np.float64)
+        self.low = np.empty(capacity, dtype=np.float64)
+        self.close = np.empty(capacity, dtype=np.float64)
+        self.volume = np.empty(capacity, dtype=np.float64)
+        self.size = 0
+        # Per-buffer derived results (e.g. structure detection keyed by index)
+        self.memo: Dict[str, Any] = {}
+
+    @classmethod
+    def from_candles(cls, candles: List[Candle]) -> '_SeriesBuffer':
+        buf = cls(max(_INITIAL_CAPACITY, len(candles) * 2))
+        n = len(candles)
+        buf.candles = list(candles)
+        buf.timestamp[:n] = [c.timestamp for c in candles]
+        buf.open[:n] = [float(c.open) for c in candles]
+        buf.high[:n] = [float(c.high) for c in candles]
+        buf.low[:n] = [float(c.low) for c in candles]
+        buf.close[:n] = [float(c.close) for c in candles]
+        buf.volume[:n] = [float(c.volume) for c in candles]
+        buf.size = n
+        return buf
+
+    @classmethod
+    def from_columns(
+        cls,
+        timestamp: np.ndarray,
+        open_: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        timeframe: Optional[Timeframe] = None,
+        candles: Optional[Sequence] = None
+    ) -> '_SeriesBuffer':
+        """
+        Wraps existing (possibly read-only / memory-mapped) columns without copying.
+
+        Candles are built lazily from the columns unless `candles` (same rows) is given.
+        """
+        buf = cls.__new__(cls)
+        buf.timestamp = timestamp
+        buf.open = open_
+        buf.high = high
+        buf.low = low
+        buf.close = close
+        buf.volume = volume
+        if candles is None:
+            candles = _ColumnCandles(timestamp, open_, high, low, close, volume, timeframe)
+        buf.candles = candles
+        buf.size = len(timestamp)
+        buf.memo = {}
+        return buf
+
+    def copy_prefix(self, length: int) -> '_SeriesBuffer':
+        """Copy the first `length` rows into a fresh buffer (used when a view branches)."""
+        buf = _SeriesBuffer(max(_INITIAL_CAPACITY, length * 2))
+        buf.candles = self.candles[:length]
+        for name in _COLUMNS:
+            getattr(buf, name)[:length] = getattr(self, name)[:length]
+        buf.size = length
+        return buf
+
+    def _grow(self) -> None:
+        # Column-backed buffers are full (capacity == size), so the first
+        # append also moves them to fresh writable arrays
+        new_capacity = max(len(self.timestamp) * 2, _INITIAL_CAPACITY)
+        for name in _COLUMNS:
+            old = getattr(self, name)
+            new = np.empty(new_capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def append(self, candle: Candle) -> None:
+        if self.size == len(self.timestamp):
+            self._grow()
+        if not isinstance(self.candles, list):
+            self.candles = list(self.candles)
+        i = self.size
+        self.candles.append(candle)
+        self.timestamp[i] = candle.timestamp
+        self.open[i] = float(candle.open)
+        self.high[i] = float(candle.high)
+        self.low[i] = float(candle.low)
+        self.close[i] = float(candle.close)
+        self.volume[i] = float(candle.volume)
+        self.size = i + 1
+
 
 class MarketSeries:
+    """
+    Immutable, timestamp-ordered view over an append-only columnar buffer.
+
+    `add` keeps the functional API (returns a NEW series, the original is left
+    untouched) but shares storage with its parent: when the parent is the tip of
+    its buffer the candle is appended in place in amortized O(1); otherwise the
+    prefix is copied first so earlier views never observe later candles.
+    """
+
     def __init__(self, candles: List[Candle]):
         # Enforce sorting by timestamp on creation
-        self._candles = sorted(candles, key=lambda c: c.timestamp)
-    
+        ordered = sorted(candles, key=lambda c: c.timestamp)
+        self._buffer = _SeriesBuffer.from_candles(ordered)
+        self._length = len(ordered)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamp: np.ndarray,
+        open_: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        timeframe: Timeframe
+    ) -> 'MarketSeries':
+        """
+        Array-backed series: columns are used as-is (no copy when already
+        timestamp-ordered) and Candle objects are only built when accessed.
+        """
+        columns = [timestamp, open_, high, low, close, volume]
+        if len(timestamp) > 1 and np.any(np.diff(timestamp) < 0):
+            order = np.argsort(timestamp, kind='stable')
+            columns = [column[order] for column in columns]
+        buffer = _SeriesBuffer.from_columns(*columns, timeframe)
+        return cls._view(buffer, len(timestamp))
+
+    @classmethod
+    def concat(cls, parts: Sequence[Union['MarketSeries', Sequence[Candle]]]) -> 'MarketSeries':
+        """
+        Joins consecutive pieces (e.g. warmup + window, already in time order).
+
+        Numeric columns are concatenated as arrays and the Candle objects are
+        the pieces' own (column-backed pieces build theirs once, in their cache).
+        A single non-empty MarketSeries piece is returned as is.
+        """
+        parts = [part for part in parts if len(part)]
+        if len(parts) == 1 and isinstance(parts[0], MarketSeries):
+            return parts[0]
+        pieces = [part if isinstance(part, MarketSeries) else MarketSeries(list(part)) for part in parts]
+        if not pieces:
+            return cls([])
+        columns = [np.concatenate([piece._column(name) for piece in pieces]) for name in _COLUMNS]
+        candles = [candle for piece in pieces for candle in piece]
+        return cls._view(_SeriesBuffer.from_columns(*columns, candles=candles), len(candles))
+
+    @classmethod
+    def _view(cls, buffer: _SeriesBuffer, length: int) -> 'MarketSeries':
+        series = cls.__new__(cls)
+        series._buffer = buffer
+        series._length = length
+        return series
+
     @property
     def candles(self) -> List[Candle]:
-        return self._candles
-    
+        return self._buffer.candles[:self._length]
+
     @property
     def current(self) -> Candle:
-        if not self._candles:
+        if not self._length:
             raise IndexError("Series is empty")
-        return self._candles[-1]
-    
+        return self._buffer.candles[self._length - 1]
+
     @property
     def last_closed(self) -> Optional[Candle]:
         """Returns the last candle where complete=True."""
-        for c in reversed(self._candles):
+        for i in range(self._length - 1, -1, -1):
+            c = self._buffer.candles[i]
             if c.complete:
                 return c
         return None
 
+    # --- Columnar access (read-only float64/int64 views, no copies) ---
+
+    def _column(self, name: str) -> np.ndarray:
+        view = getattr(self._buffer, name)[:self._length]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._column('timestamp')
+
+    @property
+    def opens(self) -> np.ndarray:
+        return self._column('open')
+
+    @property
+    def highs(self) -> np.ndarray:
+        return self._column('high')
+
+    @property
+    def lows(self) -> np.ndarray:
+        return self._column('low')
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self._column('close')
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self._column('volume')
+
     def __len__(self) -> int:
-        return len(self._candles)
-        
+        return self._length
+
     def __iter__(self) -> Iterator[Candle]:
-        return iter(self._candles)
+        candles = self._buffer.candles
+        if isinstance(candles, _ColumnCandles):
+            yield from candles.iterate(0, self._length)
+            return
+        for i in range(self._length):
+            yield candles[i]
+
+    @overload
+    def __getitem__(self, index: int) -> Candle: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[Candle]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Candle, List[Candle]]:
+        if isinstance(index, slice):
+            # Solo el rango pedido (las velas de un buffer de columnas se crean al acceder)
+            start, stop, step = index.indices(self._length)
+            candles = self._buffer.candles
+            if step > 0:
+                return candles[start:stop:step]
+            return [candles[i] for i in range(start, stop, step)]
+        return self.get(index)
+
+    def window(self, start: int = 0, stop: Optional[int] = None) -> 'MarketSeries':
+        """
+        Series of candles [start, stop) (slice semantics): numeric columns are
+        views and a column-backed series shares its Candle cache with the window.
+        """
+        start, stop, _ = slice(start, stop).indices(self._length)
+        stop = max(start, stop)
+        buffer = self._buffer
+        columns = [getattr(buffer, name)[start:stop] for name in _COLUMNS]
+        if isinstance(buffer.candles, _ColumnCandles):
+            candles = buffer.candles.window(start, stop)
+        else:
+            candles = buffer.candles[start:stop]
+        return MarketSeries._view(_SeriesBuffer.from_columns(*columns, candles=candles), stop - start)
+
+    def memo(self, key: str, factory: Callable[[], T]) -> T:
+        """
+        Returns a memo object shared by every view over the same buffer.
+
+        Views on one buffer only differ in length, so results computed for a
+        candle index from candles up to that index stay valid across bars.
+        A branched or re-sorted series gets a fresh buffer and a fresh memo.
+        """
+        memo = self._buffer.memo
+        if key not in memo:
+            memo[key] = factory()
+        return memo[key]
+
+    def is_prefix_of(self, other: 'MarketSeries') -> bool:
+        """True if both views share storage and this one is not longer (same replay)."""
+        return self._buffer is other._buffer and self._length <= other._length
 
     def add(self, candle: Candle) -> 'MarketSeries':
         """
         Functional add: Returns a NEW MarketSeries instance with the new candle.
         Does NOT mutate the current instance.
         """
-        # Optimized for readability, not performance (yet)
-        return MarketSeries(self._candles + [candle])
-    
+        buffer = self._buffer
+        if self._length and candle.timestamp < buffer.timestamp[self._length - 1]:
+            # Out-of-order candle: fall back to a full sorted rebuild
+            return MarketSeries(self.candles + [candle])
+
+        if buffer.size != self._length:
+            # Another series already extended this buffer past our tip
+            buffer = buffer.copy_prefix(self._length)
+        buffer.append(candle)
+        return MarketSeries._view(buffer, self._length + 1)
+
     def get(self, index: int) -> Candle:
-        return self._candles[index]
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("Series index out of range")
+        return self._buffer.candles[index]
@@ -4,6 +4,9 @@ from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func, desc, Float
+import csv
+import io
+import json
 import uuid
 
 from src.database.models import Trade, Pattern, Strategy, BacktestRun, AgentLog
@@ -27,6 +30,31 @@ class TradeRepository:
         db.flush()
         return trades
     
+    @staticmethod
+    def bulk_ingest(db: Session, trades_data: List[Dict[str, Any]]) -> int:
+        """
+        Inserta un batch de trades sin ORM ni round trip por fila.
+
+        PostgreSQL: un solo COPY trades FROM STDIN (CSV) con market_state
+        serializado a JSON una vez por batch. Otros backends: un INSERT
+        executemany. Rellena trade_id/created_at/updated_at como los
+        defaults del modelo. Devuelve el número de filas insertadas.
+        """
+        if not trades_data:
+            return 0
+        rows = _trade_rows(trades_data)
+        if db.get_bind().dialect.name != 'postgresql':
+            db.execute(Trade.__table__.insert(), rows)
+            return len(rows)
+
+        columns = list(rows[0].keys())
+        cursor = db.connection().connection.cursor()
+        try:
+            _copy_rows(cursor, 'trades', columns, rows)
+        finally:
+            cursor.close()
+        return len(rows)
+
     @staticmethod
     def get_by_id(db: Session, trade_id: uuid.UUID) -> Optional[Trade]:
         """Obtener trade por ID"""
@@ -115,6 +143,61 @@ class TradeRepository:
         
         return query.limit(limit).all()
 
+# Columnas de trades que escribe bulk_ingest (todas menos el id serial)
+_TRADE_COLUMNS = [column.name for column in Trade.__table__.columns if column.name != 'id']
+
+
+def _trade_rows(trades_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Filas completas (mismas columnas en todas) con los defaults del modelo."""
+    unknown = set().union(*trades_data) - set(_TRADE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown trade columns: {sorted(unknown)}")
+    now = datetime.utcnow()
+    rows = []
+    for data in trades_data:
+        row = {name: data.get(name) for name in _TRADE_COLUMNS}
+        if row['trade_id'] is None:
+            row['trade_id'] = uuid.uuid4()
+        if row['created_at'] is None:
+            row['created_at'] = now
+        if row['updated_at'] is None:
+            row['updated_at'] = now
+        rows.append(row)
+    return rows
+
+
+# NULL explícito: en CSV un campo vacío sin comillas sería NULL y no ''
+_COPY_NULL = '\\N'
+
+
+def _copy_value(value: Any, encode_json) -> Any:
+    if value is None:
+        return _COPY_NULL
+    if isinstance(value, dict):
+        return encode_json(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _copy_rows(cursor, table: str, columns: List[str], rows: List[Dict[str, Any]]) -> None:
+    """COPY FROM STDIN de las filas en CSV (psycopg2 copy_expert o psycopg 3 copy)."""
+    # Un encoder para todo el batch (Decimal/np.float64 -> float)
+    encode_json = json.JSONEncoder(default=float).encode
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow([_copy_value(row[name], encode_json) for name in columns])
+
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')"
+    if hasattr(cursor, 'copy_expert'):
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+    else:
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
 class PatternRepository:
     """Repository para operaciones CRUD de patterns"""
     
@@ -299,6 +382,14 @@ class AgentLogRepository:
         db.add(log)
         db.flush()
         return log
+
+    @staticmethod
+    def bulk_log(db: Session, records: List[Dict[str, Any]]) -> int:
+        """Insertar un lote de logs (executemany, sin ORM por fila)"""
+        if not records:
+            return 0
+        db.execute(AgentLog.__table__.insert(), records)
+        return len(records)
     
     @staticmethod
     def get_by_agent(
@@ -27,10 +27,19 @@ class RiskManager:
         Applies Risk Overlay:
         1. Portfolio Heat: Caps total risk exposure if max_portfolio_risk is set.
         2. DD Scaling: Reduces risk during drawdowns if use_dd_scaling is True.
+
+        Works in the numeric type of config.risk_percentage: Decimal (audit)
+        or float (fast research mode, see simulation.numeric).
         """
         # Auto-cast for robustness
-        current_open_risk = Decimal(str(current_open_risk))
-        current_drawdown_pct = Decimal(str(current_drawdown_pct))
+        if isinstance(self.config.risk_percentage, Decimal):
+            num = Decimal
+            current_open_risk = Decimal(str(current_open_risk))
+            current_drawdown_pct = Decimal(str(current_drawdown_pct))
+        else:
+            num = float
+            current_open_risk = float(current_open_risk)
+            current_drawdown_pct = float(current_drawdown_pct)
 
         if entry_price == stop_loss:
             raise ValueError("Stop Loss cannot be equal to Entry")
@@ -40,7 +49,7 @@ class RiskManager:
         # 1. Drawdown Scaling
         if self.config.use_dd_scaling and current_drawdown_pct > 0:
             # Formula: multiplier = max(0.5, 1.0 - (dd * 2))
-            multiplier = max(Decimal("0.5"), Decimal("1.0") - (current_drawdown_pct * Decimal("2.0")))
+            multiplier = max(num("0.5"), num("1.0") - (current_drawdown_pct * num("2.0")))
             risk_amount *= multiplier
             
         # 2. Portfolio Heat
@@ -49,7 +58,7 @@ class RiskManager:
             available_risk = max_risk_amt - current_open_risk
             
             if available_risk <= 0:
-                return Decimal("0")
+                return num("0")
             
             if risk_amount > available_risk:
                 risk_amount = available_risk
@@ -2,13 +2,16 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import precision_score, recall_score, accuracy_score
 import joblib
 from pathlib import Path
 
+from src.ml.compiled import CompiledForest, compile_forest
 from src.ml.features import FeatureExtractor
+from src.ml.registry import get_registry
 
 class PatternAnalyzer:
     """
@@ -30,11 +33,15 @@ class PatternAnalyzer:
         self._load_model()
 
     def _load_model(self):
+        # Registro del proceso: un solo joblib.load por archivo/versión
+        registry = get_registry()
         if self.model_path.exists():
             try:
-                self.model = joblib.load(self.model_path)
+                cached = self.model_path in registry
+                self.model = registry.get(self.model_path)
                 self.is_trained = True
-                print(f"Modelo cargado desde {self.model_path}")
+                if not cached:
+                    print(f"Modelo cargado desde {self.model_path}")
             except Exception as e:
                 print(f"Error cargando modelo: {e}")
 
@@ -97,7 +104,8 @@ class PatternAnalyzer:
         # Split
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=False)
         
-        # Train
+        # Train (sobre una copia: el modelo cargado es compartido vía registro)
+        self.model = clone(self.model)
         self.model.fit(X_train, y_train)
         self.is_trained = True
         
@@ -116,6 +124,13 @@ class PatternAnalyzer:
         
         return metrics
 
+    @property
+    def compiled(self) -> Optional[CompiledForest]:
+        """Export NumPy del modelo actual (None si no es un RandomForest entrenado)."""
+        if not self.is_trained:
+            return None
+        return compile_forest(self.model)
+
     def predict_proba(self, candle_features: pd.DataFrame) -> float:
         """Predice probabilidad de WIN para el estado actual del mercado."""
         if not self.is_trained:
@@ -131,8 +146,35 @@ class PatternAnalyzer:
             
             # Solo tomamos la última fila
             last_row = X.iloc[[-1]] 
+            forest = self.compiled
+            if forest is not None:
+                # Árboles en NumPy: sin la validación por llamada de sklearn
+                return forest.predict_proba_one(last_row)
             prob = self.model.predict_proba(last_row)[0][1] # Probabilidad de clase 1 (WIN)
             return prob
         except Exception as e:
             print(f"Error predicción: {e}")
             return 0.5
+
+    def predict_proba_batch(self, features: pd.DataFrame) -> np.ndarray:
+        """
+        Probabilidad de WIN de cada fila de `features` en una sola llamada.
+
+        Fila a fila coincide con predict_proba(features.iloc[[i]]); pensado para
+        puntuar todo un features_map antes del backtest.
+        """
+        n = len(features)
+        if not self.is_trained:
+            return np.full(n, 0.5)
+        if n == 0:
+            return np.empty(0)
+        try:
+            X = features.select_dtypes(include=[np.number])
+            forest = self.compiled
+            if forest is not None:
+                column = int(np.flatnonzero(forest.classes == 1)[0])
+                return forest.predict_proba(X)[:, column]
+            return self.model.predict_proba(X)[:, 1]
+        except Exception as e:
+            print(f"Error predicción: {e}")
+            return np.full(n, 0.5)
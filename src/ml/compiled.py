@@ -0,0 +1,154 @@
+# src/ml/compiled.py
+import weakref
+from typing import Any, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+Rows = Union[np.ndarray, pd.DataFrame, Mapping[str, float], Sequence[float]]
+
+
+class CompiledForest:
+    """
+    RandomForestClassifier exportado a arrays planos de NumPy.
+
+    Todos los árboles se concatenan en un solo array de nodos (feature,
+    threshold, hijos, probas de hoja) y se recorren a la vez con operaciones
+    vectorizadas, sin validación de sklearn ni DataFrames de por medio.
+    Devuelve las mismas probabilidades que model.predict_proba:
+      - X se pasa a float32 antes de comparar (como sklearn).
+      - NaN sigue missing_go_to_left de cada nodo.
+      - Las probas de los árboles se acumulan en orden y se dividen por n_trees.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        missing_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        classes: np.ndarray,
+        feature_names: Optional[Sequence[str]] = None,
+        n_features: Optional[int] = None
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes = classes
+        self.feature_names = tuple(feature_names) if feature_names is not None else None
+        self.n_features = n_features if n_features is not None else len(self.feature_names or ())
+
+    @classmethod
+    def from_sklearn(cls, model: RandomForestClassifier) -> 'CompiledForest':
+        """Exporta un RandomForestClassifier ya entrenado (binario o multiclase)."""
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            # Hojas apuntan a sí mismas: el recorrido se queda quieto al llegar
+            own = np.arange(offset, offset + n)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            missing.append(np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(n)), dtype=bool))
+            # sklearn normaliza las cuentas de cada hoja (como DecisionTreeClassifier.predict_proba)
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0.0] = 1.0
+            values.append(value / totals)
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        feature_names = getattr(model, 'feature_names_in_', None)
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(model.classes_),
+            feature_names=list(feature_names) if feature_names is not None else None,
+            n_features=model.n_features_in_
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def to_matrix(self, rows: Rows) -> np.ndarray:
+        """
+        Matriz (n, n_features) float32 en el orden de columnas del entrenamiento.
+        Acepta DataFrame/dict (por nombre si el modelo los guardó), vector o matriz.
+        """
+        if isinstance(rows, pd.DataFrame):
+            if self.feature_names is not None:
+                rows = rows.loc[:, list(self.feature_names)]
+            else:
+                rows = rows.select_dtypes(include=[np.number])
+            X = rows.to_numpy(dtype=np.float32)
+        elif isinstance(rows, Mapping):
+            if self.feature_names is None:
+                raise ValueError("Model has no stored feature names; pass a vector")
+            X = np.array([[rows[name] for name in self.feature_names]], dtype=np.float32)
+        else:
+            X = np.asarray(rows, dtype=np.float32)
+            if X.ndim == 1:
+                X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {X.shape}")
+        return X
+
+    def predict_proba(self, rows: Rows) -> np.ndarray:
+        """Probabilidades (n, n_classes), idénticas a RandomForestClassifier.predict_proba."""
+        X = self.to_matrix(rows)
+        n = len(X)
+        # nodes[t, i]: nodo actual del árbol t para la fila i
+        nodes = np.repeat(self.roots[:, None], n, axis=1)
+        row_idx = np.broadcast_to(np.arange(n), nodes.shape)
+        for _ in range(self.max_depth):
+            x = X[row_idx, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.missing_left[nodes], x <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        # Suma sobre el eje de árboles en orden (misma acumulación que sklearn)
+        proba = self.value[nodes].sum(axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict_proba_one(self, row: Rows, cls: Any = 1) -> float:
+        """Probabilidad de la clase `cls` para una sola fila (por defecto WIN = 1)."""
+        column = int(np.flatnonzero(self.classes == cls)[0])
+        return float(self.predict_proba(row)[0, column])
+
+
+# Un export por modelo (los analizadores comparten modelo vía registro)
+_compiled: 'weakref.WeakKeyDictionary[Any, tuple]' = weakref.WeakKeyDictionary()
+
+
+def compile_forest(model: Any) -> Optional[CompiledForest]:
+    """CompiledForest para un RandomForestClassifier entrenado; None para cualquier otro modelo."""
+    if not (isinstance(model, RandomForestClassifier) and hasattr(model, 'estimators_')):
+        return None
+    entry = _compiled.get(model)
+    # Un nuevo fit reemplaza estimators_: el export viejo deja de valer
+    if entry is None or entry[0] is not model.estimators_:
+        entry = (model.estimators_, CompiledForest.from_sklearn(model))
+        _compiled[model] = entry
+    return entry[1]
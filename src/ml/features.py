@@ -1,17 +1,41 @@
 # src/ml/features.py
+import math
+from collections import deque
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
+from src.core.indicator_graph import IndicatorGraph
+
+# Orden de columnas de add_all_features (y de FeatureStream)
+FEATURE_COLUMNS = (
+    'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'ema_9', 'ema_20', 'ema_50', 'ema_200', 'trend_short', 'trend_medium', 'trend_long', 'dist_ema_200',
+    'rsi_14', 'macd', 'macd_signal', 'macd_hist',
+    'atr_14', 'bb_upper', 'bb_lower', 'bb_width', 'bb_pos',
+    'vol_sma_20', 'vol_ratio', 'obv',
+    'body_size', 'upper_wick', 'lower_wick', 'total_range', 'body_ratio', 'log_ret'
+)
+_INT_COLUMNS = ('trend_short', 'trend_medium', 'trend_long')
 
 class FeatureExtractor:
     """
     Motor de ingeniería de características para ML en trading.
     Calcula indicadores técnicos y métricas de price action vectorizadas.
     """
+
+    # Nodos del grafo de indicadores (src.core.indicator_graph) que usa
+    INDICATORS = (
+        'ema_9', 'ema_20', 'ema_50', 'ema_200', 'rsi_sma_14', 'macd', 'macd_signal',
+        'atr_sma_14', 'sma_20', 'std_20', 'vol_sma_20', 'obv'
+    )
     
     def __init__(self, include_patterns: bool = True):
         self.include_patterns = include_patterns
 
+    def stream(self) -> 'FeatureStream':
+        """Modo incremental: una fila de features por vela en O(1)."""
+        return FeatureStream()
+
     def add_all_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Aplica todos los indicadores técnicos y características al DataFrame.
@@ -30,18 +54,21 @@ class FeatureExtractor:
         # Conversión a tipos numéricos por si acaso
         for col in required:
             df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        # Un solo grafo: cada indicador se calcula una vez para todos los grupos
+        graph = IndicatorGraph.from_frame(df)
             
         # 1. Indicadores de Tendencia
-        df = self.add_trend_features(df)
+        df = self.add_trend_features(df, graph)
         
         # 2. Indicadores de Momento
-        df = self.add_momentum_features(df)
+        df = self.add_momentum_features(df, graph)
         
         # 3. Indicadores de Volatilidad
-        df = self.add_volatility_features(df)
+        df = self.add_volatility_features(df, graph)
         
         # 4. Indicadores de Volumen
-        df = self.add_volume_features(df)
+        df = self.add_volume_features(df, graph)
         
         # 5. Price Action Features
         df = self.add_price_action_features(df)
@@ -51,13 +78,14 @@ class FeatureExtractor:
         
         return df
 
-    def add_trend_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_trend_features(self, df: pd.DataFrame, graph: Optional[IndicatorGraph] = None) -> pd.DataFrame:
         """EMAs, SMAs, Distancia a medias."""
+        graph = graph or IndicatorGraph.from_frame(df)
         # EMAs
-        df['ema_9'] = df['close'].ewm(span=9, adjust=False).mean()
-        df['ema_20'] = df['close'].ewm(span=20, adjust=False).mean()
-        df['ema_50'] = df['close'].ewm(span=50, adjust=False).mean()
-        df['ema_200'] = df['close'].ewm(span=200, adjust=False).mean()
+        df['ema_9'] = graph.get('ema_9')
+        df['ema_20'] = graph.get('ema_20')
+        df['ema_50'] = graph.get('ema_50')
+        df['ema_200'] = graph.get('ema_200')
         
         # Tendencia basada en cruces relativos
         df['trend_short'] = np.where(df['ema_9'] > df['ema_20'], 1, -1)
@@ -69,38 +97,28 @@ class FeatureExtractor:
         
         return df
 
-    def add_momentum_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_momentum_features(self, df: pd.DataFrame, graph: Optional[IndicatorGraph] = None) -> pd.DataFrame:
         """RSI, MACD."""
-        # RSI 14
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi_14'] = 100 - (100 / (1 + rs))
-        df['rsi_14'] = df['rsi_14'].fillna(50) # Fill inicial
+        graph = graph or IndicatorGraph.from_frame(df)
+        # RSI 14 (medias simples de ganancias/pérdidas, 50 en el warm-up)
+        df['rsi_14'] = graph.get('rsi_sma_14')
         
         # MACD (12, 26, 9)
-        ema_12 = df['close'].ewm(span=12, adjust=False).mean()
-        ema_26 = df['close'].ewm(span=26, adjust=False).mean()
-        df['macd'] = ema_12 - ema_26
-        df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
+        df['macd'] = graph.get('macd')
+        df['macd_signal'] = graph.get('macd_signal')
         df['macd_hist'] = df['macd'] - df['macd_signal']
         
         return df
 
-    def add_volatility_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_volatility_features(self, df: pd.DataFrame, graph: Optional[IndicatorGraph] = None) -> pd.DataFrame:
         """ATR, Bollinger Bands."""
-        # ATR 14
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        df['atr_14'] = true_range.rolling(window=14).mean()
+        graph = graph or IndicatorGraph.from_frame(df)
+        # ATR 14 (media simple del true range)
+        df['atr_14'] = graph.get('atr_sma_14')
         
         # Bollinger Bands 20, 2
-        sma_20 = df['close'].rolling(window=20).mean()
-        std_20 = df['close'].rolling(window=20).std()
+        sma_20 = graph.get('sma_20')
+        std_20 = graph.get('std_20')
         df['bb_upper'] = sma_20 + (std_20 * 2)
         df['bb_lower'] = sma_20 - (std_20 * 2)
         df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / sma_20
@@ -110,14 +128,15 @@ class FeatureExtractor:
         
         return df
 
-    def add_volume_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_volume_features(self, df: pd.DataFrame, graph: Optional[IndicatorGraph] = None) -> pd.DataFrame:
         """Volume Ratio, OBV."""
+        graph = graph or IndicatorGraph.from_frame(df)
         # Volume SMA
-        df['vol_sma_20'] = df['volume'].rolling(window=20).mean()
+        df['vol_sma_20'] = graph.get('vol_sma_20')
         df['vol_ratio'] = df['volume'] / df['vol_sma_20'] # >1 significa volumen alto
         
         # OBV (On-Balance Volume)
-        df['obv'] = (np.sign(df['close'].diff()) * df['volume']).fillna(0).cumsum()
+        df['obv'] = graph.get('obv')
         
         return df
 
@@ -136,3 +155,225 @@ class FeatureExtractor:
         df['log_ret'] = np.log(df['close'] / df['close'].shift(1))
         
         return df
+
+
+def _div(a: float, b: float) -> float:
+    """División con semántica IEEE (como pandas): x/0 -> ±inf, 0/0 -> NaN."""
+    if b == 0:
+        if a == 0 or math.isnan(a):
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class _Ewm:
+    """ewm(span, adjust=False).mean() con la misma recurrencia que pandas."""
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            old_wt = 1.0 - self.alpha
+            self.value = (old_wt * self.value + self.alpha * x) / (old_wt + self.alpha)
+        return self.value
+
+
+class _Window:
+    """
+    Ventana rodante de tamaño fijo (media y std ddof=1 con sumas fsum).
+
+    Misma aritmética que los nodos sma_20/std_20/... del grafo de indicadores.
+    """
+    __slots__ = ('size', 'values')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: deque = deque(maxlen=size)
+
+    def push(self, x: float) -> None:
+        self.values.append(x)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def mean(self) -> float:
+        return math.fsum(self.values) / self.size if self.full else math.nan
+
+    def std(self) -> float:
+        if not self.full:
+            return math.nan
+        mean = math.fsum(self.values) / self.size
+        return math.sqrt(math.fsum((x - mean) ** 2 for x in self.values) / (self.size - 1))
+
+
+class FeatureStream:
+    """
+    Versión incremental de FeatureExtractor.add_all_features.
+
+    Mantiene el estado rodante (EMAs, ventanas de 14/20, OBV, cierre previo)
+    y produce la fila de features de cada vela nueva en O(1). Las filas son
+    las mismas que el batch bit a bit (mismas columnas, orden y aritmética).
+    `last_valid` replica el dropna() del batch: última fila sin NaN.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._emas = {span: _Ewm(span) for span in (9, 20, 50, 200, 12, 26)}
+        self._macd_signal = _Ewm(9)
+        self._gain = _Window(14)
+        self._loss = _Window(14)
+        self._tr = _Window(14)
+        self._close = _Window(20)
+        self._volume = _Window(20)
+        self._obv = 0.0
+        self._prev_close: Optional[float] = None
+        self.last_row: Optional[Dict[str, float]] = None
+        self.last_valid: Optional[Dict[str, float]] = None
+
+    def update(self, timestamp: Any, open_: float, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        prev = self._prev_close
+        row: Dict[str, Any] = {
+            'timestamp': timestamp, 'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume
+        }
+
+        # Tendencia
+        ema = {span: self._emas[span].update(close) for span in self._emas}
+        row['ema_9'], row['ema_20'], row['ema_50'], row['ema_200'] = ema[9], ema[20], ema[50], ema[200]
+        row['trend_short'] = 1 if ema[9] > ema[20] else -1
+        row['trend_medium'] = 1 if ema[20] > ema[50] else -1
+        row['trend_long'] = 1 if ema[50] > ema[200] else -1
+        row['dist_ema_200'] = (close - ema[200]) / ema[200] * 100
+
+        # Momento (el primer delta es NaN -> gain/loss 0, como where() en batch)
+        delta = close - prev if prev is not None else math.nan
+        self._gain.push(delta if delta > 0 else 0.0)
+        self._loss.push(-delta if delta < 0 else 0.0)
+        rs = _div(self._gain.mean(), self._loss.mean())
+        rsi = 100 - (100 / (1 + rs))
+        row['rsi_14'] = 50.0 if math.isnan(rsi) else rsi
+        macd = ema[12] - ema[26]
+        row['macd'] = macd
+        row['macd_signal'] = self._macd_signal.update(macd)
+        row['macd_hist'] = macd - row['macd_signal']
+
+        # Volatilidad
+        if prev is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - prev), abs(low - prev))
+        self._tr.push(true_range)
+        row['atr_14'] = self._tr.mean()
+        self._close.push(close)
+        sma_20 = self._close.mean()
+        std_20 = self._close.std()
+        row['bb_upper'] = sma_20 + (std_20 * 2)
+        row['bb_lower'] = sma_20 - (std_20 * 2)
+        row['bb_width'] = (row['bb_upper'] - row['bb_lower']) / sma_20
+        row['bb_pos'] = _div(close - row['bb_lower'], row['bb_upper'] - row['bb_lower'])
+
+        # Volumen
+        self._volume.push(volume)
+        row['vol_sma_20'] = self._volume.mean()
+        row['vol_ratio'] = _div(volume, row['vol_sma_20'])
+        if prev is not None:
+            self._obv += float(np.sign(close - prev)) * volume
+        row['obv'] = self._obv
+
+        # Price action
+        row['body_size'] = abs(close - open_)
+        row['upper_wick'] = high - max(close, open_)
+        row['lower_wick'] = min(close, open_) - low
+        row['total_range'] = high - low
+        row['body_ratio'] = row['body_size'] / row['total_range'] if row['total_range'] > 0 else 0.0
+        row['log_ret'] = float(np.log(close / prev)) if prev is not None else math.nan
+
+        self._prev_close = close
+        self.count += 1
+        self.last_row = row
+        if not any(isinstance(v, float) and math.isnan(v) for v in row.values()):
+            self.last_valid = row
+        return row
+
+    def last_valid_frame(self) -> pd.DataFrame:
+        """Última fila válida como DataFrame de una fila (vacío si aún no hay)."""
+        if self.last_valid is None:
+            return pd.DataFrame(columns=list(FEATURE_COLUMNS))
+        return rows_to_frame([self.last_valid])
+
+
+def rows_to_frame(rows: List[Dict[str, float]]) -> pd.DataFrame:
+    """Filas de FeatureStream como DataFrame con los dtypes de add_all_features."""
+    frame = pd.DataFrame(rows, columns=list(FEATURE_COLUMNS))
+    return frame.astype({name: np.int64 for name in _INT_COLUMNS})
+
+
+class FeatureTable:
+    """
+    features_map (indexado por datetime) densificado por posición de vela.
+
+    values[i] es la fila de features de la vela i (NaN si no tiene, p.ej. las
+    velas de warm-up que dropna() elimina), así el backtest direcciona por
+    índice entero en vez de pd.to_datetime + .loc por trade.
+    """
+
+    def __init__(self, columns: Sequence[str], values: np.ndarray, rows: np.ndarray,
+                 last_rows: np.ndarray, int_columns: Sequence[str] = ()):
+        self.columns = tuple(columns)
+        self.values = values
+        # Posición en el features_map de origen (-1 = sin fila); first/last ante duplicados
+        self.rows = rows
+        self.last_rows = last_rows
+        self._int_idx = [self.columns.index(name) for name in int_columns]
+        has_row = rows >= 0
+        # Las features solo faltan en el warm-up inicial: basta comparar con el offset
+        self.warmup = int(np.argmax(has_row)) if has_row.any() else len(rows)
+        self._contiguous = bool(has_row[self.warmup:].all())
+        self._has_row = has_row
+
+    @classmethod
+    def from_frame(cls, features_map: pd.DataFrame, timestamps: np.ndarray) -> 'FeatureTable':
+        """Alinea features_map a `timestamps` (ms, ordenados como las velas)."""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        numeric = features_map.select_dtypes(include=[np.number, bool])
+        int_columns = [c for c in numeric.columns if pd.api.types.is_integer_dtype(numeric[c])]
+
+        rows = np.full(len(timestamps), -1, dtype=np.intp)
+        last_rows = rows.copy()
+        if len(features_map):
+            keys = pd.DatetimeIndex(features_map.index).as_unit('ms').asi8
+            # Orden estable: los duplicados conservan su orden original
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+            first = np.searchsorted(keys, timestamps, side='left')
+            found = first < len(keys)
+            found[found] = keys[first[found]] == timestamps[found]
+            rows[found] = order[first[found]]
+            last = np.searchsorted(keys, timestamps, side='right') - 1
+            last_rows[found] = order[last[found]]
+
+        source = numeric.to_numpy(dtype=np.float64)
+        values = np.full((len(timestamps), source.shape[1]), np.nan)
+        has_row = rows >= 0
+        values[has_row] = source[rows[has_row]]
+        return cls(numeric.columns, values, rows, last_rows, int_columns)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def has_row(self, i: int) -> bool:
+        if self._contiguous:
+            return i >= self.warmup
+        return bool(self._has_row[i])
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Fila de la vela i como dict de tipos Python (market_state de un trade)."""
+        values = self.values[i].tolist()
+        for j in self._int_idx:
+            values[j] = int(values[j])
+        return dict(zip(self.columns, values))
@@ -0,0 +1,73 @@
+# src/ml/registry.py
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import joblib
+
+ModelVersion = Tuple[int, int]
+
+
+class ModelRegistry:
+    """
+    Registro de modelos entrenados compartido por todo el proceso.
+
+    Cada archivo se carga una sola vez y se reutiliza mientras su versión
+    (mtime, tamaño) no cambie; si el archivo se reescribe (p.ej. tras
+    PatternAnalyzer.train) la siguiente consulta lo recarga.
+
+    Los modelos devueltos son compartidos: se tratan como solo-lectura
+    (predict/predict_proba). Quien quiera entrenar debe ajustar una copia.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Tuple[ModelVersion, Any]] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    @staticmethod
+    def _version(path: Path) -> Optional[ModelVersion]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: Union[str, Path]) -> Optional[Any]:
+        """Modelo del archivo `path` (None si no existe). Errores de carga se propagan."""
+        path = Path(path)
+        version = self._version(path)
+        if version is None:
+            return None
+        key = str(path.resolve())
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            model = joblib.load(path)
+            self._models[key] = (version, model)
+            self.loads += 1
+            return model
+
+    def __contains__(self, path: Union[str, Path]) -> bool:
+        entry = self._models.get(str(Path(path).resolve()))
+        return entry is not None and entry[0] == self._version(Path(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+# Instancia del proceso (los workers de un pool con fork la heredan ya cargada)
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
+
+
+def load_model(path: Union[str, Path]) -> Optional[Any]:
+    """Atajo a get_registry().get(path)."""
+    return _registry.get(path)
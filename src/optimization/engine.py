@@ -5,7 +5,7 @@ import itertools
 import time
 import concurrent.futures
 from decimal import Decimal
-from typing import List, Iterator, Dict, Any
+from typing import List, Iterator, Dict, Any, Optional, Sequence
 from pathlib import Path
 from tqdm import tqdm
 
@@ -13,6 +13,8 @@ from .types import OptimizerConfig, TestConfig, BacktestResult
 from core.timeframe import Timeframe
 from core.market import MarketState
 from utils.data_loader import load_binance_csv
+from utils.candle_store import CandleStore, DEFAULT_STORE_ROOT
+from utils.shared_dataset import SharedDataset, SharedDatasetHandle, attach
 from simulation.backtest import Backtester
 from strategy.engine import TJRStrategy
 from execution.executor import TradeExecutor
@@ -113,37 +115,100 @@ class OptimizerEngine:
         # We need to pass the Data Path to the worker so it can find files
         data_path = self.config.data_path
         
-        with concurrent.futures.ProcessPoolExecutor() as executor:
-            # We process in batches to save checkpoints periodically
-            for i in range(0, len(pending_configs), batch_size):
-                batch = pending_configs[i : i + batch_size]
-                futures = {
-                    executor.submit(execute_worker, config, data_path, self.config.initial_balance, self.config.risk_percent): config 
-                    for config in batch
-                }
-                
-                results_batch = []
-                for future in tqdm(concurrent.futures.as_completed(futures), total=len(batch), desc=f"Batch {i//batch_size + 1}"):
-                    try:
-                        res = future.result()
-                        results_batch.append(res)
-                    except Exception as e:
-                        print(f"Worker Error: {e}")
-                
-                self.save_checkpoint(results_batch)
+        # Load each pair/timeframe once; workers attach to the shared block by name
+        datasets = self.publish_datasets(pending_configs)
+        
+        try:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                # We process in batches to save checkpoints periodically
+                for i in range(0, len(pending_configs), batch_size):
+                    batch = pending_configs[i : i + batch_size]
+                    futures = {
+                        executor.submit(
+                            execute_worker, config, data_path, self.config.initial_balance, self.config.risk_percent,
+                            self.config.store_path, self._dataset_handle(datasets, config)
+                        ): config 
+                        for config in batch
+                    }
+                    
+                    results_batch = []
+                    for future in tqdm(concurrent.futures.as_completed(futures), total=len(batch), desc=f"Batch {i//batch_size + 1}"):
+                        try:
+                            res = future.result()
+                            results_batch.append(res)
+                        except Exception as e:
+                            print(f"Worker Error: {e}")
+                    
+                    self.save_checkpoint(results_batch)
+        finally:
+            for dataset in datasets.values():
+                dataset.close()
+
+    def publish_datasets(self, configs: List[TestConfig]) -> Dict[tuple, SharedDataset]:
+        """Publishes the candles of every (pair, timeframe) in shared memory, once."""
+        datasets = {}
+        for config in configs:
+            key = (config.pair, config.timeframe)
+            if key in datasets:
+                continue
+            candles = load_candles(config.pair, config.timeframe, self.config.data_path, self.config.store_path)
+            if candles:
+                tf_enum = TIMEFRAME_MAP.get(config.timeframe, Timeframe.M5)
+                datasets[key] = SharedDataset.publish(candles, tf_enum.value)
+        return datasets
+
+    @staticmethod
+    def _dataset_handle(datasets: Dict[tuple, SharedDataset], config: TestConfig) -> Optional[SharedDatasetHandle]:
+        dataset = datasets.get((config.pair, config.timeframe))
+        return dataset.handle if dataset else None
+
+# Map string timeframe to Enum
+TIMEFRAME_MAP = {
+    "5m": Timeframe.M5,
+    "15m": Timeframe.M15,
+    "1h": Timeframe.H1,
+    "4h": Timeframe.H4
+}
+
+def load_candles(pair: str, timeframe: str, data_path: str, store_path: str = DEFAULT_STORE_ROOT) -> Sequence:
+    """All candles of a pair/timeframe: columnar store first, CSVs as fallback."""
+    # Glob for all files matching Pair + Timeframe
+    # Convention: {pair}-{timeframe}-*.csv
+    # E.g. BTCUSDT-5m-2024-01.csv
+    tf_enum = TIMEFRAME_MAP.get(timeframe, Timeframe.M5)
+    store = CandleStore(store_path)
+    if store.months(pair, timeframe):
+        # Memory-mapped columns: publish_datasets copies them as-is, candles are built on iteration
+        return store.load(pair, tf_enum)
+    
+    all_candles = []
+    pattern = os.path.join(data_path, f"{pair}-{timeframe}-*.csv")
+    for f in sorted(glob.glob(pattern)):
+        month_candles = load_binance_csv(f, tf_enum)
+        all_candles.extend(month_candles)
+    return all_candles
 
 # Static Worker Function (Must be outside class for multiprocessing pickle)
-def execute_worker(config: TestConfig, data_path: str, initial_balance: Decimal, risk_percent: Decimal) -> BacktestResult:
+def execute_worker(
+    config: TestConfig,
+    data_path: str,
+    initial_balance: Decimal,
+    risk_percent: Decimal,
+    store_path: str = DEFAULT_STORE_ROOT,
+    dataset: Optional[SharedDatasetHandle] = None
+) -> BacktestResult:
     start_time = time.time()
     
     # 1. Load Data
-    # Glob for all files matching Pair + Timeframe
-    # Convention: {pair}-{timeframe}-*.csv
-    # E.g. BTCUSDT-5m-2024-01.csv
-    pattern = os.path.join(data_path, f"{config.pair}-{config.timeframe}-*.csv")
-    files = sorted(glob.glob(pattern))
+    # Shared dataset published by OptimizerEngine.run (no reparse per config)
+    tf_enum = TIMEFRAME_MAP.get(config.timeframe, Timeframe.M5) # Default/Fallback
+    if dataset is not None:
+        # Candles with this module's Timeframe: MarketState compares against core.timeframe
+        all_candles = attach(dataset, tf_enum).candles()
+    else:
+        all_candles = load_candles(config.pair, config.timeframe, data_path, store_path)
     
-    if not files:
+    if not all_candles:
         # Fallback or Error
         # Return empty result
         return BacktestResult(
@@ -151,20 +216,6 @@ def execute_worker(config: TestConfig, data_path: str, initial_balance: Decimal,
             0, 0, 0, 0.0, Decimal(0), Decimal(0), Decimal(0), Decimal(0), Decimal(0), 0.0
         )
         
-    # Map string timeframe to Enum
-    tf_map = {
-        "5m": Timeframe.M5,
-        "15m": Timeframe.M15,
-        "1h": Timeframe.H1,
-        "4h": Timeframe.H4
-    }
-    tf_enum = tf_map.get(config.timeframe, Timeframe.M5) # Default/Fallback
-    
-    all_candles = []
-    for f in files:
-        month_candles = load_binance_csv(f, tf_enum)
-        all_candles.extend(month_candles)
-        
     # 2. Setup System
     broker = InMemoryBroker(balance=initial_balance, fee_rate=config.fee_rate) # Need to ensure InMemoryBroker accepts fee_rate constructor? It usually has fixed fee.
     # Wait, InMemoryBroker currently has fixed fee 0.1%. Need to update it?
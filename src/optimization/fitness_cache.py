@@ -0,0 +1,130 @@
+"""
+Cache de fitness para individuos del GA.
+
+Clave = params canonicalizados + fingerprint de la ventana de datos + versión
+del código. En memoria durante el run y, opcionalmente, persistida en un
+JSONL append-only para que re-runs / sesiones WFO reanudadas no repitan
+candidatos ya evaluados.
+"""
+import hashlib
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def canonical_params(params: Dict[str, Any]) -> str:
+    """Representación estable de un set de params (orden y tipo numérico normalizados)."""
+    normalized = {}
+    for name, value in params.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            normalized[name] = value
+        else:
+            # 2 y 2.0 (int vs float tras project_constraints) son el mismo candidato
+            normalized[name] = float(value)
+    return json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+
+
+@lru_cache(maxsize=None)
+def current_code_version() -> str:
+    """Hash del código fuente en src/ (cambia si cambia cualquier módulo)."""
+    root = Path(__file__).resolve().parents[1]
+    h = hashlib.blake2b(digest_size=8)
+    for path in sorted(root.rglob('*.py')):
+        h.update(str(path.relative_to(root)).encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+class FitnessCache:
+    """
+    Memo de fitness por (params, ventana de datos, versión de código).
+
+    Args:
+        data_fingerprint: Identifica la ventana (p.ej. candles_fingerprint).
+        code_version: Default: hash de src/. Pasar otro valor si la fitness
+            depende de código fuera de src/.
+        path: JSONL opcional; se carga al crear el cache y cada entrada
+            nueva se añade en flush().
+    """
+
+    def __init__(
+        self,
+        data_fingerprint: str,
+        code_version: Optional[str] = None,
+        path: Optional[str] = None
+    ):
+        self.data_fingerprint = data_fingerprint
+        self.code_version = code_version if code_version is not None else current_code_version()
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, float] = {}
+        self._pending: List[str] = []
+        if self.path and self.path.exists():
+            self._load()
+
+    def key(self, params: Dict[str, Any]) -> str:
+        raw = f"{self.code_version}|{self.data_fingerprint}|{canonical_params(params)}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get(self, params: Dict[str, Any]) -> Optional[float]:
+        """Fitness cacheado o None (cuenta hit/miss)."""
+        fitness = self._entries.get(self.key(params))
+        if fitness is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return fitness
+
+    def put(self, params: Dict[str, Any], fitness: float) -> None:
+        key = self.key(params)
+        if key not in self._entries:
+            self._pending.append(key)
+        self._entries[key] = fitness
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, params: Dict[str, Any]) -> bool:
+        return self.key(params) in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._entries)
+        }
+
+    def flush(self) -> None:
+        """Añade al JSONL las entradas nuevas desde el último flush."""
+        if not self.path or not self._pending:
+            self._pending = []
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            for key in self._pending:
+                f.write(json.dumps({'key': key, 'fitness': _encode(self._entries[key])}) + "\n")
+        self._pending = []
+
+    def _load(self) -> None:
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry['key']] = _decode(entry['fitness'])
+                except (ValueError, KeyError, TypeError):
+                    # Línea truncada (p.ej. run interrumpido): se ignora
+                    continue
+
+
+def _encode(fitness: float) -> Any:
+    # JSON estricto no tiene inf/nan; -inf es un fitness habitual (0 trades)
+    return fitness if math.isfinite(fitness) else repr(fitness)
+
+
+def _decode(value: Any) -> float:
+    return float(value)
@@ -9,6 +9,8 @@ import copy
 import math
 from src.optimization.param_space import ParamSpace, ParamType
 from src.optimization.constraints import project_constraints
+from src.optimization.parallel import PopulationEvaluator
+from src.optimization.fitness_cache import FitnessCache
 
 
 @dataclass
@@ -215,17 +217,28 @@ class GeneticAlgorithm:
         self,
         param_space: ParamSpace,
         config: GAConfig,
-        fitness_function: Callable[[Dict[str, Any]], float]
+        fitness_function: Optional[Callable[[Dict[str, Any]], float]],
+        evaluator: Optional[PopulationEvaluator] = None,
+        fitness_cache: Optional[FitnessCache] = None
     ):
         """
         Args:
             param_space: Espacio de parámetros
             config: Configuración del GA
             fitness_function: Función que dado params retorna fitness
+            evaluator: Evaluador de generaciones completas (p.ej.
+                ProcessPoolEvaluator). Si es None, se evalúa en serie con
+                fitness_function.
+            fitness_cache: Memo de fitness (params + ventana + versión de
+                código). Los individuos ya evaluados no se re-ejecutan.
         """
+        if fitness_function is None and evaluator is None:
+            raise ValueError("GeneticAlgorithm needs a fitness_function or an evaluator")
         self.param_space = param_space
         self.config = config
         self.fitness_function = fitness_function
+        self.evaluator = evaluator
+        self.fitness_cache = fitness_cache
         
         if config.seed is not None:
             random.seed(config.seed)
@@ -241,6 +254,74 @@ class GeneticAlgorithm:
         # para asegurar consistencia si la función es estocástica (usualmente no)
         fitness = self.fitness_function(individual.params)
         individual.fitness = fitness
+
+    def evaluate_population(self, individuals: List[Individual], generation: int = 0) -> int:
+        """
+        Evalúa una lista de individuos (in-place), en serie o con el evaluator.
+
+        El evaluator devuelve los fitness en el orden de la lista, así que la
+        asignación es determinista aunque las tareas terminen desordenadas.
+        Con fitness_cache, los params ya vistos (o repetidos dentro de la
+        misma generación) se resuelven sin re-evaluar.
+
+        Returns:
+            Número de evaluaciones reales (individuos no resueltos por cache).
+        """
+        cache = self.fitness_cache
+        pending = individuals
+        duplicates: Dict[str, List[Individual]] = {}
+        if cache is not None:
+            pending = []
+            for ind in individuals:
+                key = cache.key(ind.params)
+                if key in duplicates:
+                    # Repetido en esta generación: reutiliza la evaluación pendiente
+                    duplicates[key].append(ind)
+                    cache.hits += 1
+                    continue
+                cached = cache.get(ind.params)
+                if cached is not None:
+                    ind.fitness = cached
+                    continue
+                duplicates[key] = []
+                pending.append(ind)
+
+        if self.evaluator is None:
+            for ind in pending:
+                self.evaluate_individual(ind)
+        else:
+            # Posición en la población completa: seed estable aunque haya hits
+            positions = {id(ind): i for i, ind in enumerate(individuals)}
+            fitnesses = self.evaluator.evaluate(
+                [ind.params for ind in pending],
+                generation,
+                indices=[positions[id(ind)] for ind in pending]
+            )
+            for ind, fitness in zip(pending, fitnesses):
+                ind.fitness = fitness
+
+        if cache is not None:
+            for ind in pending:
+                cache.put(ind.params, ind.fitness)
+                for twin in duplicates[cache.key(ind.params)]:
+                    twin.fitness = ind.fitness
+            cache.flush()
+
+        return len(pending)
+
+    def _cache_stats(self, before: Tuple[int, int]) -> Dict[str, int]:
+        """Hits/misses del cache desde el snapshot `before` (para history)."""
+        if self.fitness_cache is None:
+            return {}
+        return {
+            "cache_hits": self.fitness_cache.hits - before[0],
+            "cache_misses": self.fitness_cache.misses - before[1]
+        }
+
+    def _cache_snapshot(self) -> Tuple[int, int]:
+        if self.fitness_cache is None:
+            return (0, 0)
+        return (self.fitness_cache.hits, self.fitness_cache.misses)
     
     def optimize(self) -> Tuple[Individual, List[Dict]]:
         """
@@ -256,7 +337,10 @@ class GeneticAlgorithm:
                     "gen": int,
                     "best_fitness": float,
                     "avg_fitness": float,
-                    "evaluations": int
+                    "evaluations": int,
+                    # solo con fitness_cache:
+                    "cache_hits": int,
+                    "cache_misses": int
                 }
         """
         history = []
@@ -269,10 +353,8 @@ class GeneticAlgorithm:
         )
         
         # 2. Evaluar población inicial
-        for ind in population:
-            self.evaluate_individual(ind)
-            
-        evaluations_count = len(population)
+        snapshot = self._cache_snapshot()
+        evaluations_count = self.evaluate_population(population, generation=0)
         
         # Stats Gen 0
         current_best = max(population, key=lambda ind: ind.fitness if ind.fitness is not None else float('-inf'))
@@ -285,7 +367,8 @@ class GeneticAlgorithm:
             "gen": 0,
             "best_fitness": current_best.fitness,
             "avg_fitness": avg_fitness,
-            "evaluations": evaluations_count
+            "evaluations": evaluations_count,
+            **self._cache_stats(snapshot)
         })
         
         best_str = f"{current_best.fitness:.4f}" if math.isfinite(current_best.fitness) else "-inf"
@@ -334,9 +417,8 @@ class GeneticAlgorithm:
                 offspring.append(child)
             
             # E) Evaluar Offspring
-            for child in offspring:
-                self.evaluate_individual(child)
-                evaluations_count += 1
+            snapshot = self._cache_snapshot()
+            evaluations_count += self.evaluate_population(offspring, generation=gen)
                 
             # F) Nueva población
             population = elites + offspring
@@ -350,7 +432,8 @@ class GeneticAlgorithm:
                 "gen": gen,
                 "best_fitness": current_best.fitness,
                 "avg_fitness": avg_fitness,
-                "evaluations": evaluations_count
+                "evaluations": evaluations_count,
+                **self._cache_stats(snapshot)
             })
             
             best_str = f"{current_best.fitness:.4f}" if math.isfinite(current_best.fitness) else "-inf"
@@ -0,0 +1,164 @@
+"""
+Evaluación de poblaciones del GA (serial o en pool de procesos).
+
+El ProcessPoolEvaluator mantiene workers de larga vida: cada proceso
+construye su fitness function una sola vez (con las velas/features de la
+ventana) y luego solo recibe params por tarea.
+"""
+import random
+import concurrent.futures
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+import numpy as np
+
+FitnessFunction = Callable[[Dict[str, Any]], float]
+FitnessFactory = Callable[..., FitnessFunction]
+# Fitness de una generación completa en una sola llamada (backtest lockstep)
+PopulationFitness = Callable[[List[Dict[str, Any]]], List[float]]
+
+# Estado por proceso worker (inicializado una vez por _init_worker)
+_worker_fitness: Optional[FitnessFunction] = None
+
+_SEED_PRIME = 1_000_003
+
+
+class PopulationEvaluator(Protocol):
+    def evaluate(
+        self,
+        params_list: Sequence[Dict[str, Any]],
+        generation: int = 0,
+        indices: Optional[Sequence[int]] = None
+    ) -> List[float]:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def task_seed(base_seed: Optional[int], generation: int, index: int) -> Optional[int]:
+    """
+    Seed de una evaluación, derivado de (seed del GA, generación, posición).
+
+    No depende de qué proceso ejecuta la tarea, así que el resultado es
+    reproducible con cualquier número de workers.
+    """
+    if base_seed is None:
+        return None
+    return ((base_seed * _SEED_PRIME + generation) * _SEED_PRIME + index) % (2 ** 32)
+
+
+def _init_worker(factory: FitnessFactory, factory_args: Tuple, factory_kwargs: Dict[str, Any]) -> None:
+    global _worker_fitness
+    _worker_fitness = factory(*factory_args, **factory_kwargs)
+
+
+def _evaluate_task(task: Tuple[Optional[int], Dict[str, Any]]) -> float:
+    seed, params = task
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    return _worker_fitness(params)
+
+
+class SerialEvaluator:
+    """Evalúa en el proceso actual (comportamiento original del GA)."""
+
+    def __init__(self, fitness_function: FitnessFunction):
+        self.fitness_function = fitness_function
+
+    def evaluate(
+        self,
+        params_list: Sequence[Dict[str, Any]],
+        generation: int = 0,
+        indices: Optional[Sequence[int]] = None
+    ) -> List[float]:
+        return [self.fitness_function(params) for params in params_list]
+
+    def close(self) -> None:
+        pass
+
+
+class BatchEvaluator:
+    """
+    Evalúa la generación completa con una sola llamada en el proceso actual,
+    p.ej. OptimizerWorker.run_population (una pasada por ventana para todos).
+    """
+
+    def __init__(self, population_fitness: PopulationFitness):
+        self.population_fitness = population_fitness
+
+    def evaluate(
+        self,
+        params_list: Sequence[Dict[str, Any]],
+        generation: int = 0,
+        indices: Optional[Sequence[int]] = None
+    ) -> List[float]:
+        fitnesses = list(self.population_fitness(list(params_list)))
+        if len(fitnesses) != len(params_list):
+            raise ValueError(f"Expected {len(params_list)} fitness values, got {len(fitnesses)}")
+        return fitnesses
+
+    def close(self) -> None:
+        pass
+
+
+class ProcessPoolEvaluator:
+    """
+    Evalúa una generación completa en un pool de procesos persistente.
+
+    Args:
+        fitness_factory: Función top-level (picklable) que construye la fitness
+            function dentro de cada worker, p.ej. cargando worker + datos.
+        factory_args / factory_kwargs: Argumentos de la factory (se envían una
+            vez por proceso, no por evaluación).
+        max_workers: Número de procesos (default: CPUs disponibles).
+        seed: Seed base; cada tarea se siembra con task_seed(seed, gen, index).
+
+    Los resultados se devuelven en el mismo orden que params_list. `indices`
+    da la posición de cada params en la población completa (el GA solo envía
+    los no cacheados), para que el seed de un individuo no cambie según
+    cuántos otros salieron del cache.
+    """
+
+    def __init__(
+        self,
+        fitness_factory: FitnessFactory,
+        factory_args: Tuple = (),
+        factory_kwargs: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None
+    ):
+        self.seed = seed
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(fitness_factory, tuple(factory_args), dict(factory_kwargs or {}))
+        )
+
+    def evaluate(
+        self,
+        params_list: Sequence[Dict[str, Any]],
+        generation: int = 0,
+        indices: Optional[Sequence[int]] = None
+    ) -> List[float]:
+        if indices is None:
+            indices = range(len(params_list))
+        elif len(indices) != len(params_list):
+            raise ValueError(f"Expected {len(params_list)} indices, got {len(indices)}")
+        tasks = [
+            (task_seed(self.seed, generation, index), params)
+            for index, params in zip(indices, params_list)
+        ]
+        # chunksize=1: cada evaluación son backtests completos, balancear por tarea
+        return list(self._executor.map(_evaluate_task, tasks, chunksize=1))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'ProcessPoolEvaluator':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -17,6 +17,7 @@ class OptimizerConfig:
     download_months: List[int]
     parallel: bool = True
     checkpoint_interval: int = 10
+    store_path: str = "data/store"  # Columnar candle store (see utils.candle_store)
 
 @dataclass(frozen=True)
 class TestConfig:
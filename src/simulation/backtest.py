@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Sequence
+import numpy as np
+from simulation.metrics import as_float_array, compute_metrics
 from core.market import MarketState
 from core.timeframe import Timeframe
 from core.candle import Candle
@@ -24,48 +26,60 @@ class BacktestReport:
 
 class Backtester:
     @staticmethod
-    def calculate_report(initial_balance: Decimal, equity_curve: List[Decimal], trade_history: List[dict]) -> BacktestReport:
-        final_balance = equity_curve[-1]
+    def calculate_report(
+        initial_balance: Decimal,
+        equity_curve: Sequence,
+        trade_history,
+        final_balance: Optional[Decimal] = None,
+        max_drawdown: Optional[Decimal] = None
+    ) -> BacktestReport:
+        """
+        `trade_history` is the broker's TradeLedger (read through its
+        running totals and pnl column) or a list of {'pnl': ...} dicts.
+
+        `equity_curve` can be the broker's float64 curve: the exact final
+        balance and max drawdown then come from the broker (InMemoryBroker
+        tracks both in Decimal); a Decimal list is scanned exactly.
+        """
+        if final_balance is None:
+            final_balance = equity_curve[-1]
         net_profit = final_balance - initial_balance
         
-        total_trades = len(trade_history)
-        winning_trades = 0
-        losing_trades = 0
-        gross_profit = Decimal("0")
-        gross_loss = Decimal("0")
+        if hasattr(trade_history, 'column'):
+            # TradeLedger: pnl float para conteos, totales Decimal exactos
+            pnl = trade_history.column('pnl')
+            gross_profit = trade_history.gross_profit
+            gross_loss = trade_history.gross_loss
+        else:
+            pnls = [trade.get('pnl', Decimal("0")) for trade in trade_history]
+            pnl = as_float_array(pnls)
+            gross_profit = sum((p for p in pnls if p > 0), Decimal("0"))
+            gross_loss = sum((abs(p) for p in pnls if p <= 0), Decimal("0"))
         
-        for trade in trade_history:
-            pnl = trade.get('pnl', Decimal("0"))
-            if pnl > 0:
-                winning_trades += 1
-                gross_profit += pnl
+        # Drawdown absoluto medido desde el balance inicial
+        m = compute_metrics(
+            np.concatenate(([float(initial_balance)], as_float_array(equity_curve))),
+            pnl,
+            initial_balance,
+            final_balance
+        )
+        if max_drawdown is None:
+            if isinstance(equity_curve, np.ndarray):
+                max_drawdown = Decimal(str(m.max_drawdown_abs))
             else:
-                losing_trades += 1
-                gross_loss += abs(pnl)
-                
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
+                max_drawdown = _max_drawdown(initial_balance, equity_curve)
         
-        # Max Drawdown calculation
-        max_dd = Decimal("0")
-        peak = initial_balance
-        for val in equity_curve:
-            if val > peak:
-                peak = val
-            dd = peak - val
-            if dd > max_dd:
-                max_dd = dd
-                
         return BacktestReport(
             initial_balance=initial_balance,
             final_balance=final_balance,
             net_profit=net_profit,
-            total_trades=total_trades,
-            winning_trades=winning_trades,
-            losing_trades=losing_trades,
-            win_rate=win_rate,
+            total_trades=m.total_trades,
+            winning_trades=m.winning_trades,
+            losing_trades=m.losing_trades,
+            win_rate=m.win_rate,
             gross_profit=gross_profit,
             gross_loss=gross_loss,
-            max_drawdown=max_dd
+            max_drawdown=max_drawdown
         )
 
     def run(self, candles: List[Candle], broker: Broker, strategy: TJRStrategy, executor: TradeExecutor, timeframe: Timeframe) -> BacktestReport:
@@ -95,6 +109,27 @@ class Backtester:
         
         # Re-access equity curve from broker if possible
         equity_curve = getattr(broker, 'equity_curve', [broker.get_balance()])
-        trade_history = getattr(broker, 'trade_history', [])
+        trade_history = getattr(broker, 'closed_positions', None)
+        if trade_history is None:
+            trade_history = getattr(broker, 'trade_history', [])
         
-        return self.calculate_report(initial_balance, equity_curve, trade_history)
+        # InMemoryBroker keeps the curve as float64: exact balance/drawdown from the broker
+        return self.calculate_report(
+            initial_balance,
+            equity_curve,
+            trade_history,
+            final_balance=broker.get_balance(),
+            max_drawdown=getattr(broker, 'max_drawdown', None)
+        )
+
+
+def _max_drawdown(initial_balance: Decimal, equity_curve: Sequence[Decimal]) -> Decimal:
+    """Exact max drawdown of a Decimal curve, measured from the initial balance."""
+    max_dd = initial_balance - initial_balance
+    peak = initial_balance
+    for val in equity_curve:
+        if val > peak:
+            peak = val
+        if peak - val > max_dd:
+            max_dd = peak - val
+    return max_dd
@@ -1,27 +1,85 @@
 from decimal import Decimal
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Sequence
+import numpy as np
 from src.execution.broker import Broker, OrderRequest, OrderResult, Position, OrderType, OrderSide
+from src.simulation.ledger import ClosedTrade, TradeLedger
+
+_INITIAL_EQUITY_CAPACITY = 256
 
 class InMemoryBroker(Broker):
     """
     Simulation Broker with realistic 0.1% Fees.
+
+    Risk-overlay inputs are O(1): the equity peak and the open risk are
+    updated as fills and closes happen instead of rescanning the equity
+    curve / positions on every trade. Positions change only through
+    place_order and update_positions.
+
+    Numbers keep the type of `balance`: Decimal (audit) or float (fast
+    research mode, see simulation.numeric).
+
+    Closed trades go to a TradeLedger (`closed_positions`). `bar_index` is
+    the replay bar the engine is on (set by update_positions(bar_index=...)
+    or directly); it is recorded as the entry/exit index of each trade.
     """
     def __init__(self, balance: Decimal = Decimal("10000"), fee_rate: Decimal = Decimal("0.001")):
         self._balance = balance
         self._fee_rate = fee_rate
+        self._zero = balance - balance
         self.orders: List[OrderRequest] = []
         self.positions: List[Position] = []
-        self.equity_curve: List[Decimal] = [self._balance]
-        self.total_fees_paid = Decimal("0")
-        self.trade_history = []
-        self.closed_positions = []
+        self.total_fees_paid = self._zero
+        self.closed_positions = TradeLedger(self._zero)
+        self.bar_index = -1
+        self._entry_bars: Dict[int, int] = {}
+        # Equity after every fill/close, grown by doubling
+        self._equity = np.empty(_INITIAL_EQUITY_CAPACITY, dtype=np.float64)
+        self._equity_size = 0
+        self._peak = balance
+        self._max_drawdown = self._zero
+        self._open_risk = self._zero
+        self._record_equity()
+
+    @property
+    def equity_curve(self) -> np.ndarray:
+        """Balance after every fill/close as float64 (read-only view)."""
+        view = self._equity[:self._equity_size]
+        view.flags.writeable = False
+        return view
+
+    def _record_equity(self) -> None:
+        if self._equity_size == len(self._equity):
+            grown = np.empty(len(self._equity) * 2, dtype=np.float64)
+            grown[:self._equity_size] = self._equity[:self._equity_size]
+            self._equity = grown
+        self._equity[self._equity_size] = float(self._balance)
+        self._equity_size += 1
+        # Running peak and max drawdown (exact type): same values as a scan of the balances
+        if self._balance > self._peak:
+            self._peak = self._balance
+        drawdown = self._peak - self._balance
+        if drawdown > self._max_drawdown:
+            self._max_drawdown = drawdown
+
+    @property
+    def max_drawdown(self) -> Decimal:
+        """Largest peak-to-balance drop so far, in the balance's type (exact in Decimal mode)."""
+        return self._max_drawdown
+
+    @staticmethod
+    def _position_risk(pos: Position) -> Decimal:
+        if pos.stop_loss and pos.entry_price:
+            risk_per_share = abs(pos.entry_price - pos.stop_loss)
+            return risk_per_share * pos.quantity
+        # Fallback: Full value at risk if no SL
+        return pos.entry_price * pos.quantity
         
     def get_balance(self) -> Decimal:
         return self._balance
 
     def place_order(self, order: OrderRequest) -> OrderResult:
         if self._balance <= 0:
-            return OrderResult(order_id="REJECTED", status="FAILED", filled_price=Decimal("0"), filled_quantity=Decimal("0"))
+            return OrderResult(order_id="REJECTED", status="FAILED", filled_price=self._zero, filled_quantity=self._zero)
             
         # Simulate Entry Fee
         entry_val = order.quantity * order.price
@@ -29,7 +87,7 @@ class InMemoryBroker(Broker):
         
         if self._balance < fee:
             # Cannot even pay fee
-            return OrderResult(order_id="REJECTED_FEE", status="FAILED", filled_price=Decimal("0"), filled_quantity=Decimal("0"))
+            return OrderResult(order_id="REJECTED_FEE", status="FAILED", filled_price=self._zero, filled_quantity=self._zero)
             
         self._balance -= fee
         self.total_fees_paid += fee
@@ -41,15 +99,18 @@ class InMemoryBroker(Broker):
             side=order.side,
             quantity=order.quantity,
             entry_price=order.price,
-            unrealized_pnl=Decimal("0"),
+            unrealized_pnl=self._zero,
             stop_loss=order.stop_loss,
             take_profit=order.take_profit,
             metadata=order.metadata
         )
         self.positions.append(pos)
+        self._entry_bars[id(pos)] = self.bar_index
+        # Positions are summed in fill order, as a fresh scan would
+        self._open_risk += self._position_risk(pos)
         
         # Track equity after fee
-        self.equity_curve.append(self._balance)
+        self._record_equity()
         
         return OrderResult(
             order_id=f"id_{len(self.orders)}",
@@ -61,34 +122,64 @@ class InMemoryBroker(Broker):
     def get_positions(self) -> List[Position]:
         return self.positions
     
-    def get_closed_positions(self) -> List[Any]:
+    def get_closed_positions(self) -> TradeLedger:
         """Returns all positions that have been closed."""
         return self.closed_positions
 
     def cancel_order(self, order_id: str) -> bool:
         return True
 
-    def update_positions(self, current_price: Decimal):
+    @staticmethod
+    def _exit_price(pos: Position, current_price: Decimal) -> Optional[Decimal]:
+        """SL/TP level hit by `current_price`, None if the position stays open."""
+        if pos.side == OrderSide.BUY:
+            if pos.stop_loss and current_price <= pos.stop_loss:
+                return pos.stop_loss
+            elif pos.take_profit and current_price >= pos.take_profit:
+                return pos.take_profit
+        elif pos.side == OrderSide.SELL:
+            if pos.stop_loss and current_price >= pos.stop_loss:
+                return pos.stop_loss
+            elif pos.take_profit and current_price <= pos.take_profit:
+                return pos.take_profit
+        return None
+
+    def find_exit(self, closes: np.ndarray, prices: Sequence[Decimal], start: int = 0) -> Optional[int]:
+        """
+        First bar >= start at which update_positions(prices[bar]) closes a position.
+
+        Fast mode for trade-sparse backtests: instead of feeding every bar to
+        update_positions, the engine jumps to this bar. `closes` holds the same
+        prices as float64 for a vectorized first-crossing search against the
+        SL/TP levels; float rounding can only add ties, so each candidate is
+        confirmed with the exact Decimal comparison. None if nothing closes.
+        """
+        best: Optional[int] = None
+        for pos in self.positions:
+            window = closes[start:best]
+            if pos.side == OrderSide.BUY:
+                lower, upper = pos.stop_loss, pos.take_profit
+            else:
+                lower, upper = pos.take_profit, pos.stop_loss
+            hits = np.zeros(len(window), dtype=bool)
+            if lower:
+                hits |= window <= float(lower)
+            if upper:
+                hits |= window >= float(upper)
+            for offset in np.flatnonzero(hits).tolist():
+                if self._exit_price(pos, prices[start + offset]) is not None:
+                    best = start + offset
+                    break
+        return best
+
+    def update_positions(self, current_price: Decimal, bar_index: Optional[int] = None):
         """Simulate TP/SL logic with exit fees."""
+        if bar_index is not None:
+            self.bar_index = bar_index
         remaining = []
         for pos in self.positions:
-            closed = False
-            exit_price = Decimal("0")
-            
-            if pos.side == OrderSide.BUY:
-                if pos.stop_loss and current_price <= pos.stop_loss:
-                    exit_price = pos.stop_loss
-                    closed = True
-                elif pos.take_profit and current_price >= pos.take_profit:
-                    exit_price = pos.take_profit
-                    closed = True
-            elif pos.side == OrderSide.SELL:
-                if pos.stop_loss and current_price >= pos.stop_loss:
-                    exit_price = pos.stop_loss
-                    closed = True
-                elif pos.take_profit and current_price <= pos.take_profit:
-                    exit_price = pos.take_profit
-                    closed = True
+            exit_price = self._exit_price(pos, current_price)
+            closed = exit_price is not None
             
             if closed:
                 # 1. Calculate Gross PnL
@@ -105,47 +196,44 @@ class InMemoryBroker(Broker):
                 net_pnl = gross_pnl - exit_fee
                 self._balance += net_pnl
                 self.total_fees_paid += exit_fee
-                self.equity_curve.append(self._balance)
-                self.trade_history.append({"pnl": net_pnl, "fee": exit_fee})
+                self._record_equity()
                 
                 # For V3 Data Extraction
-                pos_closed = pos.__dict__.copy()
-                pos_closed.update({
-                    'exit_price': exit_price,
-                    'pnl': net_pnl,
-                    'closed_at_price': current_price
-                })
-                # Using a simple namespace/dict wrapper to act like an object in Worker
-                from types import SimpleNamespace
-                self.closed_positions.append(SimpleNamespace(**pos_closed))
+                self.closed_positions.append(ClosedTrade(
+                    symbol=pos.symbol,
+                    side=pos.side,
+                    quantity=pos.quantity,
+                    entry_price=pos.entry_price,
+                    exit_price=exit_price,
+                    pnl=net_pnl,
+                    fee=exit_fee,
+                    closed_at_price=current_price,
+                    stop_loss=pos.stop_loss,
+                    take_profit=pos.take_profit,
+                    metadata=pos.metadata,
+                    entry_index=self._entry_bars.pop(id(pos), -1),
+                    exit_index=self.bar_index
+                ))
             else:
                 remaining.append(pos)
+        if len(remaining) != len(self.positions):
+            # Re-sum the survivors (Decimal subtraction could round differently)
+            total_risk = self._zero
+            for pos in remaining:
+                total_risk += self._position_risk(pos)
+            self._open_risk = total_risk
         self.positions = remaining
 
     def get_current_drawdown_pct(self) -> Decimal:
-        """Calculate current drawdown from equity peak."""
-        if not self.equity_curve:
-            return Decimal("0.0")
-        
-        # Determine peak equity so far
-        # Note: self.equity_curve can grow large, optimization: track peak in _balance update
-        # For now, max() is O(N) but safe.
-        peak = max(self.equity_curve)
+        """Current drawdown from the running equity peak."""
+        peak = self._peak
         current = self._balance
         
         if peak <= 0:
-            return Decimal("0.0")
+            return self._zero
             
         return (peak - current) / peak
 
     def get_open_risk(self) -> Decimal:
-        """Calculate total risk of all open positions."""
-        total_risk = Decimal("0")
-        for pos in self.positions:
-            if pos.stop_loss and pos.entry_price:
-                risk_per_share = abs(pos.entry_price - pos.stop_loss)
-                total_risk += risk_per_share * pos.quantity
-            else:
-                # Fallback: Full value at risk if no SL
-                total_risk += pos.entry_price * pos.quantity
-        return total_risk
+        """Total risk of all open positions (maintained on fills/closes)."""
+        return self._open_risk
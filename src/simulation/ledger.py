@@ -0,0 +1,158 @@
+# src/simulation/ledger.py
+"""
+Ledger of closed trades of a simulated broker.
+
+Each close is stored once: a __slots__ record keeps the broker's values
+(exact Decimal in audit mode) for persistence, and a growable structured
+NumPy array keeps the numeric columns for vectorized metrics. Gross
+profit/loss are also accumulated as trades are appended, in the same
+order a sum() over the records would use, so reports stay exact without
+a scan.
+"""
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Union
+import numpy as np
+from src.execution.broker import OrderSide
+
+_INITIAL_CAPACITY = 64
+
+TRADE_DTYPE = np.dtype([
+    ('entry_index', np.int64),
+    ('exit_index', np.int64),
+    ('side', np.int8),          # 1 BUY, -1 SELL
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('quantity', np.float64),
+    ('pnl', np.float64),
+    ('fee', np.float64),
+    ('agent', np.int16),        # TradeLedger.labels code, -1 = sin metadata
+    ('regime', np.int16),
+])
+
+
+class ClosedTrade:
+    """One closed position (Decimal values, float in fast research mode)."""
+    __slots__ = (
+        'symbol', 'side', 'quantity', 'entry_price', 'exit_price', 'stop_loss',
+        'take_profit', 'pnl', 'fee', 'closed_at_price', 'metadata',
+        'entry_index', 'exit_index'
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        side: OrderSide,
+        quantity: Decimal,
+        entry_price: Decimal,
+        exit_price: Decimal,
+        pnl: Decimal,
+        fee: Decimal,
+        closed_at_price: Decimal,
+        stop_loss: Optional[Decimal] = None,
+        take_profit: Optional[Decimal] = None,
+        metadata: Optional[dict] = None,
+        entry_index: int = -1,
+        exit_index: int = -1
+    ):
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.entry_price = entry_price
+        self.exit_price = exit_price
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.pnl = pnl
+        self.fee = fee
+        self.closed_at_price = closed_at_price
+        self.metadata = metadata
+        self.entry_index = entry_index
+        self.exit_index = exit_index
+
+    def __repr__(self) -> str:
+        return f"ClosedTrade({self.symbol} {self.side.value} pnl={self.pnl})"
+
+
+class TradeLedger:
+    """
+    Append-only list of ClosedTrade plus their numeric columns.
+
+    Behaves like the old closed_positions list (len, index, slices,
+    iteration) so callers that persist new trades keep working.
+    """
+
+    def __init__(self, zero: Union[Decimal, float] = Decimal("0")):
+        self._records: List[ClosedTrade] = []
+        self._data = np.zeros(_INITIAL_CAPACITY, dtype=TRADE_DTYPE)
+        self._label_codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+        # Totales en el tipo numérico del broker (Decimal o float)
+        self.gross_profit = zero
+        self.gross_loss = zero
+        self.total_fees = zero
+
+    def _code(self, label: Optional[str]) -> int:
+        if label is None:
+            return -1
+        code = self._label_codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._label_codes[label] = code
+            self.labels.append(label)
+        return code
+
+    def append(self, trade: ClosedTrade) -> None:
+        n = len(self._records)
+        if n == len(self._data):
+            grown = np.zeros(len(self._data) * 2, dtype=TRADE_DTYPE)
+            grown[:n] = self._data[:n]
+            self._data = grown
+
+        metadata = trade.metadata or {}
+        self._data[n] = (
+            trade.entry_index,
+            trade.exit_index,
+            1 if trade.side == OrderSide.BUY else -1,
+            float(trade.entry_price),
+            float(trade.exit_price),
+            float(trade.quantity),
+            float(trade.pnl),
+            float(trade.fee),
+            self._code(metadata.get('agent')),
+            self._code(metadata.get('regime')),
+        )
+        self._records.append(trade)
+
+        if trade.pnl > 0:
+            self.gross_profit += trade.pnl
+        elif trade.pnl < 0:
+            self.gross_loss += abs(trade.pnl)
+        self.total_fees += trade.fee
+
+    @property
+    def data(self) -> np.ndarray:
+        """Structured array (TRADE_DTYPE) of the closed trades, read-only view."""
+        view = self._data[:len(self._records)]
+        view.flags.writeable = False
+        return view
+
+    def column(self, name: str) -> np.ndarray:
+        return self.data[name]
+
+    def label(self, code: int) -> Optional[str]:
+        return self.labels[code] if code >= 0 else None
+
+    @property
+    def winning_trades(self) -> int:
+        return int(np.count_nonzero(self.column('pnl') > 0))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[ClosedTrade]:
+        return iter(self._records)
+
+    def __getitem__(self, index: Union[int, slice]):
+        return self._records[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._records)
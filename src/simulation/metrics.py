@@ -0,0 +1,114 @@
+# src/simulation/metrics.py
+"""
+Métricas de backtest en una pasada vectorizada.
+
+Entradas: la curva de equity (float64, como InMemoryBroker.equity_curve)
+y el pnl de cada trade cerrado (TradeLedger.column('pnl')). Se usa en
+OptimizerWorker._calculate_metrics (dos veces por fitness del GA) y en
+Backtester.calculate_report.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional, Union
+import numpy as np
+
+# Mismo piso de drawdown que el Calmar de optimization.fitness
+CALMAR_DD_FLOOR = 0.05
+
+Number = Union[int, float, Decimal]
+
+
+@dataclass(frozen=True)
+class BacktestMetrics:
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float            # %
+    gross_profit: float
+    gross_loss: float
+    profit_factor: float       # 10.0 cap sin pérdidas, 1.0 sin trades
+    net_profit: float
+    return_pct: float          # %
+    max_drawdown: float        # fracción del pico (0.10 = 10%)
+    max_drawdown_abs: float    # peak - equity, en moneda
+    sharpe: float              # no anualizado: mean/pstdev * sqrt(n)
+    calmar: float              # return / max(max_drawdown, CALMAR_DD_FLOOR)
+
+
+def as_float_array(values: Iterable) -> np.ndarray:
+    """float64 array de una curva/pnl (ndarray, lista de Decimal/int...)."""
+    if isinstance(values, np.ndarray) and values.dtype == np.float64:
+        return values
+    return np.fromiter((float(v) for v in values), dtype=np.float64)
+
+
+def compute_metrics(
+    equity: np.ndarray,
+    pnl: np.ndarray,
+    initial_balance: Number,
+    final_balance: Optional[Number] = None
+) -> BacktestMetrics:
+    """
+    Args:
+        equity: Equity tras cada fill/cierre (el primer valor es el balance inicial).
+        pnl: Pnl neto de cada trade cerrado.
+        initial_balance / final_balance: Balances exactos (Decimal) si se tienen;
+            final_balance por defecto es el último punto de equity.
+    """
+    equity = as_float_array(equity)
+    pnl = as_float_array(pnl)
+
+    total_trades = len(pnl)
+    wins = pnl > 0
+    winning_trades = int(np.count_nonzero(wins))
+    gross_profit = float(pnl[wins].sum())
+    gross_loss = float(-pnl[pnl < 0].sum())
+    if total_trades == 0:
+        profit_factor = 1.0
+    elif gross_loss == 0:
+        profit_factor = 10.0 if gross_profit > 0 else 1.0
+    else:
+        profit_factor = gross_profit / gross_loss
+
+    if final_balance is None:
+        final_balance = equity[-1] if len(equity) else initial_balance
+    net_profit = float(final_balance - initial_balance)
+    return_pct = (net_profit / float(initial_balance) * 100) if initial_balance > 0 else 0.0
+
+    max_drawdown = 0.0
+    max_drawdown_abs = 0.0
+    sharpe = 0.0
+    if len(equity):
+        peaks = np.maximum.accumulate(equity)
+        gaps = peaks - equity
+        max_drawdown_abs = float(gaps.max())
+        positive = peaks > 0
+        if positive.any():
+            max_drawdown = float((gaps[positive] / peaks[positive]).max())
+
+        # Retornos entre puntos consecutivos con equity previa > 0
+        prev, curr = equity[:-1], equity[1:]
+        valid = prev > 0
+        rets = curr[valid] / prev[valid] - 1.0
+        if len(rets) >= 2:
+            std = float(rets.std())
+            if std > 0:
+                sharpe = float(rets.mean()) / std * float(np.sqrt(len(rets)))
+
+    calmar = (return_pct / 100.0) / max(max_drawdown, CALMAR_DD_FLOOR)
+
+    return BacktestMetrics(
+        total_trades=total_trades,
+        winning_trades=winning_trades,
+        losing_trades=total_trades - winning_trades,
+        win_rate=(winning_trades / total_trades * 100) if total_trades else 0.0,
+        gross_profit=gross_profit,
+        gross_loss=gross_loss,
+        profit_factor=profit_factor,
+        net_profit=net_profit,
+        return_pct=return_pct,
+        max_drawdown=max_drawdown,
+        max_drawdown_abs=max_drawdown_abs,
+        sharpe=sharpe,
+        calmar=calmar
+    )
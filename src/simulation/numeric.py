@@ -0,0 +1,65 @@
+# src/simulation/numeric.py
+"""
+Modo numérico del backtest.
+
+- DECIMAL: camino exacto (precios Decimal de las velas). Es el modo de
+  auditoría y de los backtests finales OOS.
+- FLOAT: precios, sizing y P&L en float64 nativo. Es el modo de búsqueda
+  GA/WFO (OptimizerWorker.run_population): evita Decimal y los round-trips
+  Decimal(str(x)) en cada trade.
+
+InMemoryBroker y RiskManager trabajan en el tipo de los números que
+reciben (balance / risk_percentage), así que el modo solo decide cómo se
+convierten los inputs.
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Union
+
+DECIMAL = 'decimal'
+FLOAT = 'float'
+NUMERIC_MODES = (DECIMAL, FLOAT)
+
+Number = Union[Decimal, float]
+
+# Métricas comparadas por numeric_divergence (claves de _calculate_metrics)
+DIVERGENCE_KEYS = (
+    'total_trades', 'final_balance', 'net_profit', 'return', 'win_rate',
+    'profit_factor', 'max_drawdown', 'sharpe', 'calmar'
+)
+
+
+def check_numeric_mode(mode: str) -> str:
+    if mode not in NUMERIC_MODES:
+        raise ValueError(f"Unknown numeric mode '{mode}' (expected one of {NUMERIC_MODES})")
+    return mode
+
+
+def to_number(value: Any, mode: str = DECIMAL) -> Number:
+    """Convierte un valor de config/params/vela al tipo del modo."""
+    if mode == FLOAT:
+        return float(value)
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def numeric_divergence(
+    decimal_result: Dict[str, Any],
+    float_result: Dict[str, Any],
+    keys: Iterable[str] = DIVERGENCE_KEYS
+) -> Dict[str, Dict[str, float]]:
+    """
+    Diferencia métrica a métrica entre dos resultados del worker
+    (mismo individuo y ventana en modo DECIMAL y FLOAT).
+    """
+    report = {}
+    for key in keys:
+        exact = float(decimal_result.get(key, 0.0))
+        fast = float(float_result.get(key, 0.0))
+        report[key] = {
+            'decimal': exact,
+            'float': fast,
+            'abs_diff': abs(fast - exact),
+            'rel_diff': abs(fast - exact) / abs(exact) if exact else 0.0
+        }
+    return report
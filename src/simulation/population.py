@@ -0,0 +1,168 @@
+# src/simulation/population.py
+"""
+Backtest of a whole GA population over one data window.
+
+The window is replayed once: candles, MarketState (ATR of each bar), alpha
+directions and ML probabilities are shared, and each individual only keeps
+its own broker/risk state (a TradeExecutor). Individuals then jump from
+signal to fill to exit (InMemoryBroker.find_exit) with the same Decimal
+arithmetic as OptimizerWorker.run, so every individual ends with the broker
+it would have had in its own bar-by-bar run. With numeric_mode FLOAT the
+same replay runs on float64 prices (GA/WFO search, see simulation.numeric).
+"""
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from src.core.candle import Candle
+from src.core.market import MarketState
+from src.core.series import MarketSeries
+from src.execution.broker import OrderSide
+from src.execution.executor import TradeExecutor, TradeSignal
+from src.simulation.numeric import DECIMAL, check_numeric_mode
+
+
+def replay_bar_atr(candles: Sequence[Candle], symbol: str = 'BTCUSDT') -> List[float]:
+    """market.atr[-1] after each candle (0.0 while the ATR is not ready), as OptimizerWorker.run sees it."""
+    atrs = []
+    market = MarketState.empty(symbol)
+    for candle in candles:
+        market = market.update(candle)
+        atrs.append(market.atr[-1] if market.atr else 0.0)
+    return atrs
+
+
+class PopulationBacktester:
+    """
+    Args:
+        candles: Window candles (warmup + main).
+        symbol: Symbol of the signals.
+        start_index: First bar where trades may open (after warmup).
+        fallback_stop_loss: SL distance used while the ATR is 0.0 (config 'stop_loss').
+        ml_probs: Win probability per bar (NaN = no features), None without ML filter.
+        ml_threshold: Entries with probability below it are filtered.
+        numeric_mode: DECIMAL (exact, candle prices) or FLOAT (float64 prices);
+            executors and multipliers must use the same number type.
+        bar_atr: Precomputed bar_atr() of these candles (the worker caches it
+            per window), None to replay the MarketState on first use.
+    """
+
+    def __init__(
+        self,
+        candles: Sequence[Candle],
+        symbol: str = 'BTCUSDT',
+        start_index: int = 0,
+        fallback_stop_loss: Decimal = Decimal("100"),
+        ml_probs: Optional[np.ndarray] = None,
+        ml_threshold: float = 0.6,
+        numeric_mode: str = DECIMAL,
+        bar_atr: Optional[List[float]] = None
+    ):
+        if bar_atr is not None and len(bar_atr) != len(candles):
+            raise ValueError(f"bar_atr has {len(bar_atr)} values for {len(candles)} candles")
+        self.candles = candles
+        self.symbol = symbol
+        self.start_index = start_index
+        self.fallback_stop_loss = fallback_stop_loss
+        self.ml_probs = ml_probs
+        self.ml_threshold = ml_threshold
+        self.numeric_mode = check_numeric_mode(numeric_mode)
+        self._bar_atr = bar_atr
+
+    def bar_atr(self) -> List[float]:
+        """market.atr[-1] (0.0 without H4 data) after each candle, from one MarketState replay."""
+        if self._bar_atr is None:
+            self._bar_atr = replay_bar_atr(self.candles, self.symbol)
+        return self._bar_atr
+
+    def run(
+        self,
+        executors: Sequence[TradeExecutor],
+        directions: np.ndarray,
+        stop_loss_atr_mult: Sequence[Decimal],
+        take_profit_r_mult: Sequence[Decimal]
+    ) -> List[int]:
+        """
+        Replays the window for every executor (one per individual).
+
+        directions[k, i] is individual k's signal at bar i (1 BUY, -1 SELL,
+        0 none); the multipliers are Decimal(str(float(param))) as in the
+        worker (plain floats in FLOAT mode). Returns the number of ML-filtered entries per individual;
+        trades end up in each executor's broker.
+
+        Each individual only visits its signal bars: after a fill the broker
+        finds the exit bar (find_exit) and the replay jumps there, so the
+        cost grows with signals/trades instead of bars.
+        """
+        n = len(executors)
+        directions = np.asarray(directions)
+        if directions.shape != (n, len(self.candles)):
+            raise ValueError(f"Directions shape {directions.shape} does not match {n} individuals x {len(self.candles)} bars")
+
+        bar_atr = self.bar_atr()
+        if isinstance(self.candles, MarketSeries):
+            closes = self.candles.closes
+        else:
+            closes = np.fromiter((float(candle.close) for candle in self.candles), dtype=np.float64, count=len(self.candles))
+        if self.numeric_mode == DECIMAL:
+            prices = [candle.close for candle in self.candles]
+        else:
+            prices = closes.tolist()
+        ml_blocked = np.zeros(len(prices), dtype=bool)
+        if self.ml_probs is not None:
+            # NaN (vela sin features) deja pasar la señal
+            ml_blocked = self.ml_probs < self.ml_threshold
+
+        exact = self.numeric_mode == DECIMAL
+        atr_decimals: Dict[int, Decimal] = {}
+        filtered = [0] * n
+        for k, executor in enumerate(executors):
+            broker = executor.broker
+            # Barras donde el individuo tiene señal; las que caen con posición abierta se saltan
+            signal_bars = np.flatnonzero(directions[k, self.start_index:]) + self.start_index
+            pos = 0
+            while pos < len(signal_bars):
+                i = int(signal_bars[pos])
+                pos += 1
+                if ml_blocked[i]:
+                    filtered[k] += 1
+                    continue
+
+                current_atr = bar_atr[i]
+                if current_atr == 0.0:
+                    # Fallback if ATR not ready
+                    sl_dist = self.fallback_stop_loss
+                elif exact:
+                    if i not in atr_decimals:
+                        atr_decimals[i] = Decimal(str(current_atr))
+                    sl_dist = atr_decimals[i] * stop_loss_atr_mult[k]
+                else:
+                    sl_dist = current_atr * stop_loss_atr_mult[k]
+                tp_dist = sl_dist * take_profit_r_mult[k]
+
+                close = prices[i]
+                if directions[k, i] > 0:
+                    side = OrderSide.BUY
+                    stop_loss, take_profit = close - sl_dist, close + tp_dist
+                else:
+                    side = OrderSide.SELL
+                    stop_loss, take_profit = close + sl_dist, close - tp_dist
+
+                broker.bar_index = i
+                executor.execute_trade(TradeSignal(
+                    symbol=self.symbol,
+                    side=side,
+                    entry_price=close,
+                    stop_loss=stop_loss,
+                    take_profit=take_profit
+                ))
+                if not broker.get_positions():
+                    continue
+
+                # Salta directo a la vela de salida (primer cruce de SL/TP)
+                exit_bar = broker.find_exit(closes, prices, i + 1)
+                if exit_bar is None:
+                    break
+                broker.update_positions(prices[exit_bar], bar_index=exit_bar)
+                # La vela de salida ya puede abrir el siguiente trade
+                pos = int(np.searchsorted(signal_bars, exit_bar))
+        return filtered
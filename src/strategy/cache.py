@@ -0,0 +1,64 @@
+from typing import Dict, Optional, Any
+from src.core.series import MarketSeries
+from .structure import detect_bos, StructureEvent
+from .ob import detect_ob, OrderBlock
+
+class StructureCache:
+    """
+    Per-series memo of BOS / Order Block detection keyed by candle index.
+
+    `detect_bos(series, i)` and `detect_ob(series, i)` only read candles up to
+    `i`, so once computed the result for a historical index never changes.
+    The cache lives on the series buffer (see MarketSeries.memo), so it persists
+    across bars and is shared by TJRStrategy and Alpha_OB_Quality.
+    """
+
+    def __init__(self):
+        self._bos: Dict[int, Optional[StructureEvent]] = {}
+        self._ob: Dict[int, Optional[OrderBlock]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def bos(self, series: MarketSeries, index: int) -> Optional[StructureEvent]:
+        if index in self._bos:
+            self.hits += 1
+            return self._bos[index]
+        self.misses += 1
+        return self._compute_bos(series, index)
+
+    def _compute_bos(self, series: MarketSeries, index: int) -> Optional[StructureEvent]:
+        result = detect_bos(series, index)
+        self._bos[index] = result
+        return result
+
+    def ob(self, series: MarketSeries, index: int) -> Optional[OrderBlock]:
+        if index in self._ob:
+            self.hits += 1
+            return self._ob[index]
+        self.misses += 1
+        # No BOS -> no OB; skip detect_ob's own scans in the common case
+        bos = self._bos[index] if index in self._bos else self._compute_bos(series, index)
+        if bos is None:
+            result = None
+        else:
+            result = detect_ob(series, index)
+        self._ob[index] = result
+        return result
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 4),
+            'cached_indices': len(self._ob)
+        }
+
+
+def get_structure_cache(series: MarketSeries) -> StructureCache:
+    """Returns the StructureCache attached to this series' buffer."""
+    return series.memo('structure', StructureCache)
@@ -4,13 +4,15 @@ from src.core.market import MarketState
 from src.core.timeframe import Timeframe
 from src.execution.executor import TradeSignal
 from src.execution.broker import OrderSide
-from .ob import detect_ob, OrderBlock, OBType
+from .ob import OrderBlock, OBType
+from .cache import StructureCache, get_structure_cache
 
 class TJRStrategy:
     """
     Orchestrator for TJR Price Action Strategy.
     Scans for Setups (OBs formed by Sweep+BOS) and triggers on Retest.
     """
+
     def __init__(
         self, 
         fixed_stop_loss: Optional[Decimal] = None, 
@@ -25,9 +27,21 @@ class TJRStrategy:
         self.fixed_stop_loss = fixed_stop_loss
         self.take_profit_multiplier = take_profit_multiplier
         self.stop_loss_atr_multiplier = stop_loss_atr_multiplier
+        self._last_cache: Optional[StructureCache] = None
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the OB/BOS cache for the last analyzed series."""
+        if self._last_cache is None:
+            return {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'cached_indices': 0}
+        return self._last_cache.stats()
 
     def _calculate_atr(self, series, period: int = 14) -> Optional[Decimal]:
-        """Calculate Average True Range for SL sizing."""
+        """
+        Calculate Average True Range for SL sizing.
+
+        Same definition as the atr_sma_14 indicator node, but summed in the
+        candles' Decimals: SL distance and sizing stay exact.
+        """
         if len(series) < period + 1:
             return None
         
@@ -54,9 +68,13 @@ class TJRStrategy:
         # 1. Scan for recent Order Blocks (e.g., look back 50 candles)
         valid_setup = None
         
+        # Historical OB results are memoized per series: only the newest index is computed
+        cache = get_structure_cache(series)
+        self._last_cache = cache
+        
         # Optimize: Scan backwards for OBs
         for i in range(current_idx - 1, max(-1, current_idx - 50), -1):
-            ob = detect_ob(series, i)
+            ob = cache.ob(series, i)
             if ob:
                 if ob.type == OBType.BULLISH:
                     if current_candle.low <= ob.top and current_candle.close >= ob.bottom:
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 from decimal import Decimal
-from core.series import MarketSeries
+from src.core.series import MarketSeries
 
 class FVGType(Enum):
     BULLISH = "BULLISH"
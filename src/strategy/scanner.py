@@ -0,0 +1,267 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from src.core.series import MarketSeries
+from .structure import StructureEvent, StructureType
+from .ob import OrderBlock, OBType
+from .fvg import FVG, FVGType
+
+# Direction codes used in the scan arrays
+NONE = 0
+BULLISH = 1
+BEARISH = -1
+
+LOOKBACK = 50
+
+
+@dataclass(frozen=True)
+class StructureScan:
+    """
+    Whole-series result of fractal / BOS / OB / FVG detection.
+
+    Every array has one entry per candle index `i`, holding what the per-index
+    function would return when called with `index=i`:
+    - swing_high / swing_low: `is_valid_high(series, i)` / `is_valid_low(series, i)`
+    - bos_*: `detect_bos(series, i)` (type, broken price, broken index)
+    - ob_*: `detect_ob(series, i)` (type, top, bottom, OB candle index)
+    - fvg_*: `detect_fvg(series, i)` (type, top, bottom, middle candle index)
+    Types use BULLISH=1 / BEARISH=-1 / NONE=0; missing prices are NaN and
+    missing indices are -1.
+    """
+    swing_high: np.ndarray
+    swing_low: np.ndarray
+    bos_type: np.ndarray
+    bos_price: np.ndarray
+    bos_index: np.ndarray
+    ob_type: np.ndarray
+    ob_top: np.ndarray
+    ob_bottom: np.ndarray
+    ob_index: np.ndarray
+    fvg_type: np.ndarray
+    fvg_top: np.ndarray
+    fvg_bottom: np.ndarray
+    fvg_index: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.bos_type)
+
+    def bos_at(self, index: int) -> Optional[StructureEvent]:
+        t = self.bos_type[index]
+        if t == NONE:
+            return None
+        return StructureEvent(
+            type=StructureType.BOS_BULLISH if t == BULLISH else StructureType.BOS_BEARISH,
+            price=_to_decimal(self.bos_price[index]),
+            broken_index=int(self.bos_index[index]),
+            breakout_index=index
+        )
+
+    def ob_at(self, index: int) -> Optional[OrderBlock]:
+        t = self.ob_type[index]
+        if t == NONE:
+            return None
+        return OrderBlock(
+            type=OBType.BULLISH if t == BULLISH else OBType.BEARISH,
+            top=_to_decimal(self.ob_top[index]),
+            bottom=_to_decimal(self.ob_bottom[index]),
+            index=int(self.ob_index[index])
+        )
+
+    def fvg_at(self, index: int) -> Optional[FVG]:
+        t = self.fvg_type[index]
+        if t == NONE:
+            return None
+        return FVG(
+            type=FVGType.BULLISH if t == BULLISH else FVGType.BEARISH,
+            top=_to_decimal(self.fvg_top[index]),
+            bottom=_to_decimal(self.fvg_bottom[index]),
+            index=int(self.fvg_index[index])
+        )
+
+
+def _to_decimal(value: float) -> Decimal:
+    # repr() round-trips the float produced from the original Decimal string
+    return Decimal(repr(float(value)))
+
+
+def scan_series(series: MarketSeries, lookback: int = LOOKBACK) -> StructureScan:
+    """Scans a MarketSeries using its columnar views (no per-candle Python calls)."""
+    return scan_structure(series.opens, series.highs, series.lows, series.closes, lookback)
+
+
+def scan_structure(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    lookback: int = LOOKBACK
+) -> StructureScan:
+    """
+    Vectorized equivalent of calling the fractal, BOS, OB and FVG detectors
+    for every index of an OHLC series.
+
+    `lookback` mirrors the 50-candle scan limit of detect_bos / detect_ob.
+    """
+    o = np.asarray(open_, dtype=np.float64)
+    h = np.asarray(high, dtype=np.float64)
+    l = np.asarray(low, dtype=np.float64)
+    c = np.asarray(close, dtype=np.float64)
+    n = len(c)
+    idx = np.arange(n)
+
+    green = c > o
+    red = c < o
+
+    # --- Fractals: green->red (high) and red->green (low) pairs ---
+    swing_high = np.zeros(n, dtype=bool)
+    swing_low = np.zeros(n, dtype=bool)
+    if n > 1:
+        swing_high[:-1] = green[:-1] & red[1:]
+        swing_low[:-1] = red[:-1] & green[1:]
+
+    # --- BOS: break of the most recent fractal within the lookback ---
+    bos_type = np.zeros(n, dtype=np.int8)
+    bos_price = np.full(n, np.nan)
+    bos_index = np.full(n, -1, dtype=np.int64)
+    if n > 0:
+        prev_high = _last_flag_before(swing_high)
+        prev_low = _last_flag_before(swing_low)
+        window_start = idx - (lookback - 1)
+        eligible = idx >= 2
+
+        has_high = eligible & (prev_high >= 0) & (prev_high >= window_start)
+        has_low = eligible & (prev_low >= 0) & (prev_low >= window_start)
+
+        bull = has_high & (c > h[np.maximum(prev_high, 0)])
+        bear = ~bull & has_low & (c < l[np.maximum(prev_low, 0)])
+
+        bos_type[bull] = BULLISH
+        bos_price[bull] = h[prev_high[bull]]
+        bos_index[bull] = prev_high[bull]
+        bos_type[bear] = BEARISH
+        bos_price[bear] = l[prev_low[bear]]
+        bos_index[bear] = prev_low[bear]
+
+    # --- Order Blocks: sweep of a prior fractal at the move origin ---
+    ob_type = np.zeros(n, dtype=np.int8)
+    ob_top = np.full(n, np.nan)
+    ob_bottom = np.full(n, np.nan)
+    ob_index = np.full(n, -1, dtype=np.int64)
+    if n > 0:
+        _scan_obs(BULLISH, np.flatnonzero(bos_type == BULLISH), o, h, l, c, swing_low,
+                  lookback, ob_type, ob_top, ob_bottom, ob_index)
+        _scan_obs(BEARISH, np.flatnonzero(bos_type == BEARISH), o, h, l, c, swing_high,
+                  lookback, ob_type, ob_top, ob_bottom, ob_index)
+
+    # --- FVG: wicks of candles i-2 and i do not overlap ---
+    fvg_type = np.zeros(n, dtype=np.int8)
+    fvg_top = np.full(n, np.nan)
+    fvg_bottom = np.full(n, np.nan)
+    fvg_index = np.full(n, -1, dtype=np.int64)
+    if n > 2:
+        h1, l1 = h[:-2], l[:-2]
+        h3, l3 = h[2:], l[2:]
+        bull_gap = h1 < l3
+        bear_gap = ~bull_gap & (l1 > h3)
+        target = idx[2:]
+        fvg_type[target[bull_gap]] = BULLISH
+        fvg_top[target[bull_gap]] = l3[bull_gap]
+        fvg_bottom[target[bull_gap]] = h1[bull_gap]
+        fvg_type[target[bear_gap]] = BEARISH
+        fvg_top[target[bear_gap]] = l1[bear_gap]
+        fvg_bottom[target[bear_gap]] = h3[bear_gap]
+        fvg_index[target[bull_gap | bear_gap]] = target[bull_gap | bear_gap] - 1
+
+    return StructureScan(
+        swing_high=swing_high,
+        swing_low=swing_low,
+        bos_type=bos_type,
+        bos_price=bos_price,
+        bos_index=bos_index,
+        ob_type=ob_type,
+        ob_top=ob_top,
+        ob_bottom=ob_bottom,
+        ob_index=ob_index,
+        fvg_type=fvg_type,
+        fvg_top=fvg_top,
+        fvg_bottom=fvg_bottom,
+        fvg_index=fvg_index
+    )
+
+
+def _last_flag_before(flags: np.ndarray) -> np.ndarray:
+    """For each i, the largest k < i with flags[k] (or -1)."""
+    marked = np.where(flags, np.arange(len(flags)), -1)
+    last = np.maximum.accumulate(marked)
+    out = np.empty_like(last)
+    out[0] = -1
+    out[1:] = last[:-1]
+    return out
+
+
+def _scan_obs(
+    direction: int,
+    bos_idx: np.ndarray,
+    o: np.ndarray,
+    h: np.ndarray,
+    l: np.ndarray,
+    c: np.ndarray,
+    swing: np.ndarray,
+    lookback: int,
+    ob_type: np.ndarray,
+    ob_top: np.ndarray,
+    ob_bottom: np.ndarray,
+    ob_index: np.ndarray
+) -> None:
+    """Fills OB arrays in place for the BOS indices of one direction."""
+    if len(bos_idx) == 0:
+        return
+
+    pad = lookback - 1
+    if direction == BULLISH:
+        extreme = np.concatenate((np.full(pad, np.inf), l))
+        # Reverse each window so argmin picks the most recent extreme,
+        # matching the strict '<' backwards scan of detect_ob
+        windows = sliding_window_view(extreme, lookback)[bos_idx][:, ::-1]
+        pos_rev = np.argmin(windows, axis=1)
+        value = windows[np.arange(len(bos_idx)), pos_rev]
+        found = value < 1_000_000_000
+    else:
+        extreme = np.concatenate((np.full(pad, -np.inf), h))
+        windows = sliding_window_view(extreme, lookback)[bos_idx][:, ::-1]
+        pos_rev = np.argmax(windows, axis=1)
+        value = windows[np.arange(len(bos_idx)), pos_rev]
+        found = value > -1
+
+    extreme_idx = bos_idx - pos_rev
+
+    # Sweep: a valid fractal older than the extreme, inside the lookback,
+    # that the extreme went beyond
+    swing_pad = np.concatenate((np.zeros(pad, dtype=bool), swing))
+    swing_windows = sliding_window_view(swing_pad, lookback)[bos_idx][:, ::-1]
+    older = np.arange(lookback)[None, :] > pos_rev[:, None]
+    if direction == BULLISH:
+        beyond = windows > value[:, None]
+    else:
+        beyond = windows < value[:, None]
+    swept = found & np.any(swing_windows & older & beyond, axis=1)
+
+    bos_idx = bos_idx[swept]
+    cand = extreme_idx[swept]
+    if direction == BULLISH:
+        # Green bottom candle -> use the red candle before it
+        shift = (c[cand] > o[cand]) & (cand > 0)
+        prev = np.maximum(cand - 1, 0)
+        shift &= c[prev] < o[prev]
+    else:
+        shift = (c[cand] < o[cand]) & (cand > 0)
+        prev = np.maximum(cand - 1, 0)
+        shift &= c[prev] > o[prev]
+    ob_idx = np.where(shift, cand - 1, cand)
+
+    ob_type[bos_idx] = direction
+    ob_top[bos_idx] = h[ob_idx]
+    ob_bottom[bos_idx] = l[ob_idx]
+    ob_index[bos_idx] = ob_idx
@@ -0,0 +1,201 @@
+"""
+Columnar on-disk candle store.
+
+Layout: <root>/<SYMBOL>/<timeframe>/<YYYY-MM>.npy, one float64 array of
+shape (6, n) per month whose rows are timestamp (ms), open, high, low, close
+and volume; each row is a contiguous column. Months are opened with
+np.load(mmap_mode='r'), so loading costs one file open per month regardless
+of its size and candles are only materialized when a consumer touches them.
+"""
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from src.core.candle import Candle
+from src.core.series import MarketSeries
+from src.core.timeframe import Timeframe
+
+DEFAULT_STORE_ROOT = "data/store"
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# BTCUSDT-15m-2024-01.csv (Binance monthly) / BTCUSDT_4h_2024.csv (yearly dump)
+_CSV_NAME = re.compile(r'^(?P<symbol>[A-Z0-9]+)[-_](?P<timeframe>\d+[mhd])[-_]\d{4}(?:-\d{2})?\.csv$')
+
+TimeframeLike = Union[Timeframe, str]
+
+
+def _tf_value(timeframe: TimeframeLike) -> str:
+    return timeframe if isinstance(timeframe, str) else timeframe.value
+
+
+class CandleStore:
+    """
+    Reader/writer for the columnar store.
+
+    Timeframe arguments accept the Timeframe enum or its string value ('4h').
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_ROOT):
+        self.root = Path(root)
+
+    def month_path(self, symbol: str, timeframe: TimeframeLike, year: int, month: int) -> Path:
+        return self.root / symbol / _tf_value(timeframe) / f"{year:04d}-{month:02d}.npy"
+
+    def has_month(self, symbol: str, timeframe: TimeframeLike, year: int, month: int) -> bool:
+        # os.path (not Path.exists) keeps lookups independent of callers that patch pathlib
+        return os.path.isfile(self.month_path(symbol, timeframe, year, month))
+
+    def months(self, symbol: str, timeframe: TimeframeLike) -> List[Tuple[int, int]]:
+        """Available (year, month) pairs, sorted."""
+        base = self.root / symbol / _tf_value(timeframe)
+        if not os.path.isdir(base):
+            return []
+        found = []
+        for name in sorted(os.listdir(base)):
+            match = re.fullmatch(r'(\d{4})-(\d{2})\.npy', name)
+            if match:
+                found.append((int(match.group(1)), int(match.group(2))))
+        return found
+
+    def write_month(
+        self,
+        symbol: str,
+        timeframe: TimeframeLike,
+        year: int,
+        month: int,
+        columns: Dict[str, np.ndarray]
+    ) -> Path:
+        path = self.month_path(symbol, timeframe, year, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # float64 holds ms timestamps exactly (< 2**53)
+        block = np.stack([np.asarray(columns[name], dtype=np.float64) for name in COLUMNS])
+        np.save(path, block)
+        return path
+
+    def load_columns(
+        self,
+        symbol: str,
+        timeframe: TimeframeLike,
+        year: int,
+        month: int
+    ) -> Dict[str, np.ndarray]:
+        """Columns of one month: prices/volume memory-mapped (read-only), timestamps as int64."""
+        path = self.month_path(symbol, timeframe, year, month)
+        if not self.has_month(symbol, timeframe, year, month):
+            raise FileNotFoundError(f"No stored candles for {symbol} {_tf_value(timeframe)} {year}-{month:02d}")
+        block = np.load(path, mmap_mode='r')
+        columns = {name: block[i] for i, name in enumerate(COLUMNS)}
+        columns['timestamp'] = columns['timestamp'].astype(np.int64)
+        return columns
+
+    def load_month(self, symbol: str, timeframe: Timeframe, year: int, month: int) -> MarketSeries:
+        """Array-backed MarketSeries over the memory-mapped month (no copy)."""
+        columns = self.load_columns(symbol, timeframe, year, month)
+        return MarketSeries.from_arrays(*(columns[name] for name in COLUMNS), timeframe)
+
+    def load(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        year: Optional[int] = None,
+        months: Optional[Iterable[int]] = None
+    ) -> MarketSeries:
+        """
+        Array-backed series over several months (all stored months by default).
+
+        A single month stays memory-mapped; several months are concatenated
+        into one in-memory copy of the numeric columns.
+        """
+        month_set = set(months) if months is not None else None
+        selected = [
+            (y, m) for y, m in self.months(symbol, timeframe)
+            if (year is None or y == year) and (month_set is None or m in month_set)
+        ]
+        if len(selected) == 1:
+            return self.load_month(symbol, timeframe, *selected[0])
+
+        parts = [self.load_columns(symbol, timeframe, y, m) for y, m in selected]
+        columns = [
+            np.concatenate([part[name] for part in parts]) if parts
+            else np.empty(0, dtype=np.int64 if name == 'timestamp' else np.float64)
+            for name in COLUMNS
+        ]
+        return MarketSeries.from_arrays(*columns, timeframe)
+
+    def load_candles(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        year: Optional[int] = None,
+        months: Optional[Iterable[int]] = None
+    ) -> List[Candle]:
+        """Convenience for List[Candle] consumers (materializes every candle)."""
+        return list(self.load(symbol, timeframe, year, months))
+
+
+def read_csv_columns(file_path: str) -> Dict[str, np.ndarray]:
+    """
+    Parses a Binance kline CSV into numeric columns (no Decimal / Candle objects).
+
+    Applies the same invariants as Candle.__post_init__, vectorized.
+    """
+    df = pd.read_csv(file_path, header=None, usecols=range(6), names=COLUMNS, dtype={'timestamp': np.int64})
+    columns = {name: df[name].to_numpy() for name in COLUMNS}
+    columns['timestamp'] = columns['timestamp'].astype(np.int64)
+    for name in COLUMNS[1:]:
+        columns[name] = columns[name].astype(np.float64)
+
+    o, h, l, c, v = (columns[name] for name in COLUMNS[1:])
+    invalid = (h < l) | (v < 0) | (h < o) | (h < c) | (l > o) | (l > c)
+    if invalid.any():
+        row = int(np.flatnonzero(invalid)[0])
+        raise ValueError(f"Invalid candle at row {row} of {file_path}")
+
+    order = np.argsort(columns['timestamp'], kind='stable')
+    if np.any(order != np.arange(len(order))):
+        columns = {name: column[order] for name, column in columns.items()}
+    return columns
+
+
+def convert_csv(
+    file_path: str,
+    store: CandleStore,
+    symbol: Optional[str] = None,
+    timeframe: Optional[TimeframeLike] = None
+) -> List[Path]:
+    """
+    Converts one CSV into the store, split by calendar month (UTC).
+
+    Symbol/timeframe default to the ones encoded in the file name.
+    """
+    if symbol is None or timeframe is None:
+        match = _CSV_NAME.match(os.path.basename(file_path))
+        if not match:
+            raise ValueError(f"Cannot infer symbol/timeframe from file name: {file_path}")
+        symbol = symbol or match.group('symbol')
+        timeframe = timeframe or match.group('timeframe')
+
+    columns = read_csv_columns(file_path)
+    dates = pd.to_datetime(columns['timestamp'], unit='ms', utc=True)
+    period = (dates.year * 100 + dates.month).to_numpy()
+
+    written = []
+    for key in np.unique(period):
+        mask = period == key
+        written.append(store.write_month(
+            symbol, timeframe, int(key) // 100, int(key) % 100,
+            {name: column[mask] for name, column in columns.items()}
+        ))
+    return written
+
+
+def convert_directory(source_dir: str, store: CandleStore, pattern: str = "*.csv") -> List[Path]:
+    """Converts every Binance CSV in `source_dir` whose name encodes symbol and timeframe."""
+    written = []
+    for path in sorted(Path(source_dir).glob(pattern)):
+        if _CSV_NAME.match(path.name):
+            written.extend(convert_csv(str(path), store))
+    return written
@@ -0,0 +1,25 @@
+import hashlib
+from typing import Iterable
+import numpy as np
+from src.core.candle import Candle
+from src.core.series import MarketSeries
+
+
+def candles_fingerprint(candles: Iterable[Candle]) -> str:
+    """
+    Stable content hash of a candle window (timestamp + OHLCV).
+
+    Unlike id(list) it survives list re-creation (warmup + data concatenation)
+    and is identical across processes, so it can key caches of per-window
+    precomputations. A MarketSeries is hashed from its column bytes (no
+    Candle is formatted or built); plain lists hash each candle's values.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(candles, MarketSeries):
+        for column in (candles.timestamps, candles.opens, candles.highs,
+                       candles.lows, candles.closes, candles.volumes):
+            h.update(np.ascontiguousarray(column))
+        return h.hexdigest()
+    for c in candles:
+        h.update(f"{c.timestamp},{c.open},{c.high},{c.low},{c.close},{c.volume};".encode())
+    return h.hexdigest()
@@ -0,0 +1,246 @@
+"""
+Candle/feature datasets shared across worker processes.
+
+The parent publishes a dataset once into a multiprocessing.shared_memory
+block and hands out a small picklable SharedDatasetHandle. Workers attach by
+name and get numpy views straight over the block, so the numeric data exists
+once no matter how many processes read it.
+
+Block layout (n candles, k feature columns), all C-contiguous:
+    int64   timestamp (n)
+    float64 open, high, low, close, volume (5, n)
+    float64 features (k, n), NaN where a candle has no feature row
+"""
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from src.core.candle import Candle
+from src.core.series import MarketSeries
+from src.core.timeframe import Timeframe
+from src.ml.features import FeatureExtractor
+
+_PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Datasets attached by this process, keyed by (block name, Timeframe class)
+_attached: Dict[Tuple[str, type], 'AttachedDataset'] = {}
+
+
+@dataclass(frozen=True)
+class SharedDatasetHandle:
+    """Picklable reference to a published dataset (sent to workers instead of candles)."""
+    name: str
+    timeframe: str
+    length: int
+    feature_columns: Tuple[str, ...] = ()
+
+    @property
+    def nbytes(self) -> int:
+        return 8 * self.length * (1 + len(_PRICE_COLUMNS) + len(self.feature_columns))
+
+
+def _views(buf, handle: SharedDatasetHandle) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = handle.length
+    k = len(handle.feature_columns)
+    timestamp = np.ndarray((n,), dtype=np.int64, buffer=buf, offset=0)
+    prices = np.ndarray((len(_PRICE_COLUMNS), n), dtype=np.float64, buffer=buf, offset=8 * n)
+    features = np.ndarray((k, n), dtype=np.float64, buffer=buf, offset=8 * n * (1 + len(_PRICE_COLUMNS)))
+    return timestamp, prices, features
+
+
+def _candle_columns(candles: Union[MarketSeries, Sequence[Candle]]) -> Tuple[np.ndarray, List[np.ndarray]]:
+    if isinstance(candles, MarketSeries):
+        return candles.timestamps, [candles.opens, candles.highs, candles.lows, candles.closes, candles.volumes]
+    timestamp = np.fromiter((c.timestamp for c in candles), dtype=np.int64, count=len(candles))
+    prices = [
+        np.fromiter((float(getattr(c, name)) for c in candles), dtype=np.float64, count=len(candles))
+        for name in _PRICE_COLUMNS
+    ]
+    return timestamp, prices
+
+
+class SharedDataset:
+    """
+    Owner side of a shared dataset. The publishing process keeps this object
+    alive while workers use the handle and calls close() (or uses it as a
+    context manager) to release the block.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, handle: SharedDatasetHandle):
+        self._shm = shm
+        self.handle = handle
+
+    @classmethod
+    def publish(
+        cls,
+        candles: Union[MarketSeries, Sequence[Candle]],
+        timeframe: Union[Timeframe, str],
+        features: Optional[pd.DataFrame] = None
+    ) -> 'SharedDataset':
+        """
+        Copies candles (and optionally FeatureExtractor output) into a new block.
+
+        `features` is matched to candles by timestamp: either a 'timestamp'
+        column or a DatetimeIndex as in OptimizerWorker's features map. Only
+        numeric columns are published, as float64.
+        """
+        timestamp, prices = _candle_columns(candles)
+        feature_block, feature_columns = cls._align_features(timestamp, features)
+
+        handle = SharedDatasetHandle(
+            name='',
+            timeframe=timeframe if isinstance(timeframe, str) else timeframe.value,
+            length=len(timestamp),
+            feature_columns=feature_columns
+        )
+        # SharedMemory rejects size 0
+        shm = shared_memory.SharedMemory(create=True, size=max(handle.nbytes, 1))
+        handle = SharedDatasetHandle(shm.name, handle.timeframe, handle.length, handle.feature_columns)
+
+        ts_view, price_view, feature_view = _views(shm.buf, handle)
+        ts_view[:] = timestamp
+        for i, column in enumerate(prices):
+            price_view[i] = column
+        feature_view[:] = feature_block
+        return cls(shm, handle)
+
+    @staticmethod
+    def _align_features(
+        timestamp: np.ndarray,
+        features: Optional[pd.DataFrame]
+    ) -> Tuple[np.ndarray, Tuple[str, ...]]:
+        if features is None:
+            return np.empty((0, len(timestamp))), ()
+        if 'timestamp' in features.columns:
+            features = features.set_index('timestamp')
+        index = features.index
+        if isinstance(index, pd.DatetimeIndex):
+            keys = index.as_unit('ms').asi8
+        else:
+            keys = np.asarray(index, dtype=np.int64)
+
+        numeric = features.select_dtypes(include=[np.number, bool])
+        columns = tuple(str(c) for c in numeric.columns)
+        values = numeric.loc[:, list(columns)].to_numpy(dtype=np.float64)
+
+        block = np.full((len(columns), len(timestamp)), np.nan)
+        pos = np.searchsorted(timestamp, keys)
+        found = (pos < len(timestamp)) & (timestamp[np.minimum(pos, len(timestamp) - 1)] == keys)
+        block[:, pos[found]] = values[found].T
+        return block, columns
+
+    def close(self) -> None:
+        """Releases and unlinks the block (workers must be done with it)."""
+        if self._shm is None:
+            return
+        # Forget same-process attachments so the name cannot resolve to a stale mapping
+        for key in [key for key in _attached if key[0] == self.handle.name]:
+            del _attached[key]
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> 'SharedDataset':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def publish_with_features(
+    candles: Union[MarketSeries, Sequence[Candle]],
+    timeframe: Union[Timeframe, str],
+    extractor: Optional[FeatureExtractor] = None
+) -> SharedDataset:
+    """Publishes candles plus the FeatureExtractor output computed over them (once)."""
+    timestamp, prices = _candle_columns(candles)
+    df_candles = pd.DataFrame({'timestamp': pd.to_datetime(timestamp, unit='ms')})
+    for name, column in zip(_PRICE_COLUMNS, prices):
+        df_candles[name] = column
+    features = (extractor or FeatureExtractor()).add_all_features(df_candles)
+    return SharedDataset.publish(candles, timeframe, features)
+
+
+class AttachedDataset:
+    """
+    Read-only, zero-copy worker-side view over a published dataset.
+
+    Candles carry `timeframe` (default: Timeframe(handle.timeframe)); callers
+    that import Timeframe through another path (the optimizer engine uses
+    core.timeframe) pass their own member so comparisons keep working.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        handle: SharedDatasetHandle,
+        timeframe: Optional[Timeframe] = None
+    ):
+        # Keep the mapping alive as long as the views
+        self._shm = shm
+        self.handle = handle
+        self.timeframe = timeframe if timeframe is not None else Timeframe(handle.timeframe)
+        self.timestamps, self._prices, self._features = _views(shm.buf, handle)
+        for array in (self.timestamps, self._prices, self._features):
+            array.flags.writeable = False
+        self.series = MarketSeries.from_arrays(self.timestamps, *self._prices, self.timeframe)
+        self._features_map: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self.handle.length
+
+    def index_range(self, start_ts: int, end_ts: int) -> Tuple[int, int]:
+        """[start, stop) positions of candles with start_ts <= timestamp <= end_ts."""
+        start = int(np.searchsorted(self.timestamps, start_ts, side='left'))
+        stop = int(np.searchsorted(self.timestamps, end_ts, side='right'))
+        return start, stop
+
+    def candles(self, start: int = 0, stop: Optional[int] = None) -> MarketSeries:
+        """
+        Column-backed series of a range (slice semantics): views over the block,
+        Candle objects built on access and cached per process.
+        """
+        return self.series.window(start, stop)
+
+    def between(self, start_ts: int, end_ts: int) -> MarketSeries:
+        return self.candles(*self.index_range(start_ts, end_ts))
+
+    @property
+    def features(self) -> pd.DataFrame:
+        """
+        Features indexed by candle datetime (OptimizerWorker features map
+        format), backed by the shared block. Candles without features are dropped.
+        """
+        if self._features_map is None:
+            index = pd.to_datetime(self.timestamps, unit='ms')
+            frame = pd.DataFrame(self._features.T, index=index, columns=list(self.handle.feature_columns), copy=False)
+            frame.index.name = 'timestamp'
+            if len(self.handle.feature_columns):
+                has_row = ~np.isnan(self._features).all(axis=0)
+                first = int(np.argmax(has_row)) if has_row.any() else len(has_row)
+                # FeatureExtractor only drops leading warm-up rows: slice (a view) when possible
+                frame = frame.iloc[first:] if has_row[first:].all() else frame[has_row]
+            self._features_map = frame
+        return self._features_map
+
+
+def attach(handle: SharedDatasetHandle, timeframe: Optional[Timeframe] = None) -> AttachedDataset:
+    """
+    Attaches to a published dataset by name; repeated calls reuse the mapping.
+
+    `timeframe` is the Timeframe member the candles should carry (see AttachedDataset).
+    """
+    if timeframe is not None and timeframe.value != handle.timeframe:
+        raise ValueError(f"Timeframe {timeframe.value} does not match published dataset ({handle.timeframe})")
+    key = (handle.name, type(timeframe) if timeframe is not None else Timeframe)
+    dataset = _attached.get(key)
+    if dataset is None:
+        try:
+            # Python >= 3.13: the publisher owns the block, readers must not track it
+            shm = shared_memory.SharedMemory(name=handle.name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=handle.name)
+        dataset = AttachedDataset(shm, handle, timeframe)
+        _attached[key] = dataset
+    return dataset
@@ -0,0 +1,101 @@
+# tests/agents/test_log_sink.py
+import threading
+import time
+import pytest
+from src.agents import base
+from src.agents.log_sink import AgentLogSink
+
+
+class Collector:
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+
+    def __call__(self, records):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append([r['message'] for r in records])
+
+
+def wait_for(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_flushes_in_batches_and_drains_on_close():
+    writer = Collector()
+    sink = AgentLogSink(batch_size=2, flush_interval=60, writer=writer)
+    for i in range(5):
+        assert sink.submit("w", "info", f"m{i}")
+    sink.close()
+
+    assert writer.batches == [["m0", "m1"], ["m2", "m3"], ["m4"]]
+    assert sink.written == 5 and not sink.submit("w", "INFO", "late")
+
+
+def test_flushes_partial_batch_after_interval():
+    writer = Collector()
+    sink = AgentLogSink(batch_size=100, flush_interval=0.05, writer=writer)
+    sink.submit("w", "WARNING", "alone", {"k": 1})
+
+    assert wait_for(lambda: writer.batches == [["alone"]])
+    sink.close()
+
+
+def test_min_level_filters_persistence():
+    writer = Collector()
+    sink = AgentLogSink(min_level="WARNING", writer=writer)
+    assert not sink.submit("w", "INFO", "progress")
+    assert sink.submit("w", "ERROR", "boom")
+    sink.close()
+
+    assert writer.batches == [["boom"]]
+    with pytest.raises(ValueError):
+        AgentLogSink(min_level="LOUD", writer=writer)
+
+
+def test_full_queue_never_blocks_the_caller():
+    gate = threading.Event()
+    writer = Collector(gate)
+    sink = AgentLogSink(batch_size=1, flush_interval=60, max_queue=3, writer=writer)
+
+    start = time.monotonic()
+    accepted = sum(sink.submit("w", "INFO", f"m{i}") for i in range(50))
+    assert time.monotonic() - start < 0.5
+    assert sink.dropped == 50 - accepted and accepted <= 5
+
+    gate.set()
+    sink.close()
+    assert sum(len(b) for b in writer.batches) == accepted
+
+
+def test_writer_error_disables_persistence():
+    def failing(records):
+        raise RuntimeError("db down")
+
+    sink = AgentLogSink(batch_size=1, writer=failing)
+    sink.submit("w", "INFO", "m0")
+    assert wait_for(lambda: not sink.enabled)
+    assert not sink.submit("w", "INFO", "m1")
+    sink.close()
+
+
+def test_agent_log_only_enqueues(monkeypatch):
+    writer = Collector()
+    sink = AgentLogSink(batch_size=10, flush_interval=60, writer=writer)
+    monkeypatch.setattr(base, "get_log_sink", lambda: sink)
+
+    class Agent(base.BaseAgent):
+        def run(self, config):
+            for i in range(3):
+                self.update_progress(i, 3, "step")
+            return {}
+
+    Agent("sink-test").execute({})
+    sink.close()
+
+    messages = writer.batches[0]
+    assert len(messages) == 5
+    assert messages[0] == "Agent sink-test started" and messages[-1].startswith("Agent sink-test completed")
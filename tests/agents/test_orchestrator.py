@@ -39,3 +39,66 @@ def test_orchestrator_sideways_default():
             signal = orch.get_signal(state)
             assert signal is None
             assert mock_gen.called
+
+def test_decide_with_alpha_matrix_matches_live_alphas():
+    """Con AlphaMatrix el modo WFO solo re-pondera scores y debe dar las mismas señales."""
+    import random
+    from decimal import Decimal
+    from src.core.candle import Candle
+    from src.core.timeframe import Timeframe
+
+    rng = random.Random(9)
+    candles = []
+    price = Decimal("100")
+    for i in range(200):
+        close = price + Decimal(rng.randint(-5, 5))
+        candles.append(Candle(
+            timestamp=i * 14_400_000, open=price,
+            high=max(price, close) + Decimal(rng.randint(0, 3)),
+            low=min(price, close) - Decimal(rng.randint(0, 3)),
+            close=close, volume=Decimal(rng.randint(50, 150)), timeframe=Timeframe.H4
+        ))
+        price = close
+    params = {
+        'alpha_threshold': 0.2,
+        'alpha_ob_weight_mult': 1.3,
+        'alpha_mom_weight_mult': 0.7,
+        'alpha_vol_weight_mult': 1.0,
+        'alpha_liq_weight_mult': 0.4,
+    }
+    live = MSCOrchestrator()
+    cached = MSCOrchestrator()
+    cached.use_alpha_matrix(cached.build_alpha_matrix(candles, "BTCUSDT"))
+
+    state = MarketState.empty("BTCUSDT")
+    for i, candle in enumerate(candles):
+        state = state.update(candle)
+        expected = live.decide(state, params=params)
+        signal = cached.decide(state, params=params, bar_index=i)
+        assert (expected is None) == (signal is None)
+        if expected:
+            assert signal.side == expected.side
+            assert signal.confidence == expected.confidence
+            assert signal.metadata == expected.metadata
+
+def test_decide_with_alpha_matrix_reads_regime_array():
+    """Con la matriz enlazada el régimen sale del array de la ventana, sin classify_regime por barra."""
+    from src.core.classifier import classify_regime
+    from tests.core.test_indicators import _zigzag_candles
+
+    candles = _zigzag_candles(120)
+    orch = MSCOrchestrator()
+    orch.use_alpha_matrix(orch.build_alpha_matrix(candles, "BTCUSDT", start_index=20))
+    params = {'alpha_threshold': 0.0, 'adx_trend_threshold': 18, 'atr_high_mult': 1.1}
+
+    state = MarketState.empty("BTCUSDT")
+    regimes = []
+    for i, candle in enumerate(candles):
+        state = state.update(candle)
+        if i >= 20:
+            regimes.append((i, classify_regime(state, params)))
+
+    with patch('src.agents.orchestrator.classify_regime') as mock_classify:
+        for i, expected in regimes:
+            assert orch._classify(None, params, bar_index=i) == expected
+        mock_classify.assert_not_called()
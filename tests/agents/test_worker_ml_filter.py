@@ -0,0 +1,103 @@
+# tests/agents/test_worker_ml_filter.py
+import numpy as np
+import pandas as pd
+from decimal import Decimal
+from sklearn.ensemble import RandomForestClassifier
+from src.agents.worker import OptimizerWorker
+from src.core.candle import Candle
+from src.core.timeframe import Timeframe
+from src.ml.analyzer import PatternAnalyzer
+from src.ml.features import FeatureExtractor
+
+H4_MS = 4 * 3600 * 1000
+
+
+def make_candles(n=150, start=1704067200000):
+    candles = []
+    price = 42000.0
+    for i in range(n):
+        price += ((i * 37) % 11) - 5
+        candles.append(Candle(
+            timestamp=start + i * H4_MS,
+            open=Decimal(str(price)), high=Decimal(str(price + 20)),
+            low=Decimal(str(price - 20)), close=Decimal(str(price + 3)),
+            volume=Decimal(str(10 + i % 5)), timeframe=Timeframe.H4, complete=True
+        ))
+    return candles
+
+
+def features_map_for(candles):
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime([c.timestamp for c in candles], unit='ms'),
+        'open': [float(c.open) for c in candles],
+        'high': [float(c.high) for c in candles],
+        'low': [float(c.low) for c in candles],
+        'close': [float(c.close) for c in candles],
+        'volume': [float(c.volume) for c in candles]
+    })
+    return FeatureExtractor().add_all_features(df).set_index('timestamp')
+
+
+def trained_analyzer(features_map, tmp_path):
+    X = features_map[['rsi_14', 'bb_pos', 'vol_ratio', 'macd_hist']]
+    y = (np.arange(len(X)) % 3 == 0).astype(int)
+    analyzer = PatternAnalyzer(model_path=str(tmp_path / "missing.pkl"))
+    analyzer.model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit(X, y)
+    analyzer.is_trained = True
+    return analyzer
+
+
+def test_ml_probabilities_match_per_candle_lookup(tmp_path):
+    candles = make_candles()
+    features_map = features_map_for(candles)
+    analyzer = trained_analyzer(features_map, tmp_path)
+    worker = OptimizerWorker("ml-batch")
+
+    table = worker._feature_table(features_map, candles)
+    probs = worker._ml_probabilities(analyzer, features_map, table)
+
+    assert len(probs) == len(candles)
+    for i, candle in enumerate(candles):
+        ts_key = pd.to_datetime(candle.timestamp, unit='ms')
+        if ts_key in features_map.index:
+            assert probs[i] == analyzer.predict_proba(features_map.loc[[ts_key]])
+        else:
+            assert np.isnan(probs[i])
+    # Warm-up candles have no feature row
+    assert np.isnan(probs[0]) and not np.isnan(probs[-1])
+
+    # Same window and model: cached, no rescoring
+    assert worker._feature_table(features_map, candles) is table
+    assert worker._ml_probabilities(analyzer, features_map, table) is probs
+
+
+def test_ml_probabilities_use_last_duplicate_row(tmp_path):
+    candles = make_candles()
+    features_map = features_map_for(candles)
+    analyzer = trained_analyzer(features_map, tmp_path)
+    last = features_map.index[-1]
+    # Duplicate the last timestamp with the features of another bar
+    dup = features_map.iloc[[10]].set_axis([last])
+    with_dup = pd.concat([features_map, dup])
+
+    worker = OptimizerWorker("ml-dup")
+    probs = worker._ml_probabilities(analyzer, with_dup, worker._feature_table(with_dup, candles))
+
+    assert probs[-1] == analyzer.predict_proba(with_dup.loc[[last]])
+    assert probs[-1] == analyzer.predict_proba(dup)
+
+
+def test_feature_table_rows_match_market_state_lookup():
+    candles = make_candles()
+    features_map = features_map_for(candles)
+    table = OptimizerWorker("ml-table")._feature_table(features_map, candles)
+
+    assert table.warmup == len(candles) - len(features_map)
+    for i, candle in enumerate(candles):
+        ts_key = pd.to_datetime(candle.timestamp, unit='ms')
+        assert table.has_row(i) == (ts_key in features_map.index)
+        if table.has_row(i):
+            expected = features_map.loc[ts_key].to_dict()
+            row = table.row(i)
+            assert row == expected
+            assert type(row['trend_short']) is int and type(row['rsi_14']) is float
@@ -0,0 +1,154 @@
+# tests/agents/test_worker_population.py
+import random
+import pytest
+from src.agents.worker import OptimizerWorker
+from src.optimization.param_space import get_default_param_space
+from tests.agents.test_worker_ml_filter import features_map_for, make_candles, trained_analyzer
+from tests.alphas.test_matrix import random_candles
+
+CONFIG = {
+    "pair": "BTCUSDT", "timeframe": "4h", "year": 2024, "backtest_run_id": "wfo_subtrain",
+    "initial_balance": 10000.0, "stop_loss": 100, "take_profit_multiplier": 2.0, "fee_rate": 0.001,
+    "risk_per_trade_pct": 1.0, "use_msc": True, "max_portfolio_risk": 0.10, "use_dd_scaling": True
+}
+
+
+def population(n, seed=3):
+    space = get_default_param_space()
+    random.seed(seed)
+    params_list = [space.get_defaults()] + [space.sample_random(seed=None) for _ in range(n - 1)]
+    # Umbrales bajos para que varios individuos operen
+    for params in params_list[1:4]:
+        params['alpha_threshold'] = 0.05
+    return params_list
+
+
+def test_run_population_matches_individual_runs():
+    candles = random_candles(700, 5)
+    warmup, main = candles[:200], candles[200:]
+    params_list = population(10)
+
+    expected = [OptimizerWorker("single").run(CONFIG, params=p, candles=main, warmup_candles=warmup) for p in params_list]
+    results = OptimizerWorker("population").run_population(CONFIG, params_list, candles=main, warmup_candles=warmup)
+
+    assert sum(r['total_trades'] for r in expected) > 0
+    assert results == expected
+
+
+def test_run_population_replays_bar_atr_once_per_window(monkeypatch):
+    import src.agents.worker as worker_module
+    replay = worker_module.replay_bar_atr
+    replays = []
+
+    def counting_replay(candles, symbol):
+        replays.append(len(candles))
+        return replay(candles, symbol)
+
+    monkeypatch.setattr(worker_module, 'replay_bar_atr', counting_replay)
+
+    candles = random_candles(500, 5)
+    warmup, main = candles[:150], candles[150:]
+    worker = OptimizerWorker("population")
+    first = worker.run_population(CONFIG, population(4), candles=main, warmup_candles=warmup)
+    second = worker.run_population(CONFIG, population(4, seed=9), candles=main, warmup_candles=warmup)
+
+    assert replays == [len(candles)]
+    assert second == [OptimizerWorker("single").run(CONFIG, params=p, candles=main, warmup_candles=warmup) for p in population(4, seed=9)]
+    assert first[0] == second[0]
+
+
+def test_run_population_applies_ml_filter(tmp_path, monkeypatch):
+    candles = make_candles(300)
+    features_map = features_map_for(candles)
+    analyzer = trained_analyzer(features_map, tmp_path)
+    monkeypatch.setattr(OptimizerWorker, '_load_analyzer', lambda self, *args: analyzer)
+    params_list = population(6, seed=11)
+    kwargs = dict(candles=candles[60:], warmup_candles=candles[:60], features_map=features_map, use_ml_model=True, ml_prob_threshold=0.4)
+
+    expected = [OptimizerWorker("single").run(CONFIG, params=p, **kwargs) for p in params_list]
+    results = OptimizerWorker("population").run_population(CONFIG, params_list, **kwargs)
+
+    assert sum(r['ml_filtered_trades'] for r in expected) > 0
+    assert results == expected
+
+
+def test_run_population_requires_msc_params():
+    worker = OptimizerWorker("population")
+    candles = random_candles(50, 1)
+    with pytest.raises(ValueError):
+        worker.run_population({**CONFIG, "use_msc": False}, [{"alpha_threshold": 0.1}], candles=candles)
+    with pytest.raises(ValueError):
+        worker.run_population(CONFIG, [{}], candles=candles)
+    assert worker.run_population(CONFIG, [], candles=candles) == []
+
+
+def test_fast_exits_run_matches_bar_by_bar_run():
+    candles = random_candles(600, 8)
+    warmup, main = candles[:150], candles[150:]
+    worker = OptimizerWorker("fast")
+    for params in population(4, seed=21):
+        expected = worker.run(CONFIG, params=params, candles=main, warmup_candles=warmup)
+        assert worker.run(CONFIG, params=params, candles=main, warmup_candles=warmup, fast_exits=True) == expected
+
+
+def test_float_numeric_mode_tracks_decimal_audit():
+    """Modo float (búsqueda GA) vs Decimal (auditoría): mismos trades, métricas casi iguales."""
+    candles = random_candles(700, 5)
+    warmup, main = candles[:200], candles[200:]
+    params_list = population(10)
+    worker = OptimizerWorker("numeric")
+
+    report = worker.compare_numeric_modes(CONFIG, params_list, candles=main, warmup_candles=warmup)
+
+    assert len(report) == len(params_list)
+    assert sum(r['total_trades']['decimal'] for r in report) > 0
+    for divergence in report:
+        assert divergence['total_trades']['abs_diff'] == 0
+        assert divergence['final_balance']['rel_diff'] < 1e-9
+
+    single = worker.run(CONFIG, params=params_list[1], candles=main, warmup_candles=warmup, numeric_mode='float')
+    assert single['total_trades'] == report[1]['total_trades']['float']
+    with pytest.raises(ValueError):
+        worker.run({**CONFIG, "use_msc": False}, candles=main, numeric_mode='float')
+    with pytest.raises(ValueError):
+        worker.run_population(CONFIG, params_list, candles=main, numeric_mode='fixed')
+
+
+def test_population_fitness_falls_back_to_individual_runs(monkeypatch):
+    """Si run_population falla, la generación se evalúa con worker.run (no toda en -inf)."""
+    from scripts.run_wfo import create_fitness_function, create_population_fitness_function
+
+    candles = random_candles(700, 5)
+    warmup, subtrain, valtrain = candles[:200], candles[200:500], candles[500:]
+    params_list = population(4)
+    space = get_default_param_space()
+    worker = OptimizerWorker("population")
+    single = create_fitness_function(worker, subtrain, valtrain, space, warmup)
+    expected = [single(p) for p in params_list]
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(worker, 'run_population', broken)
+    fitnesses = create_population_fitness_function(worker, subtrain, valtrain, space, warmup)(params_list)
+
+    assert fitnesses == expected
+
+
+def test_runs_accept_shared_dataset_windows():
+    """Tramos del dataset compartido (MarketSeries por columnas) = mismas velas en listas."""
+    from src.core.timeframe import Timeframe
+    from src.utils.shared_dataset import SharedDataset, attach
+
+    candles = random_candles(600, 5)
+    params_list = population(4)
+    with SharedDataset.publish(candles, Timeframe.H4) as shared:
+        dataset = attach(shared.handle)
+        warmup, main = dataset.candles(0, 150), dataset.candles(150)
+        as_lists = dict(candles=list(main), warmup_candles=list(warmup))
+
+        worker = OptimizerWorker("shared")
+        assert worker.run(CONFIG, params=params_list[1], candles=main, warmup_candles=warmup) == \
+            OptimizerWorker("lists").run(CONFIG, params=params_list[1], **as_lists)
+        assert worker.run_population(CONFIG, params_list, candles=main, warmup_candles=warmup) == \
+            OptimizerWorker("lists").run_population(CONFIG, params_list, **as_lists)
@@ -14,12 +14,12 @@ def test_worker_includes_symbol_in_trade_record():
     # Mock para capturar lo que se guarda
     captured_trades = []
     
-    def capture_trade(db, trade_data):
-        captured_trades.append(trade_data)
-        return MagicMock()
+    def capture_trades(db, trades_data):
+        captured_trades.extend(trades_data)
+        return len(trades_data)
     
-    # Mockeamos TradeRepository.create para capturar los datos del trade
-    with patch('src.agents.worker.TradeRepository.create', side_effect=capture_trade):
+    # Mockeamos TradeRepository.bulk_ingest para capturar los datos del trade
+    with patch('src.agents.worker.TradeRepository.bulk_ingest', side_effect=capture_trades):
         # Mock de vela mínima
         mock_candle = MagicMock()
         mock_candle.timestamp = 1704067200000.0 # 2024-01-01
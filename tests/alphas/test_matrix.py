@@ -0,0 +1,114 @@
+import random
+import numpy as np
+import pytest
+from decimal import Decimal
+from src.core.candle import Candle
+from src.core.market import MarketState
+from src.core.timeframe import Timeframe
+from src.alphas.matrix import AlphaMatrix
+from src.alphas.combiner import AlphaCombiner
+from src.alphas.ob_quality import Alpha_OB_Quality
+from src.alphas.momentum import Alpha_Momentum
+from src.alphas.volatility import Alpha_Volatility
+from src.alphas.liquidity import Alpha_Liquidity
+
+def random_candles(n: int, seed: int):
+    rng = random.Random(seed)
+    candles = []
+    price = Decimal("100")
+    for i in range(n):
+        open_p = price
+        close_p = price + Decimal(rng.randint(-5, 5))
+        candles.append(Candle(
+            timestamp=i * 14_400_000,
+            open=open_p,
+            high=max(open_p, close_p) + Decimal(rng.randint(0, 3)),
+            low=min(open_p, close_p) - Decimal(rng.randint(0, 3)),
+            close=close_p,
+            volume=Decimal(rng.randint(50, 150)),
+            timeframe=Timeframe.H4
+        ))
+        price = close_p
+    return candles
+
+def alphas():
+    return [Alpha_OB_Quality(), Alpha_Momentum(), Alpha_Volatility(), Alpha_Liquidity()]
+
+def replay(candles):
+    states = []
+    market = MarketState.empty("BTCUSDT")
+    for c in candles:
+        market = market.update(c)
+        states.append(market)
+    return states
+
+def test_matrix_columns_match_get_score():
+    """Cada columna debe coincidir con get_score barra a barra."""
+    candles = random_candles(300, 5)
+    matrix = AlphaMatrix.build(candles, alphas())
+    states = replay(candles)
+
+    assert len(matrix) == 300
+    for alpha in alphas():
+        column = matrix.column(type(alpha).__name__)
+        expected = [alpha.get_score(s) for s in states]
+        assert column.tolist() == expected
+
+def test_matrix_weighted_score_matches_combiner():
+    """La suma ponderada vectorizada es idéntica al combiner escalar."""
+    candles = random_candles(200, 11)
+    matrix = AlphaMatrix.build(candles, alphas())
+    combiner = AlphaCombiner(list(zip(alphas(), [1.5, 2.0, 0.5, 0.8])))
+    states = replay(candles)
+
+    window = combiner.get_aggregate_scores(matrix)
+    assert window.tolist() == [combiner.get_aggregate_score(s) for s in states]
+
+    combiner.use_matrix(matrix)
+    for i, state in enumerate(states):
+        live = combiner.get_signal(state, threshold=0.2)
+        cached = combiner.get_signal(state, threshold=0.2, bar_index=i)
+        assert (live is None) == (cached is None)
+        if live:
+            assert live.side == cached.side
+            assert live.confidence == cached.confidence
+
+def test_matrix_signal_directions():
+    candles = random_candles(150, 2)
+    matrix = AlphaMatrix.build(candles, alphas())
+    weights = [("Alpha_Momentum", 1.0), ("Alpha_Liquidity", 0.0)]
+
+    directions = matrix.signal_directions(weights, threshold=0.3)
+    score = matrix.column("Alpha_Momentum")
+
+    assert directions.dtype == np.int8
+    assert np.all(directions[score >= 0.3] == 1)
+    assert np.all(directions[score <= -0.3] == -1)
+    assert np.all(directions[np.abs(score) < 0.3] == 0)
+
+def test_matrix_population_directions_match_each_individual():
+    candles = random_candles(150, 2)
+    matrix = AlphaMatrix.build(candles, alphas())
+    names = ["Alpha_OB_Quality", "Alpha_Momentum", "Alpha_Volatility", "Alpha_Liquidity"]
+    weights = np.array([[1.5, 2.0, 0.5, 0.8], [0.3, 1.7, 0.0, 1.1], [0.0, 0.0, 0.0, 0.0]])
+    thresholds = np.array([0.2, 0.05, 0.1])
+
+    directions = matrix.population_directions(names, weights, thresholds)
+
+    assert directions.shape == (3, len(candles)) and directions.dtype == np.int8
+    for k in range(3):
+        expected = matrix.signal_directions(list(zip(names, weights[k].tolist())), thresholds[k])
+        np.testing.assert_array_equal(directions[k], expected)
+
+def test_matrix_skips_warmup_rows():
+    candles = random_candles(120, 4)
+    matrix = AlphaMatrix.build(candles, [Alpha_Momentum()], start_index=60)
+
+    assert np.all(matrix.scores[:60] == 0.0)
+    assert matrix.start_index == 60
+    assert matrix.column("Alpha_Momentum")[60:].tolist() == \
+        [Alpha_Momentum().get_score(s) for s in replay(candles)[60:]]
+
+def test_matrix_rejects_duplicate_alphas():
+    with pytest.raises(ValueError):
+        AlphaMatrix.build(random_candles(10, 1), [Alpha_Momentum(), Alpha_Momentum()])
@@ -1,5 +1,6 @@
 # tests/alphas/test_ml_confidence.py
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import MagicMock, patch
 from src.alphas.ml_confidence import Alpha_ML_Confidence
@@ -60,3 +61,69 @@ def test_ml_confidence_neutral_score():
         
         score = alpha.get_score(state)
         assert score == 0.0
+
+class _RsiAnalyzer:
+    """Analyzer determinista: prob = rsi_14 / 100 de la última fila."""
+    is_trained = True
+
+    def predict_proba(self, candle_features):
+        return float(candle_features['rsi_14'].iloc[-1]) / 100.0
+
+def test_ml_confidence_streaming_matches_batch_features():
+    """El modo streaming da el mismo score que extraer features sobre toda la serie."""
+    from decimal import Decimal
+    from src.core.candle import Candle
+    from src.core.timeframe import Timeframe
+    
+    alpha = Alpha_ML_Confidence(analyzer=_RsiAnalyzer())
+    market = MarketState.empty("BTCUSDT")
+    price = 42000.0
+    for i in range(120):
+        price += ((i * 37) % 11) - 5
+        market = market.update(Candle(
+            timestamp=1704067200000 + i * 14_400_000,
+            open=Decimal(str(price)), high=Decimal(str(price + 20)),
+            low=Decimal(str(price - 20)), close=Decimal(str(price + 3)),
+            volume=Decimal("10"), timeframe=Timeframe.H4, complete=True
+        ))
+        score = alpha.get_score(market)
+        if len(market.h4) >= 50:
+            batch_prob = _RsiAnalyzer().predict_proba(alpha._batch_features(market.h4))
+            assert score == pytest.approx(max(-1.0, min(1.0, (batch_prob - 0.5) * 2.0)), abs=1e-9)
+    
+    # Solo se alimentaron velas nuevas a un único stream
+    assert alpha._stream.count == 120
+
+def test_ml_confidence_get_scores_batches_replay(tmp_path):
+    """get_scores (AlphaMatrix) da lo mismo que get_score barra a barra."""
+    from decimal import Decimal
+    from sklearn.ensemble import RandomForestClassifier
+    from src.core.candle import Candle
+    from src.core.timeframe import Timeframe
+    from src.ml.analyzer import PatternAnalyzer
+    
+    rng = np.random.default_rng(3)
+    X = pd.DataFrame({'rsi_14': rng.uniform(0, 100, 300), 'bb_pos': rng.normal(size=300)})
+    analyzer = PatternAnalyzer(model_path=str(tmp_path / "missing.pkl"))
+    analyzer.model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit(X, X['rsi_14'] > 50)
+    analyzer.is_trained = True
+    
+    market = MarketState.empty("BTCUSDT")
+    states = []
+    price = 42000.0
+    for i in range(150):
+        price += ((i * 37) % 11) - 5
+        market = market.update(Candle(
+            timestamp=1704067200000 + i * 14_400_000,
+            open=Decimal(str(price)), high=Decimal(str(price + 20)),
+            low=Decimal(str(price - 20)), close=Decimal(str(price + 3)),
+            volume=Decimal("10"), timeframe=Timeframe.H4, complete=True
+        ))
+        states.append(market)
+    
+    scores = Alpha_ML_Confidence(analyzer=analyzer).get_scores(states)
+    expected = [Alpha_ML_Confidence(analyzer=analyzer).get_score(s) for s in states]
+    
+    assert scores.tolist() == expected
+    assert scores[:49].tolist() == [0.0] * 49
+    assert np.any(scores != 0.0)
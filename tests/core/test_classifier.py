@@ -1,5 +1,6 @@
 # tests/core/test_classifier.py
 import pytest
+import numpy as np
 from unittest.mock import MagicMock
 from src.core.classifier import classify_regime
 from src.core.regime import MarketRegime
@@ -41,3 +42,41 @@ def test_classify_breakout_pending():
     state.adx = 10.0
     
     assert classify_regime(state) == MarketRegime.BREAKOUT_PENDING
+
+def _replay(candles):
+    states = []
+    state = MarketState.empty("BTCUSDT")
+    for c in candles:
+        state = state.update(c)
+        states.append(state)
+    return states
+
+@pytest.mark.parametrize("params", [
+    None,
+    {},
+    {"adx_trend_threshold": 18, "adx_sideways_threshold": 12, "atr_high_mult": 1.1, "atr_low_mult": 0.9},
+    {"adx_trend_threshold": 30, "adx_sideways_threshold": 22, "atr_high_mult": 1.02, "atr_low_mult": 0.98},
+    {"adx_trend_threshold": 60, "atr_high_mult": 1.3, "atr_low_mult": 1.0},
+])
+def test_classify_regime_series_matches_scalar(params):
+    """Una pasada NumPy sobre la ventana = classify_regime barra a barra."""
+    from src.core.classifier import REGIME_CODES, classify_regime_series, regime_indicator_arrays
+    from tests.core.test_indicators import _zigzag_candles
+
+    states = _replay(_zigzag_candles(150))
+    codes = classify_regime_series(regime_indicator_arrays(states), params)
+
+    assert codes.dtype == np.int8
+    assert [REGIME_CODES[c] for c in codes] == [classify_regime(s, params) for s in states]
+
+def test_regime_indicator_arrays_without_shared_series():
+    """Estados de series distintas (o H4 vacío): se leen uno por uno con los mismos defaults."""
+    from src.core.classifier import REGIME_CODES, classify_regime_series, regime_indicator_arrays
+    from tests.core.test_indicators import _zigzag_candles
+
+    states = [MarketState.empty("BTCUSDT")] + _replay(_zigzag_candles(40))[::-1]
+    arrays = regime_indicator_arrays(states)
+
+    assert arrays['adx'][0] == 20.0 and arrays['atr'][0] == 1.0 and arrays['ema_alignment'][0] == 0.0
+    codes = classify_regime_series(arrays)
+    assert [REGIME_CODES[c] for c in codes] == [classify_regime(s) for s in states]
@@ -0,0 +1,115 @@
+# tests/core/test_indicator_graph.py
+import pytest
+import numpy as np
+import pandas as pd
+from decimal import Decimal
+from src.alphas.momentum import Alpha_Momentum
+from src.alphas.volatility import Alpha_Volatility
+from src.core.classifier import REGIME_INDICATORS
+from src.core.indicator_graph import (
+    INDICATORS, IndicatorGraph, dependencies, indicator, indicator_at, window_indicators
+)
+from src.core.market import MarketState
+from src.ml.features import FeatureExtractor
+from src.strategy.engine import TJRStrategy
+from tests.core.test_indicators import _zigzag_candles
+
+_ALIGNMENT = {'bullish': 1, 'bearish': -1, 'neutral': 0}
+
+
+def _replay(n):
+    states = []
+    state = MarketState.empty("BTCUSDT")
+    for c in _zigzag_candles(n):
+        state = state.update(c)
+        states.append(state)
+    return states
+
+
+def test_dependencies_are_resolved_in_order():
+    order = dependencies(['atr_sma_14', 'macd'])
+    assert order.index('prev_close') < order.index('true_range') < order.index('atr_sma_14')
+    assert order.index('ema_12') < order.index('macd')
+    assert 'close' not in order
+
+    with pytest.raises(KeyError):
+        dependencies(['nope'])
+    with pytest.raises(ValueError):
+        indicator('rsi', 'close')(lambda close: close)
+    with pytest.raises(KeyError):
+        indicator('needs_unknown', 'nope')(lambda x: x)
+
+
+def test_declared_indicators_are_registered():
+    consumers = [Alpha_Momentum.indicators, Alpha_Volatility.indicators, REGIME_INDICATORS,
+                 FeatureExtractor.INDICATORS]
+    for names in consumers:
+        assert all(name in INDICATORS for name in names)
+
+
+def test_window_values_match_market_state_per_bar():
+    states = _replay(120)
+    graph = window_indicators(states[-1].h4)
+
+    np.testing.assert_array_equal(graph.get('rsi'), [s.rsi[-1] for s in states])
+    np.testing.assert_array_equal(graph.get('atr'), [s.atr[-1] for s in states])
+    np.testing.assert_array_equal(graph.get('adx'), [s.adx for s in states])
+    np.testing.assert_array_equal(graph.get('atr_avg_14'), [s.atr_avg_14 for s in states])
+    np.testing.assert_array_equal(graph.get('ema_alignment'), [_ALIGNMENT[s.ema_alignment] for s in states])
+
+
+def test_nodes_are_evaluated_once_per_window():
+    states = _replay(80)
+    series = states[-1].h4
+    graph = window_indicators(series)
+
+    Alpha_Momentum().get_scores(states)
+    Alpha_Volatility().get_scores(states)
+    graph.compute(REGIME_INDICATORS)
+
+    assert window_indicators(states[40].h4) is graph
+    # Wilder columns come from the MarketState stream, not from a second replay
+    assert 'wilder_14' in graph and 'wilder_14' not in graph.evaluated
+    assert len(graph.evaluated) == len(set(graph.evaluated))
+    assert not graph.get('rsi').flags.writeable
+
+    # Without a stream the node replays IndicatorState: same values
+    replayed = IndicatorGraph.from_series(series)
+    np.testing.assert_array_equal(replayed.get('adx'), graph.get('adx'))
+    assert replayed.evaluated.count('wilder_14') == 1
+
+
+def test_alpha_window_scores_match_get_score():
+    states = _replay(100)
+    for alpha in (Alpha_Momentum(), Alpha_Volatility(), Alpha_Volatility(period=5)):
+        assert alpha.get_scores(states).tolist() == [alpha.get_score(s) for s in states]
+
+
+def test_atr_point_value_matches_window_and_strategy():
+    candles = _zigzag_candles(60)
+    series = _replay(60)[-1].h4
+    window = window_indicators(series).get('atr_sma_14')
+
+    for i in range(13, 60):
+        assert indicator_at(series, 'atr_sma_14', i) == window[i]
+
+    # TJRStrategy keeps the exact Decimal mean of the same 14 true ranges
+    tr = [max(c.high - c.low, abs(c.high - p.close), abs(c.low - p.close)) for p, c in zip(candles, candles[1:])]
+    expected = sum(tr[-14:]) / 14
+    atr = TJRStrategy()._calculate_atr(series)
+    assert isinstance(atr, Decimal) and atr == expected
+    assert float(atr) == pytest.approx(window[-1], rel=1e-12)
+    assert TJRStrategy()._calculate_atr(_replay(14)[-1].h4) is None
+
+
+def test_feature_columns_come_from_graph_nodes():
+    series = _replay(260)[-1].h4
+    graph = IndicatorGraph.from_series(series)
+    df = pd.DataFrame({'open': series.opens, 'high': series.highs, 'low': series.lows,
+                       'close': series.closes, 'volume': series.volumes})
+    features = FeatureExtractor().add_all_features(df)
+    rows = features.index.to_numpy()
+
+    np.testing.assert_array_equal(features['ema_200'], graph.get('ema_200')[rows])
+    np.testing.assert_array_equal(features['atr_14'], graph.get('atr_sma_14')[rows])
+    np.testing.assert_array_equal(features['rsi_14'], graph.get('rsi_sma_14')[rows])
@@ -0,0 +1,78 @@
+# tests/core/test_indicators.py
+import pytest
+from decimal import Decimal
+from src.core.candle import Candle
+from src.core.timeframe import Timeframe
+from src.core.market import (
+    MarketState, calculate_rsi, calculate_atr, calculate_adx, calculate_ema
+)
+from src.core.indicators import IndicatorState
+
+def _zigzag_candles(n: int):
+    """Deterministic H4 candles with trends, pullbacks and gaps."""
+    candles = []
+    price = Decimal("100")
+    for i in range(n):
+        step = Decimal((i * 7) % 11 - 5) + (Decimal("2") if (i // 30) % 2 == 0 else Decimal("-2"))
+        open_p = price
+        close_p = price + step
+        high = max(open_p, close_p) + Decimal((i * 3) % 5)
+        low = min(open_p, close_p) - Decimal((i * 5) % 4)
+        candles.append(Candle(
+            timestamp=i * 14_400_000, open=open_p, high=high, low=low, close=close_p,
+            volume=Decimal("10"), timeframe=Timeframe.H4, complete=True
+        ))
+        price = close_p
+    return candles
+
+@pytest.mark.parametrize("n", [5, 14, 27, 28, 29, 60, 150])
+def test_streaming_indicators_match_ta(n):
+    """El estado incremental debe coincidir con los helpers batch (ta)."""
+    state = MarketState.empty("BTCUSDT")
+    for c in _zigzag_candles(n):
+        state = state.update(c)
+
+    assert list(state.rsi) == pytest.approx(calculate_rsi(state.h4), abs=1e-9)
+    assert list(state.atr) == pytest.approx(calculate_atr(state.h4), abs=1e-9)
+    assert state.adx == pytest.approx(calculate_adx(state.h4), abs=1e-9)
+    assert state._indicators.ema(20) == pytest.approx(calculate_ema(state.h4, 20), rel=1e-9)
+    assert state._indicators.ema(50) == pytest.approx(calculate_ema(state.h4, 50), rel=1e-9)
+
+def test_streaming_state_is_carried_and_branch_safe():
+    """update() avanza el estado sin alterar snapshots anteriores."""
+    candles = _zigzag_candles(40)
+    state = MarketState.empty("BTCUSDT")
+    for c in candles[:30]:
+        state = state.update(c)
+
+    rsi_before = list(state.rsi)
+    advanced = state.update(candles[30])
+    branched = state.update(candles[31])
+
+    assert list(state.rsi) == rsi_before
+    assert len(advanced.rsi) == len(branched.rsi) == 31
+    assert advanced._indicators is not state._indicators
+
+def test_non_h4_candles_do_not_advance_indicators():
+    state = MarketState.empty("BTCUSDT").update(_zigzag_candles(1)[0])
+    m5 = Candle(
+        timestamp=1, open=Decimal("1"), high=Decimal("2"), low=Decimal("0"), close=Decimal("1"),
+        volume=Decimal("1"), timeframe=Timeframe.M5
+    )
+    new_state = state.update(m5)
+    assert new_state._indicators is state._indicators
+
+def test_direct_construction_bootstraps_on_update():
+    """Un MarketState construido a mano se inicializa desde su serie H4."""
+    candles = _zigzag_candles(50)
+    base = MarketState.empty("BTCUSDT")
+    for c in candles[:49]:
+        base = base.update(c)
+    manual = MarketState("BTCUSDT", base.m5, base.m15, base.h1, base.h4)
+
+    streamed = base.update(candles[49])
+    bootstrapped = manual.update(candles[49])
+
+    assert list(bootstrapped.atr) == pytest.approx(list(streamed.atr))
+    assert bootstrapped.adx == pytest.approx(streamed.adx)
+    assert isinstance(bootstrapped._indicators, IndicatorState)
@@ -1,4 +1,6 @@
 import pytest
+import numpy as np
+from decimal import Decimal
 from core.candle import Candle
 from core.series import MarketSeries
 from core.timeframe import Timeframe
@@ -61,3 +63,87 @@ def test_series_empty_access():
     assert len(series) == 0
     with pytest.raises(IndexError):
         _ = series.current
+
+def test_series_add_shares_buffer_without_leaking():
+    """Verify views created from the same parent never see each other's candles."""
+    base = MarketSeries([create_candle(1000)])
+    s2 = base.add(create_candle(2000))
+    s3 = s2.add(create_candle(3000))
+
+    # Branch from s2 after s3 already extended the shared buffer
+    branch = s2.add(create_candle(4000))
+
+    assert [c.timestamp for c in s3] == [1000, 2000, 3000]
+    assert [c.timestamp for c in branch] == [1000, 2000, 4000]
+    assert len(base) == 1
+    assert s2.get(-1).timestamp == 2000
+
+def test_series_out_of_order_add_keeps_sorting():
+    """Verify a late candle is still placed in timestamp order."""
+    series = MarketSeries([create_candle(1000), create_candle(3000)])
+    series = series.add(create_candle(2000))
+
+    assert [c.timestamp for c in series] == [1000, 2000, 3000]
+    assert list(series.timestamps) == [1000, 2000, 3000]
+
+def test_series_columnar_views():
+    """Verify numeric columns mirror the candles and are read-only."""
+    series = MarketSeries([])
+    for ts in range(1000):
+        series = series.add(create_candle(ts))
+
+    assert len(series.closes) == 1000
+    assert series.closes[-1] == 105.0
+    assert series.highs[0] == 110.0
+    assert series.timestamps[-1] == 999
+    with pytest.raises(ValueError):
+        series.closes[0] = 1.0
+
+def test_series_from_arrays_builds_candles_lazily():
+    ts = np.array([2000, 1000], dtype=np.int64)
+    o = np.array([11.5, 10.0]); h = np.array([12.0, 11.0]); l = np.array([11.0, 9.5])
+    c = np.array([11.75, 10.5]); v = np.array([3.0, 1.25])
+
+    series = MarketSeries.from_arrays(ts, o, h, l, c, v, Timeframe.H4)
+
+    assert series.timestamps.tolist() == [1000, 2000]
+    assert series.current.close == Decimal("11.75")
+    assert series.get(0).volume == Decimal("1.25")
+    assert series.get(0) is series.get(0)
+    assert [candle.timestamp for candle in series] == [1000, 2000]
+
+def test_series_window_slices_columns_and_shares_candles():
+    n = 10
+    ts = np.arange(n, dtype=np.int64) * 1000
+    c = np.arange(n) + 10.0; o = c - 0.5; h = c + 1.0; l = c - 1.0; v = np.ones(n)
+    series = MarketSeries.from_arrays(ts, o, h, l, c, v, Timeframe.H4)
+
+    window = series.window(3, 6)
+    assert window.closes.tolist() == [13.0, 14.0, 15.0]
+    assert np.shares_memory(window.closes, c)
+    # Solo se construyen las velas del rango pedido, una vez para ambos
+    assert window[-1] is series.get(5)
+    assert series._buffer.candles._cache.count(None) == n - 1
+    assert [candle.timestamp for candle in series[7:9]] == [7000, 8000]
+    assert series._buffer.candles._cache.count(None) == n - 3
+    assert len(series.window(8, 2)) == 0
+    assert series.window(-2).timestamps.tolist() == [8000, 9000]
+
+    joined = MarketSeries.concat([series.window(0, 2), [create_candle(5000)], series.window(8)])
+    assert joined.timestamps.tolist() == [0, 1000, 5000, 8000, 9000]
+    assert joined[0] is series.get(0)
+    assert joined.closes.tolist()[2] == 105.0
+    assert MarketSeries.concat([[], window]) is window
+
+def test_column_decimals_match_float_repr():
+    from core.series import _decimals
+
+    rng = np.random.default_rng(7)
+    values = np.concatenate([
+        rng.integers(1, 10**7, 500) / 100.0,
+        rng.integers(1, 10**9, 500) / 1e8,
+        rng.random(500) * 1e5,
+        [0.0, -0.0, 100.0, -3.25, 1e16, 1e-5, 0.1 + 0.2, 123456789012345.6, np.nan, np.inf]
+    ])
+
+    assert [str(d) for d in _decimals(values)] == [str(Decimal(repr(float(v)))) for v in values]
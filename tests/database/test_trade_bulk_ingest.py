@@ -0,0 +1,126 @@
+# tests/database/test_trade_bulk_ingest.py
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+from src.database.repository import TradeRepository
+
+
+def trade(i, **overrides):
+    data = {
+        'timestamp': datetime(2024, 1, 1, i % 24),
+        'pair': 'BTCUSDT',
+        'symbol': 'BTCUSDT',
+        'timeframe': '4h',
+        'side': 'LONG',
+        'entry_price': Decimal("42000.5"),
+        'exit_price': Decimal("42100.25"),
+        'stop_loss': Decimal("41900"),
+        'take_profit': Decimal("42201"),
+        'result': 'WIN',
+        'profit_loss': Decimal("12.3456789"),
+        'profit_loss_pct': Decimal("0.29"),
+        'risk_reward': 2.0,
+        'market_state': {'rsi': 55.5, 'atr': Decimal("120.5"), 'trend': 'up'},
+        'strategy_version': 'MSC_v1_Worker',
+        'backtest_run_id': '00000000-0000-0000-0000-000000000001',
+        'worker_id': 'w1',
+        'agent_name': None,
+        'market_regime': 'Unknown'
+    }
+    data.update(overrides)
+    return data
+
+
+def session(dialect, cursor=None):
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = dialect
+    db.connection.return_value.connection.cursor.return_value = cursor
+    return db
+
+
+class CopyExpertCursor:
+    """Cursor estilo psycopg2."""
+    def __init__(self):
+        self.calls = []
+
+    def copy_expert(self, sql, stream):
+        self.calls.append((sql, stream.read()))
+
+    def close(self):
+        pass
+
+
+class CopyCursor:
+    """Cursor estilo psycopg 3 (cursor.copy como context manager)."""
+    def __init__(self):
+        self.calls = []
+        self.sql = None
+
+    def copy(self, sql):
+        self.sql = sql
+        cursor = self
+
+        class _Copy:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def write(self, data):
+                cursor.calls.append((sql, data))
+        return _Copy()
+
+    def close(self):
+        pass
+
+
+def parse_copy(sql, payload):
+    columns = sql[sql.index('(') + 1:sql.index(')')].split(', ')
+    return [dict(zip(columns, values)) for values in csv.reader(io.StringIO(payload))]
+
+
+@pytest.mark.parametrize("cursor_cls", [CopyExpertCursor, CopyCursor])
+def test_bulk_ingest_streams_one_copy_per_batch(cursor_cls):
+    cursor = cursor_cls()
+    trades = [trade(i) for i in range(300)]
+    trades[1]['worker_id'] = ''
+
+    assert TradeRepository.bulk_ingest(session('postgresql', cursor), trades) == 300
+
+    assert len(cursor.calls) == 1
+    sql, payload = cursor.calls[0]
+    assert sql.startswith("COPY trades (") and "FORMAT csv" in sql
+    rows = parse_copy(sql, payload)
+    assert len(rows) == 300
+    first = rows[0]
+    assert 'id' not in first
+    assert first['entry_price'] == "42000.5" and first['profit_loss'] == "12.3456789"
+    assert json.loads(first['market_state']) == {'rsi': 55.5, 'atr': 120.5, 'trend': 'up'}
+    assert first['agent_name'] == '\\N'          # NULL
+    assert rows[1]['worker_id'] == ''            # cadena vacía, no NULL
+    assert first['timestamp'] == '2024-01-01T00:00:00'
+    assert len({row['trade_id'] for row in rows}) == 300
+
+
+def test_bulk_ingest_falls_back_to_executemany():
+    db = session('sqlite')
+    trades = [trade(i) for i in range(3)]
+
+    assert TradeRepository.bulk_ingest(db, trades) == 3
+
+    statement, rows = db.execute.call_args[0]
+    assert statement.table.name == 'trades'
+    assert len(rows) == 3 and rows[0]['market_state'] == trades[0]['market_state']
+    assert all(row['trade_id'] is not None and row['created_at'] is not None for row in rows)
+    db.connection.assert_not_called()
+
+
+def test_bulk_ingest_validates_columns():
+    assert TradeRepository.bulk_ingest(session('postgresql'), []) == 0
+    with pytest.raises(ValueError):
+        TradeRepository.bulk_ingest(session('sqlite'), [trade(0, not_a_column=1)])
@@ -0,0 +1,115 @@
+"""
+Tests para el cache de fitness del GA.
+"""
+from src.optimization.fitness_cache import FitnessCache, canonical_params, current_code_version
+from src.optimization.genetic_algorithm import GeneticAlgorithm, GAConfig, Individual
+from src.optimization.param_space import get_default_param_space
+
+
+def test_canonical_params_ignores_order_and_int_float():
+    assert canonical_params({"a": 2, "b": 0.5}) == canonical_params({"b": 0.5, "a": 2.0})
+    assert canonical_params({"a": 2}) != canonical_params({"a": 2.01})
+
+
+def test_cache_key_depends_on_window_and_code_version():
+    params = {"alpha_threshold": 0.5}
+    base = FitnessCache("window-1", code_version="v1")
+
+    assert base.key(params) == FitnessCache("window-1", code_version="v1").key(params)
+    assert base.key(params) != FitnessCache("window-2", code_version="v1").key(params)
+    assert base.key(params) != FitnessCache("window-1", code_version="v2").key(params)
+    assert current_code_version() == current_code_version()
+
+
+def test_cache_hits_and_misses():
+    cache = FitnessCache("w", code_version="v")
+    params = {"x": 1.0}
+
+    assert cache.get(params) is None
+    cache.put(params, 1.5)
+    assert cache.get(params) == 1.5
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_cache_persists_to_disk(tmp_path):
+    path = tmp_path / "fitness.jsonl"
+    cache = FitnessCache("w", code_version="v", path=str(path))
+    cache.put({"x": 1.0}, 2.0)
+    cache.put({"x": 2.0}, float("-inf"))
+    cache.flush()
+
+    # Línea truncada de un run interrumpido
+    with open(path, "a") as f:
+        f.write('{"key": "abc", "fitn')
+
+    reloaded = FitnessCache("w", code_version="v", path=str(path))
+    assert len(reloaded) == 2
+    assert reloaded.get({"x": 1.0}) == 2.0
+    assert reloaded.get({"x": 2.0}) == float("-inf")
+
+    # Otra versión de código no reutiliza entradas
+    assert FitnessCache("w", code_version="v2", path=str(path)).get({"x": 1.0}) is None
+
+
+def test_ga_skips_cached_and_duplicate_individuals():
+    space = get_default_param_space()
+    calls = []
+
+    def fitness_fn(params):
+        calls.append(params)
+        return params["alpha_threshold"]
+
+    cache = FitnessCache("w", code_version="v")
+    ga = GeneticAlgorithm(space, GAConfig(population_size=4, num_generations=1, seed=1), fitness_fn, fitness_cache=cache)
+
+    params = space.get_defaults()
+    population = [Individual(params=dict(params)) for _ in range(3)]
+    ga.evaluate_population(population)
+
+    assert len(calls) == 1
+    assert all(ind.fitness == params["alpha_threshold"] for ind in population)
+
+    again = [Individual(params=dict(params))]
+    ga.evaluate_population(again)
+    assert len(calls) == 1
+    assert again[0].fitness == params["alpha_threshold"]
+
+
+def test_ga_history_reports_cache_stats_and_resumes(tmp_path):
+    space = get_default_param_space()
+    config = GAConfig(population_size=8, num_generations=3, seed=42)
+    path = tmp_path / "fitness.jsonl"
+    calls = []
+
+    def fitness_fn(params):
+        calls.append(1)
+        return sum(params.values())
+
+    first_best, first_history = GeneticAlgorithm(
+        space, config, fitness_fn, fitness_cache=FitnessCache("w", code_version="v", path=str(path))
+    ).optimize()
+
+    for entry in first_history:
+        assert "cache_hits" in entry and "cache_misses" in entry
+    assert sum(e["cache_misses"] for e in first_history) == len(calls)
+    assert first_history[-1]["evaluations"] == len(calls)
+
+    # Sesión reanudada: todo viene del disco
+    n_calls = len(calls)
+    second_best, second_history = GeneticAlgorithm(
+        space, config, fitness_fn, fitness_cache=FitnessCache("w", code_version="v", path=str(path))
+    ).optimize()
+
+    assert len(calls) == n_calls
+    assert all(e["cache_misses"] == 0 for e in second_history)
+    assert all(e["evaluations"] == 0 for e in second_history)
+    assert second_best.params == first_best.params
+    assert second_history[-1]["best_fitness"] == first_history[-1]["best_fitness"]
+
+
+def test_ga_history_without_cache_unchanged():
+    space = get_default_param_space()
+    ga = GeneticAlgorithm(space, GAConfig(population_size=4, num_generations=2, seed=3), lambda p: 1.0)
+    _, history = ga.optimize()
+
+    assert set(history[0]) == {"gen", "best_fitness", "avg_fitness", "evaluations"}
@@ -0,0 +1,39 @@
+import dataclasses
+import shutil
+from decimal import Decimal
+from pathlib import Path
+from optimization.engine import execute_worker, load_candles
+from optimization.types import TestConfig
+from utils.candle_store import CandleStore, convert_csv
+from utils.shared_dataset import SharedDataset
+
+RAW_CSV = Path(__file__).resolve().parents[2] / "data" / "raw" / "BTCUSDT-1h-2024-01.csv"
+
+
+def test_execute_worker_same_result_with_shared_dataset(tmp_path):
+    """El dataset compartido (OptimizerEngine.run) da el mismo BacktestResult que cargar los CSV."""
+    shutil.copy(RAW_CSV, tmp_path)
+    store_path = str(tmp_path / "store")
+    config = TestConfig("cfg_0000_BTCUSDT_1h", "1h", "BTCUSDT", Decimal("0"), 2.0, Decimal("0.001"))
+    args = (config, str(tmp_path), Decimal("10000"), Decimal("0.01"), store_path)
+
+    expected = execute_worker(*args)
+    with SharedDataset.publish(load_candles("BTCUSDT", "1h", str(tmp_path), store_path), "1h") as shared:
+        result = execute_worker(*args, dataset=shared.handle)
+
+    assert expected.total_trades > 0
+    assert dataclasses.replace(result, execution_time=0.0) == dataclasses.replace(expected, execution_time=0.0)
+
+
+def test_execute_worker_same_result_from_candle_store(tmp_path):
+    shutil.copy(RAW_CSV, tmp_path)
+    store_path = str(tmp_path / "store")
+    config = TestConfig("cfg_0000_BTCUSDT_1h", "1h", "BTCUSDT", Decimal("0"), 2.0, Decimal("0.001"))
+    args = (config, str(tmp_path), Decimal("10000"), Decimal("0.01"), store_path)
+
+    expected = execute_worker(*args)
+    convert_csv(str(tmp_path / RAW_CSV.name), CandleStore(store_path))
+    result = execute_worker(*args)
+
+    assert expected.total_trades > 0
+    assert dataclasses.replace(result, execution_time=0.0) == dataclasses.replace(expected, execution_time=0.0)
@@ -0,0 +1,125 @@
+"""
+Tests para evaluación paralela de poblaciones.
+"""
+import os
+import random
+import pytest
+from src.optimization.genetic_algorithm import GeneticAlgorithm, GAConfig
+from src.optimization.param_space import get_default_param_space
+from src.optimization.parallel import BatchEvaluator, ProcessPoolEvaluator, SerialEvaluator, task_seed
+
+
+def _sum_fitness(params):
+    return sum(params.values())
+
+
+def make_sum_fitness(offset=0.0):
+    """Factory top-level (picklable) usada por los workers."""
+    def fitness(params):
+        return sum(params.values()) + offset
+    return fitness
+
+
+def make_noisy_fitness():
+    def fitness(params):
+        return params["alpha_threshold"] + random.random()
+    return fitness
+
+
+def make_pid_fitness():
+    def fitness(params):
+        return float(os.getpid())
+    return fitness
+
+
+def test_process_pool_results_in_population_order():
+    space = get_default_param_space()
+    params_list = [space.sample_random(seed=i) for i in range(12)]
+
+    with ProcessPoolEvaluator(make_sum_fitness, factory_args=(1.0,), max_workers=3) as evaluator:
+        results = evaluator.evaluate(params_list)
+
+    assert results == [sum(p.values()) + 1.0 for p in params_list]
+
+
+def test_process_pool_workers_are_long_lived():
+    """La factory se ejecuta una vez por proceso y los procesos se reutilizan entre generaciones."""
+    space = get_default_param_space()
+    params_list = [space.get_defaults()] * 8
+
+    with ProcessPoolEvaluator(make_pid_fitness, max_workers=2) as evaluator:
+        pids = set(evaluator.evaluate(params_list, generation=0))
+        pids |= set(evaluator.evaluate(params_list, generation=1))
+
+    assert len(pids) <= 2
+
+
+def test_process_pool_seeding_independent_of_worker_count():
+    space = get_default_param_space()
+    params_list = [space.sample_random(seed=i) for i in range(6)]
+
+    with ProcessPoolEvaluator(make_noisy_fitness, max_workers=1, seed=42) as one:
+        r1 = one.evaluate(params_list, generation=3)
+    with ProcessPoolEvaluator(make_noisy_fitness, max_workers=3, seed=42) as three:
+        r3 = three.evaluate(params_list, generation=3)
+
+    assert r1 == r3
+    assert task_seed(42, 3, 0) != task_seed(42, 3, 1)
+    assert task_seed(None, 3, 0) is None
+
+
+def test_process_pool_seed_follows_population_index():
+    """Un individuo conserva su seed aunque los anteriores salgan del cache."""
+    space = get_default_param_space()
+    params_list = [space.sample_random(seed=i) for i in range(4)]
+
+    with ProcessPoolEvaluator(make_noisy_fitness, max_workers=2, seed=7) as evaluator:
+        full = evaluator.evaluate(params_list, generation=1)
+        tail = evaluator.evaluate(params_list[2:], generation=1, indices=[2, 3])
+        with pytest.raises(ValueError):
+            evaluator.evaluate(params_list, generation=1, indices=[0])
+
+    assert tail == full[2:]
+
+
+def test_ga_with_process_pool_matches_serial():
+    """Mismo seed -> misma historia y mismo mejor individuo que la evaluación serial."""
+    space = get_default_param_space()
+    config = GAConfig(population_size=10, num_generations=3, seed=7)
+
+    serial_best, serial_history = GeneticAlgorithm(space, config, _sum_fitness).optimize()
+
+    with ProcessPoolEvaluator(make_sum_fitness, max_workers=2, seed=config.seed) as evaluator:
+        ga = GeneticAlgorithm(space, config, fitness_function=None, evaluator=evaluator)
+        parallel_best, parallel_history = ga.optimize()
+
+    assert parallel_best.params == serial_best.params
+    assert parallel_best.fitness == serial_best.fitness
+    assert parallel_history == serial_history
+
+
+def test_serial_evaluator_and_missing_fitness():
+    space = get_default_param_space()
+    params = space.get_defaults()
+
+    assert SerialEvaluator(_sum_fitness).evaluate([params, params]) == [_sum_fitness(params)] * 2
+
+    with pytest.raises(ValueError):
+        GeneticAlgorithm(space, GAConfig(), fitness_function=None)
+
+
+def test_batch_evaluator_scores_whole_generation_in_one_call():
+    space = get_default_param_space()
+    params_list = [space.sample_random(seed=i) for i in range(5)]
+    calls = []
+
+    def population_fitness(batch):
+        calls.append(len(batch))
+        return [_sum_fitness(params) for params in batch]
+
+    evaluator = BatchEvaluator(population_fitness)
+    assert evaluator.evaluate(params_list) == [_sum_fitness(p) for p in params_list]
+    assert calls == [5]
+
+    with pytest.raises(ValueError):
+        BatchEvaluator(lambda batch: [0.0]).evaluate(params_list)
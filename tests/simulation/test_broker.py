@@ -0,0 +1,131 @@
+# tests/simulation/test_broker.py
+import random
+from itertools import accumulate
+import numpy as np
+from decimal import Decimal
+from src.execution.broker import OrderRequest, OrderSide, OrderType
+from src.simulation.broker import InMemoryBroker
+
+
+def open_position(side, entry, stop_loss, take_profit):
+    broker = InMemoryBroker(balance=Decimal("10000"))
+    broker.place_order(OrderRequest(
+        symbol="BTCUSDT", side=side, type=OrderType.LIMIT, quantity=Decimal("0.5"),
+        price=entry, stop_loss=stop_loss, take_profit=take_profit
+    ))
+    return broker
+
+
+def first_close_bar(broker, prices, start):
+    """Referencia: update_positions vela a vela."""
+    for j in range(start, len(prices)):
+        broker.update_positions(prices[j])
+        if not broker.get_positions():
+            return j
+    return None
+
+
+def test_find_exit_matches_bar_by_bar_updates():
+    rng = random.Random(4)
+    for trial in range(200):
+        prices = [Decimal("100") + Decimal(rng.randint(-800, 800)) / 100 for _ in range(60)]
+        closes = np.array([float(p) for p in prices])
+        side = OrderSide.BUY if trial % 2 == 0 else OrderSide.SELL
+        sign = 1 if side == OrderSide.BUY else -1
+        entry = Decimal("100")
+        stop_loss = entry - sign * Decimal(rng.randint(100, 900)) / 100
+        take_profit = entry + sign * Decimal(rng.randint(100, 900)) / 100
+        start = rng.randint(0, 59)
+
+        broker = open_position(side, entry, stop_loss, take_profit)
+        exit_bar = broker.find_exit(closes, prices, start)
+        assert exit_bar == first_close_bar(open_position(side, entry, stop_loss, take_profit), prices, start)
+
+
+def test_find_exit_confirms_float_ties_with_decimals():
+    # 1e-20 por encima del SL: en float64 es el mismo número
+    stop_loss = Decimal("95.1")
+    prices = [Decimal("100"), stop_loss + Decimal("1e-20"), Decimal("96"), stop_loss]
+    closes = np.array([float(p) for p in prices])
+    broker = open_position(OrderSide.BUY, Decimal("100"), stop_loss, Decimal("110"))
+
+    assert closes[1] <= float(stop_loss)
+    assert broker.find_exit(closes, prices, 1) == 3
+
+    broker.update_positions(prices[3])
+    assert broker.get_closed_positions()[0].exit_price == stop_loss
+    assert broker.find_exit(closes, prices, 0) is None
+
+
+def test_incremental_peak_and_open_risk_match_full_scan():
+    """Peak/riesgo abierto O(1) = recorrer equity y posiciones en cada trade."""
+    rng = random.Random(11)
+    broker = InMemoryBroker(balance=Decimal("10000"))
+    balances = [broker.get_balance()]
+    for step in range(600):
+        if rng.random() < 0.5:
+            side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+            sign = 1 if side == OrderSide.BUY else -1
+            entry = Decimal("100") + Decimal(rng.randint(-500, 500)) / 100
+            stop_loss = entry - sign * Decimal(rng.randint(50, 400)) / 100 if rng.random() < 0.9 else None
+            broker.place_order(OrderRequest(
+                symbol="BTCUSDT", side=side, type=OrderType.LIMIT, quantity=Decimal(rng.randint(1, 30)) / 10,
+                price=entry, stop_loss=stop_loss,
+                take_profit=entry + sign * Decimal(rng.randint(50, 400)) / 100
+            ))
+            if len(broker.equity_curve) > len(balances):
+                balances.append(broker.get_balance())
+        else:
+            closed_before = len(broker.get_closed_positions())
+            broker.update_positions(Decimal("100") + Decimal(rng.randint(-600, 600)) / 100)
+            # Un update puede cerrar varias posiciones: un punto de equity por cierre
+            for trade in broker.get_closed_positions()[closed_before:]:
+                balances.append(balances[-1] + trade.pnl)
+
+        peak = max(balances)
+        assert broker.get_current_drawdown_pct() == (peak - broker.get_balance()) / peak
+        assert broker.max_drawdown == max(p - b for p, b in zip(accumulate(balances, max), balances))
+        expected_risk = Decimal("0")
+        for pos in broker.get_positions():
+            if pos.stop_loss and pos.entry_price:
+                expected_risk += abs(pos.entry_price - pos.stop_loss) * pos.quantity
+            else:
+                expected_risk += pos.entry_price * pos.quantity
+        assert broker.get_open_risk() == expected_risk
+
+    # La curva crece más allá de la capacidad inicial y guarda cada balance
+    assert len(balances) > 256
+    assert broker.equity_curve.dtype == np.float64
+    assert broker.equity_curve.tolist() == [float(b) for b in balances]
+
+
+def test_closed_trades_go_to_typed_ledger():
+    broker = InMemoryBroker(balance=Decimal("10000"))
+    meta = {'agent': 'WFO_Alpha_Combiner', 'regime': 'SIDEWAYS_RANGE'}
+    fills = [
+        (OrderSide.BUY, Decimal("100"), Decimal("95"), Decimal("110"), Decimal("111")),
+        (OrderSide.SELL, Decimal("100"), Decimal("105"), Decimal("90"), Decimal("106")),
+        (OrderSide.BUY, Decimal("100"), Decimal("99"), Decimal("101"), Decimal("101")),
+    ]
+    for bar, (side, entry, sl, tp, exit_close) in enumerate(fills):
+        broker.bar_index = 10 * bar
+        broker.place_order(OrderRequest(
+            symbol="BTCUSDT", side=side, type=OrderType.LIMIT, quantity=Decimal("2"),
+            price=entry, stop_loss=sl, take_profit=tp, metadata=meta if bar != 1 else None
+        ))
+        broker.update_positions(exit_close, bar_index=10 * bar + 3)
+
+    ledger = broker.get_closed_positions()
+    assert len(ledger) == 3
+    assert [t.exit_price for t in ledger] == [Decimal("110"), Decimal("105"), Decimal("101")]
+    assert ledger.column('entry_index').tolist() == [0, 10, 20]
+    assert ledger.column('exit_index').tolist() == [3, 13, 23]
+    assert ledger.column('side').tolist() == [1, -1, 1]
+    assert ledger.column('pnl').tolist() == [float(t.pnl) for t in ledger]
+    assert [ledger.label(c) for c in ledger.column('regime')] == ['SIDEWAYS_RANGE', None, 'SIDEWAYS_RANGE']
+
+    pnls = [t.pnl for t in ledger]
+    assert ledger.winning_trades == 2
+    assert ledger.gross_profit == sum(p for p in pnls if p > 0)
+    assert ledger.gross_loss == abs(sum(p for p in pnls if p < 0))
+    assert ledger.total_fees == sum(t.fee for t in ledger)
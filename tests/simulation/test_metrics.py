@@ -0,0 +1,73 @@
+# tests/simulation/test_metrics.py
+import math
+import random
+import statistics
+import numpy as np
+import pytest
+from decimal import Decimal
+from src.simulation.metrics import compute_metrics
+
+
+def reference_metrics(equity, pnl, initial_balance):
+    """Cálculo anterior del worker: bucles Python + statistics."""
+    peak, max_dd, max_dd_abs = equity[0], 0.0, 0.0
+    for val in equity:
+        peak = max(peak, val)
+        max_dd_abs = max(max_dd_abs, peak - val)
+        if peak > 0:
+            max_dd = max(max_dd, (peak - val) / peak)
+    rets = [equity[i] / equity[i - 1] - 1.0 for i in range(1, len(equity)) if equity[i - 1] > 0]
+    sharpe = 0.0
+    if len(rets) >= 2 and statistics.pstdev(rets) > 0:
+        sharpe = statistics.mean(rets) / statistics.pstdev(rets) * math.sqrt(len(rets))
+    return {
+        'winning_trades': sum(1 for p in pnl if p > 0),
+        'gross_profit': sum(p for p in pnl if p > 0),
+        'gross_loss': abs(sum(p for p in pnl if p < 0)),
+        'return_pct': (equity[-1] - initial_balance) / initial_balance * 100,
+        'max_drawdown': max_dd,
+        'max_drawdown_abs': max_dd_abs,
+        'sharpe': sharpe,
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_compute_metrics_matches_loop_reference(seed):
+    rng = random.Random(seed)
+    pnl = [rng.uniform(-150, 200) for _ in range(rng.randint(5, 400))]
+    equity = list(np.cumsum([10000.0] + pnl))
+
+    m = compute_metrics(np.array(equity), np.array(pnl), 10000.0)
+    ref = reference_metrics(equity, pnl, 10000.0)
+
+    assert m.total_trades == len(pnl)
+    assert m.winning_trades == ref['winning_trades']
+    assert m.losing_trades == len(pnl) - ref['winning_trades']
+    for key in ('gross_profit', 'gross_loss', 'return_pct', 'max_drawdown', 'max_drawdown_abs', 'sharpe'):
+        assert getattr(m, key) == pytest.approx(ref[key], rel=1e-9, abs=1e-9), key
+    assert m.profit_factor == pytest.approx(ref['gross_profit'] / ref['gross_loss'])
+    assert m.calmar == pytest.approx((ref['return_pct'] / 100) / max(ref['max_drawdown'], 0.05))
+
+
+def test_compute_metrics_edge_cases():
+    # Sin pérdidas: PF con tope 10; balances Decimal exactos para el net profit
+    m = compute_metrics(np.array([100.0, 110.0, 130.0]), np.array([10.0, 20.0]), Decimal("100"), Decimal("130"))
+    assert m.profit_factor == 10.0 and m.max_drawdown == 0.0 and m.net_profit == 30.0
+
+    m = compute_metrics(np.array([100.0]), np.array([]), 100.0)
+    assert (m.total_trades, m.win_rate, m.profit_factor, m.sharpe) == (0, 0.0, 1.0, 0.0)
+
+
+def test_backtest_report_keeps_exact_drawdown():
+    from simulation.backtest import Backtester
+    curve = [Decimal("10000"), Decimal("10100.1234567890123456789"), Decimal("9950.0000000000000000001"), Decimal("10050")]
+    exact = Decimal("10100.1234567890123456789") - Decimal("9950.0000000000000000001")
+
+    report = Backtester.calculate_report(Decimal("10000"), curve, [{'pnl': Decimal("100")}])
+    assert report.max_drawdown == exact
+    # Curva float64 del broker: balance final y drawdown exactos vienen aparte
+    report = Backtester.calculate_report(
+        Decimal("10000"), np.array([float(v) for v in curve]), [{'pnl': Decimal("100")}],
+        final_balance=curve[-1], max_drawdown=exact
+    )
+    assert (report.final_balance, report.max_drawdown) == (Decimal("10050"), exact)
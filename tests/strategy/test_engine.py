@@ -81,3 +81,31 @@ def test_strategy_no_signal_if_no_ob():
     signal = strategy.analyze(market, Timeframe.M5)
     
     assert signal is None
+
+def test_strategy_computes_one_new_ob_per_bar():
+    """After warmup, each analyze() call only evaluates the newest index."""
+    from src.core.market import MarketState as SrcMarketState
+    from src.core.candle import Candle as SrcCandle
+    from src.core.timeframe import Timeframe as SrcTimeframe
+    from src.strategy.engine import TJRStrategy as SrcStrategy
+
+    strategy = SrcStrategy()
+    market = SrcMarketState.empty("BTCUSDT")
+    price = Decimal("100")
+    for i in range(120):
+        step = Decimal((i * 7) % 11 - 5)
+        o, c = price, price + step
+        market = market.update(SrcCandle(
+            timestamp=1000 + i * 300, open=o, close=c,
+            high=max(o, c) + 1, low=min(o, c) - 1,
+            volume=Decimal("100"), timeframe=SrcTimeframe.M5
+        ))
+        price = c
+        before = strategy.cache_stats()['cached_indices']
+        strategy.analyze(market, SrcTimeframe.M5)
+        if i >= 60:
+            assert strategy.cache_stats()['cached_indices'] - before == 1
+
+    stats = strategy.cache_stats()
+    assert stats['misses'] == stats['cached_indices']
+    assert stats['hit_rate'] > 0.5
@@ -70,3 +70,38 @@ def test_invalid_ob_no_sweep():
     
     ob = detect_ob(series, 2)
     assert ob is None # No OB because no liquidity sweep occurred before this move
+
+def test_structure_cache_matches_detect_ob_and_counts_hits():
+    """Cached results equal direct detection; re-scans are served from cache."""
+    from src.core.series import MarketSeries as SrcSeries
+    from src.core.candle import Candle as SrcCandle
+    from src.core.timeframe import Timeframe as SrcTimeframe
+    from src.strategy.ob import detect_ob as src_detect_ob
+    from src.strategy.cache import get_structure_cache
+
+    series = SrcSeries([])
+    prices = [102, 100, 102, 98, 103, 110, 108, 104, 101, 97, 99, 106, 112, 109, 104]
+    for i, p in enumerate(prices):
+        o = prices[i - 1] if i else p
+        series = series.add(SrcCandle(
+            timestamp=1000 * (i + 1), open=Decimal(o), close=Decimal(p),
+            high=Decimal(max(o, p) + 1), low=Decimal(min(o, p) - 1),
+            volume=Decimal("100"), timeframe=SrcTimeframe.M5
+        ))
+
+    cache = get_structure_cache(series)
+    for i in range(len(series)):
+        assert cache.ob(series, i) == src_detect_ob(series, i)
+    misses = cache.misses
+
+    # A longer view on the same buffer reuses the same cache
+    longer = series.add(SrcCandle(
+        timestamp=99_000, open=Decimal(104), close=Decimal(100), high=Decimal(105),
+        low=Decimal(99), volume=Decimal("100"), timeframe=SrcTimeframe.M5
+    ))
+    assert get_structure_cache(longer) is cache
+    for i in range(len(series)):
+        cache.ob(longer, i)
+    assert cache.misses == misses
+    assert cache.hits >= len(series)
+    assert 0.0 < cache.hit_rate < 1.0
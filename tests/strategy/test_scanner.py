@@ -0,0 +1,62 @@
+import random
+import numpy as np
+import pytest
+from decimal import Decimal
+from src.core.candle import Candle
+from src.core.series import MarketSeries
+from src.core.timeframe import Timeframe
+from src.strategy.scanner import scan_series, scan_structure, BULLISH, BEARISH, NONE
+from src.strategy.fractals import is_valid_high, is_valid_low
+from src.strategy.structure import detect_bos
+from src.strategy.ob import detect_ob
+from src.strategy.fvg import detect_fvg
+
+def random_series(n: int, seed: int) -> MarketSeries:
+    rng = random.Random(seed)
+    candles = []
+    price = Decimal("100")
+    for i in range(n):
+        open_p = price
+        close_p = price + Decimal(rng.randint(-5, 5))
+        candles.append(Candle(
+            timestamp=i * 1000,
+            open=open_p,
+            high=max(open_p, close_p) + Decimal(rng.randint(0, 3)),
+            low=min(open_p, close_p) - Decimal(rng.randint(0, 3)),
+            close=close_p,
+            volume=Decimal("1"),
+            timeframe=Timeframe.H4
+        ))
+        price = close_p
+    return MarketSeries(candles)
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_scan_matches_per_index_detectors(seed):
+    """Every index must agree with the per-index fractal/BOS/OB/FVG functions."""
+    series = random_series(400, seed)
+    scan = scan_series(series)
+
+    for i in range(len(series)):
+        assert scan.swing_high[i] == is_valid_high(series, i)
+        assert scan.swing_low[i] == is_valid_low(series, i)
+        assert scan.bos_at(i) == detect_bos(series, i)
+        assert scan.ob_at(i) == detect_ob(series, i)
+        assert scan.fvg_at(i) == detect_fvg(series, i)
+
+def test_scan_arrays_layout():
+    series = random_series(200, 3)
+    scan = scan_series(series)
+
+    assert len(scan) == 200
+    has_ob = scan.ob_type != NONE
+    assert has_ob.any()
+    assert set(scan.ob_type[has_ob]) <= {BULLISH, BEARISH}
+    assert (scan.ob_index[has_ob] <= np.flatnonzero(has_ob)).all()
+    assert (scan.ob_top[has_ob] >= scan.ob_bottom[has_ob]).all()
+    assert (scan.ob_index[~has_ob] == -1).all()
+
+def test_scan_short_inputs():
+    for n in range(0, 4):
+        scan = scan_structure([1.0] * n, [2.0] * n, [0.5] * n, [1.5] * n)
+        assert len(scan) == n
+        assert not (scan.bos_type != NONE).any()
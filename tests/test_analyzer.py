@@ -68,3 +68,57 @@ def test_analyzer_prediction(sample_data):
     assert 0.0 <= prob <= 1.0
     
     shutil.rmtree("tests/temp_models", ignore_errors=True)
+
+def test_registry_shares_model_between_analyzers(sample_data, tmp_path):
+    from src.ml.registry import get_registry
+    candles, trades = sample_data
+    model_path = tmp_path / "shared_rf.pkl"
+    PatternAnalyzer(model_path=str(model_path)).train(candles, trades)
+    
+    registry = get_registry()
+    loads = registry.loads
+    first = PatternAnalyzer(model_path=str(model_path))
+    second = PatternAnalyzer(model_path=str(model_path))
+    
+    assert first.is_trained and second.is_trained
+    assert first.model is second.model
+    assert registry.loads == loads + 1
+
+def test_registry_reloads_when_file_changes(sample_data, tmp_path):
+    import os
+    from src.ml.registry import ModelRegistry
+    candles, trades = sample_data
+    model_path = tmp_path / "rf.pkl"
+    analyzer = PatternAnalyzer(model_path=str(model_path))
+    analyzer.train(candles, trades)
+    
+    registry = ModelRegistry()
+    old = registry.get(model_path)
+    assert registry.get(model_path) is old
+    
+    # Reentrenar no toca el modelo compartido y el archivo nuevo se recarga
+    shared = PatternAnalyzer(model_path=str(model_path)).model
+    analyzer.model = shared
+    analyzer.train(candles, trades)
+    assert analyzer.model is not shared
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert registry.get(model_path) is not old
+    assert registry.loads == 2
+    
+    assert ModelRegistry().get(tmp_path / "missing.pkl") is None
+
+def test_predict_proba_batch_matches_single_rows(sample_data, tmp_path):
+    candles, trades = sample_data
+    analyzer = PatternAnalyzer(model_path=str(tmp_path / "batch_rf.pkl"))
+    analyzer.train(candles, trades)
+    
+    from src.ml.features import FeatureExtractor
+    features = FeatureExtractor().add_all_features(candles)
+    probs = analyzer.predict_proba_batch(features)
+    
+    assert probs.shape == (len(features),)
+    for i in range(0, len(features), 13):
+        assert probs[i] == analyzer.predict_proba(features.iloc[[i]])
+    
+    assert (PatternAnalyzer(model_path=str(tmp_path / "none.pkl")).predict_proba_batch(features) == 0.5).all()
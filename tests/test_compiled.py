@@ -0,0 +1,62 @@
+# tests/test_compiled.py
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from src.ml.compiled import CompiledForest, compile_forest
+from src.ml.analyzer import PatternAnalyzer
+
+
+@pytest.fixture
+def forest_data():
+    rng = np.random.default_rng(7)
+    cols = [f"f{i}" for i in range(8)]
+    X = pd.DataFrame(rng.normal(size=(600, 8)), columns=cols)
+    y = ((X['f0'] + X['f3'] * 0.5 + rng.normal(scale=0.5, size=600)) > 0).astype(int)
+    # Algunos NaN para ejercitar missing_go_to_left
+    X = X.mask(rng.random(X.shape) < 0.03)
+    model = RandomForestClassifier(n_estimators=25, max_depth=6, min_samples_leaf=5, random_state=42).fit(X, y)
+    test = pd.DataFrame(rng.normal(size=(200, 8)), columns=cols)
+    test.iloc[::17, 2] = np.nan
+    return model, test
+
+
+def test_compiled_matches_sklearn_batch(forest_data):
+    model, test = forest_data
+    forest = CompiledForest.from_sklearn(model)
+
+    assert forest.n_trees == 25
+    assert forest.feature_names == tuple(test.columns)
+    np.testing.assert_array_equal(forest.predict_proba(test), model.predict_proba(test))
+
+
+def test_compiled_single_row_inputs(forest_data):
+    model, test = forest_data
+    forest = CompiledForest.from_sklearn(model)
+    expected = model.predict_proba(test.iloc[[5]])[0][1]
+
+    # Columnas desordenadas y extra: se alinean por nombre
+    shuffled = test[list(reversed(test.columns))].assign(extra=1.0)
+    assert forest.predict_proba_one(shuffled.iloc[[5]]) == expected
+    assert forest.predict_proba_one(test.iloc[5].to_dict()) == expected
+    assert forest.predict_proba_one(test.iloc[5].to_numpy()) == expected
+
+    with pytest.raises(ValueError):
+        forest.predict_proba(np.zeros(3))
+
+
+def test_compile_forest_caches_and_skips_other_models(forest_data):
+    model, _ = forest_data
+    assert compile_forest(model) is compile_forest(model)
+    assert compile_forest(RandomForestClassifier()) is None
+    assert compile_forest(object()) is None
+
+
+def test_analyzer_uses_compiled_forest(forest_data, tmp_path):
+    model, test = forest_data
+    analyzer = PatternAnalyzer(model_path=str(tmp_path / "none.pkl"))
+    analyzer.model = model
+    analyzer.is_trained = True
+
+    assert analyzer.compiled is compile_forest(model)
+    assert analyzer.predict_proba(test.iloc[:10]) == model.predict_proba(test.iloc[[9]])[0][1]
@@ -2,7 +2,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from src.ml.features import FeatureExtractor
+from src.ml.features import FeatureExtractor, FEATURE_COLUMNS
 
 @pytest.fixture
 def sample_data():
@@ -77,3 +77,50 @@ def test_input_validation():
     
     with pytest.raises(ValueError, match="must contain columns"):
         fe.add_all_features(bad_df)
+
+def test_stream_matches_batch_rows(sample_data):
+    fe = FeatureExtractor()
+    batch = fe.add_all_features(sample_data)
+    
+    stream = fe.stream()
+    rows = [
+        stream.update(r.timestamp, r.open, r.high, r.low, r.close, r.volume)
+        for r in sample_data.itertuples()
+    ]
+    streamed = pd.DataFrame(rows, columns=list(FEATURE_COLUMNS)).loc[batch.index]
+    
+    assert list(streamed.columns) == list(batch.columns)
+    # Misma aritmética en stream y batch: bit a bit en todas las columnas
+    for col in FEATURE_COLUMNS:
+        assert streamed[col].tolist() == batch[col].tolist(), col
+
+def test_stream_last_valid_frame(sample_data):
+    fe = FeatureExtractor()
+    stream = fe.stream()
+    assert stream.last_valid_frame().empty
+    
+    for r in sample_data.itertuples():
+        stream.update(r.timestamp, r.open, r.high, r.low, r.close, r.volume)
+    
+    last = stream.last_valid_frame()
+    expected = fe.add_all_features(sample_data).iloc[[-1]]
+    assert len(last) == 1
+    assert list(last.dtypes) == list(expected.dtypes)
+    np.testing.assert_array_equal(
+        last.drop(columns='timestamp').to_numpy(float),
+        expected.drop(columns='timestamp').to_numpy(float)
+    )
+
+def test_feature_table_aligns_rows_to_candles():
+    from src.ml.features import FeatureTable
+    index = pd.to_datetime([3000, 1000, 2000, 2000], unit='ms')
+    features_map = pd.DataFrame({'a': [3.0, 1.0, 2.0, 2.5], 'trend': [1, -1, 1, -1]}, index=index)
+    table = FeatureTable.from_frame(features_map, np.array([0, 1000, 1500, 2000, 3000]))
+    
+    assert table.rows.tolist() == [-1, 1, -1, 2, 0]
+    assert table.last_rows.tolist() == [-1, 1, -1, 3, 0]
+    assert table.warmup == 1
+    assert [table.has_row(i) for i in range(5)] == [False, True, False, True, True]
+    # Duplicados: primera fila, como features_map.loc[ts].iloc[0]
+    assert table.row(3) == {'a': 2.0, 'trend': 1}
+    assert np.isnan(table.values[2]).all()
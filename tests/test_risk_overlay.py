@@ -88,3 +88,17 @@ def test_drawdown_scaling():
         current_drawdown_pct=0.20
     )
     assert qty_dd_20 == Decimal("6")
+
+def test_position_size_in_float_mode():
+    """Fast research mode: float config -> float sizing con la misma fórmula."""
+    rm = RiskManager(RiskConfig(risk_percentage=0.01, max_portfolio_risk=0.05, use_dd_scaling=True))
+    qty = rm.calculate_position_size(
+        account_balance=10000.0,
+        entry_price=100.0,
+        stop_loss=90.0,
+        current_open_risk=Decimal("450"),
+        current_drawdown_pct=0.10
+    )
+    assert isinstance(qty, float)
+    assert qty == pytest.approx(5.0)
+    assert rm.calculate_position_size(10000.0, 100.0, 90.0, current_open_risk=600.0) == 0.0
@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+from decimal import Decimal
+from src.core.timeframe import Timeframe
+from src.utils.candle_store import CandleStore, convert_csv, convert_directory
+from src.utils.data_loader import load_binance_csv
+
+LINES = [
+    # Jan 31 20:00 and Feb 1 00:00 / 04:00 UTC (4h)
+    "1706731200000,42580.00,43000.00,42500.10,42941.10,1234.56789000,0,0,0,0,0,0",
+    "1706745600000,42941.10,43100.00,42800.00,42900.00,980.12000000,0,0,0,0,0,0",
+    "1706760000000,42900.00,42950.50,42000.00,42100.25,1500.00000000,0,0,0,0,0,0",
+]
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "BTCUSDT-4h-2024-02.csv"
+    path.write_text("\n".join(LINES) + "\n")
+    return path
+
+def test_convert_splits_by_month_and_roundtrips(tmp_path, csv_file):
+    store = CandleStore(str(tmp_path / "store"))
+    written = convert_csv(str(csv_file), store)
+
+    assert len(written) == 2
+    assert store.months("BTCUSDT", Timeframe.H4) == [(2024, 1), (2024, 2)]
+
+    expected = load_binance_csv(str(csv_file), Timeframe.H4)
+    assert store.load_candles("BTCUSDT", Timeframe.H4, year=2024) == expected
+    assert store.load_candles("BTCUSDT", Timeframe.H4, year=2024, months=[2]) == expected[1:]
+
+def test_loaded_series_is_array_backed_and_memory_mapped(tmp_path, csv_file):
+    store = CandleStore(str(tmp_path / "store"))
+    convert_csv(str(csv_file), store)
+
+    series = store.load_month("BTCUSDT", Timeframe.H4, 2024, 2)
+
+    assert len(series) == 2
+    assert isinstance(series.closes.base, np.memmap) or isinstance(series.closes, np.memmap)
+    assert series.closes.tolist() == [42900.0, 42100.25]
+    assert series.get(-1).close == Decimal("42100.25")
+    assert series.get(0).volume == Decimal("980.12")
+    assert series.get(0).complete is True
+
+    # Extending a loaded series copies out of the read-only map
+    extended = series.add(series.get(-1))
+    assert len(extended) == 3
+    assert len(series) == 2
+
+def test_missing_month_raises(tmp_path):
+    store = CandleStore(str(tmp_path / "store"))
+    assert not store.has_month("BTCUSDT", Timeframe.H4, 2024, 1)
+    with pytest.raises(FileNotFoundError):
+        store.load_month("BTCUSDT", Timeframe.H4, 2024, 1)
+
+def test_convert_rejects_invalid_candles(tmp_path):
+    path = tmp_path / "BTCUSDT-4h-2024-01.csv"
+    path.write_text("1704067200000,100,90,110,100,10,0,0,0,0,0,0\n")
+    with pytest.raises(ValueError):
+        convert_csv(str(path), CandleStore(str(tmp_path / "store")))
+
+def test_convert_directory_skips_unrecognized_names(tmp_path, csv_file):
+    (tmp_path / "notes.csv").write_text("a,b\n")
+    store = CandleStore(str(tmp_path / "store"))
+    convert_directory(str(tmp_path), store)
+    assert store.months("BTCUSDT", "4h") == [(2024, 1), (2024, 2)]
+
+def test_worker_loads_store_months_as_lazy_series(tmp_path, csv_file):
+    from src.agents.worker import OptimizerWorker
+    from src.core.series import MarketSeries
+    from src.utils.fingerprint import candles_fingerprint
+
+    root = str(tmp_path / "store")
+    convert_csv(str(csv_file), CandleStore(root))
+
+    candles = OptimizerWorker("store").load_candles("BTCUSDT", Timeframe.H4, 2024, [1, 2], store_root=root)
+
+    assert isinstance(candles, MarketSeries)
+    assert candles.closes.tolist() == [42941.1, 42900.0, 42100.25]
+    # Ninguna vela construida hasta recorrer la serie (el fingerprint lee columnas)
+    candles_fingerprint(candles)
+    assert candles._buffer.candles._cache.count(None) == 3
+    assert list(candles) == load_binance_csv(str(csv_file), Timeframe.H4)
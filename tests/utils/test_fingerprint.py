@@ -0,0 +1,32 @@
+from decimal import Decimal
+from src.core.candle import Candle
+from src.core.series import MarketSeries
+from src.core.timeframe import Timeframe
+from src.utils.fingerprint import candles_fingerprint
+
+
+def _candles(n, bump=None):
+    candles = []
+    for i in range(n):
+        close = Decimal("100.5") + i + (Decimal("0.01") if i == bump else 0)
+        candles.append(Candle(
+            timestamp=1704067200000 + i * 14400000,
+            open=close - 1, high=close + 2, low=close - 2, close=close,
+            volume=Decimal("10"), timeframe=Timeframe.H4, complete=True
+        ))
+    return candles
+
+
+def test_series_fingerprint_hashes_columns():
+    series = MarketSeries(_candles(30))
+
+    assert candles_fingerprint(series) == candles_fingerprint(MarketSeries(_candles(30)))
+    assert candles_fingerprint(series) != candles_fingerprint(MarketSeries(_candles(30, bump=7)))
+    # Una vista prefijo del mismo buffer es otra ventana
+    assert candles_fingerprint(series) != candles_fingerprint(MarketSeries(_candles(29)))
+
+
+def test_list_fingerprint_is_stable_across_copies():
+    candles = _candles(10)
+    assert candles_fingerprint(candles) == candles_fingerprint(list(candles))
+    assert candles_fingerprint(candles) != candles_fingerprint(_candles(10, bump=3))
@@ -0,0 +1,111 @@
+import concurrent.futures
+import numpy as np
+import pandas as pd
+import pytest
+from decimal import Decimal
+from src.core.candle import Candle
+from src.core.timeframe import Timeframe
+from src.ml.features import FeatureExtractor
+from src.utils.shared_dataset import SharedDataset, attach, publish_with_features
+
+H4_MS = 4 * 3600 * 1000
+
+
+def make_candles(n=300, start=1704067200000):
+    candles = []
+    price = 42000.0
+    for i in range(n):
+        price += (i % 7) - 3
+        candles.append(Candle(
+            timestamp=start + i * H4_MS,
+            open=Decimal(str(price)),
+            high=Decimal(str(price + 25.5)),
+            low=Decimal(str(price - 25.25)),
+            close=Decimal(str(price + 1)),
+            volume=Decimal("12.5"),
+            timeframe=Timeframe.H4,
+            complete=True
+        ))
+    return candles
+
+
+def _close_sum(handle):
+    """Runs in a pool worker: attaches by name, nothing but the handle is pickled."""
+    dataset = attach(handle)
+    return float(dataset.series.closes.sum()), dataset.candles(-1)[0].timestamp
+
+
+def test_attach_roundtrips_candles():
+    candles = make_candles(50)
+    with SharedDataset.publish(candles, Timeframe.H4) as shared:
+        dataset = attach(shared.handle)
+
+        assert len(dataset) == 50
+        assert list(dataset.candles()) == candles
+        assert dataset.series.closes.tolist() == [float(c.close) for c in candles]
+        assert not dataset.series.closes.flags.writeable
+
+
+def test_between_selects_by_timestamp():
+    candles = make_candles(20)
+    with SharedDataset.publish(candles, Timeframe.H4) as shared:
+        dataset = attach(shared.handle)
+
+        assert list(dataset.between(candles[5].timestamp, candles[9].timestamp)) == candles[5:10]
+        assert len(dataset.between(candles[-1].timestamp + 1, candles[-1].timestamp + H4_MS)) == 0
+
+
+def test_attach_with_caller_timeframe():
+    from core.timeframe import Timeframe as CoreTimeframe
+
+    candles = make_candles(10)
+    with SharedDataset.publish(candles, Timeframe.H4) as shared:
+        dataset = attach(shared.handle, CoreTimeframe.H4)
+
+        assert dataset.candles()[0].timeframe is CoreTimeframe.H4
+        assert attach(shared.handle).candles()[0].timeframe is Timeframe.H4
+        with pytest.raises(ValueError):
+            attach(shared.handle, Timeframe.H1)
+
+
+def test_features_align_with_candles_and_share_memory():
+    candles = make_candles()
+    with publish_with_features(candles, Timeframe.H4) as shared:
+        dataset = attach(shared.handle)
+        features = dataset.features
+
+        # Same map OptimizerWorker builds from these candles
+        df_candles = pd.DataFrame({
+            'timestamp': pd.to_datetime([c.timestamp for c in candles], unit='ms'),
+            'open': [float(c.open) for c in candles],
+            'high': [float(c.high) for c in candles],
+            'low': [float(c.low) for c in candles],
+            'close': [float(c.close) for c in candles],
+            'volume': [float(c.volume) for c in candles]
+        })
+        expected = FeatureExtractor().add_all_features(df_candles).set_index('timestamp')
+
+        assert 0 < len(features) < len(candles)
+        assert list(features.index) == list(expected.index)
+        assert list(features.columns) == list(expected.columns)
+        np.testing.assert_allclose(features.to_numpy(), expected.to_numpy(dtype=float))
+        assert np.shares_memory(features.to_numpy(), dataset._features)
+
+
+def test_pool_workers_attach_by_name():
+    candles = make_candles(100)
+    with SharedDataset.publish(candles, Timeframe.H4) as shared:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_close_sum, [shared.handle] * 4))
+
+    expected = (sum(float(c.close) for c in candles), candles[-1].timestamp)
+    assert results == [expected] * 4
+
+
+def test_close_unlinks_block():
+    shared = SharedDataset.publish(make_candles(5), Timeframe.H4)
+    handle = shared.handle
+    shared.close()
+
+    with pytest.raises(FileNotFoundError):
+        attach(handle)